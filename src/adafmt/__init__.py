@@ -36,10 +36,21 @@ Version History:
 """
 
 __all__ = ["cli", "als_client", "edits", "file_discovery", "logging_jsonl", "utils", "tui"]
-# Version is dynamically read from package metadata
-try:
-    from importlib.metadata import version
-    __version__ = version("adafmt")
-except Exception:
-    # Fallback for development/editable installs
-    __version__ = "0.0.0"
\ No newline at end of file
+
+
+def __getattr__(name: str) -> str:
+    """Read ``__version__`` from package metadata on first access.
+    
+    importlib.metadata is slow to import, and every entry point imports
+    this package, so the lookup is deferred until someone asks for it.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        from importlib.metadata import version
+        value = version("adafmt")
+    except Exception:
+        # Fallback for development/editable installs
+        value = "0.0.0"
+    globals()["__version__"] = value
+    return value
\ No newline at end of file
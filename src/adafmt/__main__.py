@@ -10,11 +10,47 @@
 
 import sys
 import os
+from typing import List
 
 # Add the parent directory to the path so we can import adafmt
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from adafmt.cli import main
+
+def _fast_path(argv: List[str]) -> bool:
+    """Answer ``--version`` and ``license`` without loading the full CLI.
+    
+    Output matches the Typer commands exactly. Anything else, including
+    these commands with extra arguments, goes through the full CLI.
+    
+    Args:
+        argv: Command-line arguments without the program name
+        
+    Returns:
+        True if the invocation was handled
+    """
+    if argv in (["--version"], ["-v"]):
+        from adafmt.cli_helpers import APP_VERSION
+        print(f"adafmt version {APP_VERSION}")
+        return True
+    if argv == ["license"]:
+        from adafmt.cli_helpers import APP_HEADER, read_license_text
+        try:
+            license_text = read_license_text()
+        except FileNotFoundError:
+            return False
+        sys.stdout.write(APP_HEADER)
+        print(license_text)
+        return True
+    return False
+
+
+def main() -> None:
+    """Entry point for the adafmt command."""
+    if _fast_path(sys.argv[1:]):
+        return
+    from adafmt.cli import main as cli_main
+    cli_main()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -45,6 +45,17 @@ from .utils import extract_log_path_from_traces_cfg, to_iso8601_basic
 JsonDict = Dict[str, Any]
 """Type alias for JSON-compatible dictionaries used in LSP messages."""
 
+FORMATTING_OPTIONS: JsonDict = {"tabSize": 3, "insertSpaces": True}
+"""Formatting options sent with every textDocument/formatting request (read-only)."""
+
+READINESS_PROBE_URI = "file:///tmp/adafmt_readiness_probe.ads"
+"""Document URI used for the readiness probe in :meth:`ALSClient.wait_ready`."""
+
+READINESS_PROBE_SOURCE = """package Dummy is
+   procedure Test;
+end Dummy;"""
+"""Minimal Ada source formatted by the readiness probe."""
+
 
 class ALSProtocolError(RuntimeError):
     """Exception raised when ALS returns an error response.
@@ -135,6 +146,8 @@ class ALSClient:
         logger: Optional logger function for debug output
         process: The ALS subprocess once started
         als_log_path: Path to ALS log file (populated after initialization)
+        server_capabilities: Capabilities from the initialize response, or
+            None if ALS did not report any
         
     Internal attributes:
         _reader_task: Background task reading ALS responses
@@ -157,6 +170,7 @@ class ALSClient:
     debug_logger: Optional[Any] = None
     init_timeout: float = 180.0
     process: Optional[asyncio.subprocess.Process] = None
+    server_capabilities: Optional[JsonDict] = None
     _reader_task: Optional[asyncio.Task] = None
     _stderr_task: Optional[asyncio.Task] = None
     _pending: Dict[str, asyncio.Future] = field(default_factory=dict)
@@ -168,6 +182,7 @@ class ALSClient:
     _end_ns: Optional[int] = None
     _returncode: Optional[int] = None
     _stderr_log_path: Optional[Path] = None
+    _ready: asyncio.Event = field(default_factory=asyncio.Event)
 
     def _resolve_stderr_path(self, cwd: Path | None) -> Path:
         """Resolve the final stderr log file path.
@@ -281,6 +296,7 @@ class ALSClient:
                 self.logger("[als] Warning: Could not parse log path from traces config")
 
         # Spawn ALS
+        self._ready.clear()
         self._start_ns = time.perf_counter_ns()
         self.process = await asyncio.create_subprocess_exec(
             *shlex.split(cmdline),
@@ -331,13 +347,75 @@ class ALSClient:
         
         # Check if ALS returns log info in the initialize response
         if init_response and isinstance(init_response, dict):
+            capabilities = init_response.get("capabilities")
+            self.server_capabilities = capabilities if isinstance(capabilities, dict) else None
             # Some LSP servers return server info with log paths
             server_info = init_response.get("serverInfo", {})
             if self.logger and server_info:
                 self.logger(f"[als] Server info: {server_info}")
         
         await self._notify("initialized", {})
-        # no special warmup here; caller may handle readiness
+        # no special warmup here; caller may await wait_ready()
+
+    @property
+    def supports_formatting(self) -> bool:
+        """False only if ALS reported capabilities without document formatting.
+        
+        When no capabilities were reported the answer is unknown and
+        formatting is assumed to work. The capability is either a boolean or
+        a DocumentFormattingOptions object, which may be empty (``{}``).
+        """
+        if self.server_capabilities is None:
+            return True
+        provider = self.server_capabilities.get("documentFormattingProvider")
+        return provider is not None and provider is not False
+
+    async def wait_ready(self, probe_timeout: float = 60.0, retry_delay: float = 0.25) -> None:
+        """Return as soon as ALS can format documents.
+        
+        Formats a tiny probe document and returns on the first successful
+        reply, or as soon as ALS reports that the project is loaded via a
+        ``window/logMessage`` notification, whichever comes first. Failed
+        probes are retried after a short, growing delay that is cut short by
+        the project-loaded notification.
+        
+        This method does not bound its own run time; wrap it in
+        ``asyncio.wait_for`` to cap how long the caller is willing to wait.
+        
+        Args:
+            probe_timeout: Maximum seconds to wait for a single probe reply
+            retry_delay: Initial delay between failed probes (doubles, max 2s)
+        """
+        if self._ready.is_set():
+            return
+        await self.notify_did_open(READINESS_PROBE_URI, READINESS_PROBE_SOURCE)
+        try:
+            while not self._ready.is_set():
+                probe = asyncio.ensure_future(
+                    self.request_formatting(READINESS_PROBE_URI, timeout=probe_timeout))
+                signal = asyncio.ensure_future(self._ready.wait())
+                try:
+                    await asyncio.wait({probe, signal}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    for task in (probe, signal):
+                        if not task.done():
+                            task.cancel()
+                    await asyncio.gather(probe, signal, return_exceptions=True)
+                if probe.done() and not probe.cancelled() and probe.exception() is None:
+                    self._ready.set()
+                    break
+                if self._ready.is_set():
+                    break
+                if self.logger:
+                    self.logger(f"[als] ALS not ready yet, retrying in {retry_delay:g}s...")
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._ready.wait(), timeout=retry_delay)
+                retry_delay = min(retry_delay * 2, 2.0)
+        finally:
+            with contextlib.suppress(Exception):
+                await self._notify("textDocument/didClose", {
+                    "textDocument": {"uri": READINESS_PROBE_URI}
+                })
 
     async def restart(self) -> None:
         """Restart the ALS process.
@@ -421,6 +499,24 @@ class ALSClient:
         """
         await self._write({"jsonrpc": "2.0", "method": method, "params": params})
 
+    async def notify_did_open(self, uri: str, text: str, language_id: str = "ada", version: int = 1) -> None:
+        """Send a textDocument/didOpen notification for a document.
+        
+        Args:
+            uri: Document URI
+            text: Full document text
+            language_id: LSP language identifier
+            version: Document version number
+        """
+        await self._notify("textDocument/didOpen", {
+            "textDocument": {
+                "uri": uri,
+                "languageId": language_id,
+                "version": version,
+                "text": text
+            }
+        })
+
     async def _send(self, msg: JsonDict) -> None:
         """Send a JSON-RPC message and prepare for response if needed.
         
@@ -428,14 +524,20 @@ class ALSClient:
             msg: Complete JSON-RPC message dictionary
             
         Note:
-            If the message has an 'id', creates a Future to track
-            the response. The Future will be resolved when the
-            response arrives in _reader_loop.
+            If the message has an 'id', a Future tracking the response is
+            registered before writing (unless the caller already registered
+            one), so a reply that arrives while the write is still draining
+            cannot be missed. The Future is resolved in _reader_loop.
         """
-        await self._write(msg)
-        if "id" in msg:
-            fut = asyncio.get_running_loop().create_future()
-            self._pending[str(msg["id"])] = fut
+        mid = str(msg["id"]) if "id" in msg else None
+        if mid is not None and mid not in self._pending:
+            self._pending[mid] = asyncio.get_running_loop().create_future()
+        try:
+            await self._write(msg)
+        except BaseException:
+            if mid is not None:
+                self._pending.pop(mid, None)
+            raise
 
     async def request_with_timeout(self, msg: JsonDict, timeout: float) -> Any:
         """Send a request and wait for response with timeout.
@@ -450,6 +552,12 @@ class ALSClient:
         Raises:
             asyncio.TimeoutError: If no response within timeout
             ALSProtocolError: If ALS returns an error response
+            ALSCommunicationError: If the response reader has already stopped
+            
+        Note:
+            The timeout bounds the whole exchange, including writing the
+            request. On timeout a ``$/cancelRequest`` is sent so ALS can
+            drop the work instead of finishing a reply nobody reads.
             
         Example:
             result = await client.request_with_timeout({
@@ -457,11 +565,44 @@ class ALSClient:
                 "params": {"textDocument": {"uri": "file:///..."}}
             }, timeout=30)
         """
+        if self._reader_task is not None and self._reader_task.done():
+            # No reply can ever arrive; fail now instead of after the timeout
+            raise ALSCommunicationError("ALS connection lost (response reader stopped)")
         mid = self._next_id()
         msg["id"] = mid
-        await self._send(msg)
         fut = self._pending[mid] = asyncio.get_running_loop().create_future()
-        return await asyncio.wait_for(fut, timeout=timeout)
+        
+        async def exchange() -> Any:
+            await self._send(msg)
+            return await fut
+        
+        try:
+            return await asyncio.wait_for(exchange(), timeout=timeout)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(self._notify("$/cancelRequest", {"id": mid}), timeout=1)
+            raise
+        finally:
+            # Drop the entry if no response arrived (timeout or cancellation)
+            self._pending.pop(mid, None)
+
+    async def request_formatting(self, uri: str, timeout: float) -> Any:
+        """Request textDocument/formatting for an open document.
+        
+        Only the small request envelope is built per call; the formatting
+        options are a shared constant.
+        
+        Args:
+            uri: URI of a document previously opened with didOpen
+            timeout: Maximum seconds to wait for the response
+            
+        Returns:
+            The list of text edits returned by ALS (or None)
+        """
+        return await self.request_with_timeout({
+            "method": "textDocument/formatting",
+            "params": {"textDocument": {"uri": uri}, "options": FORMATTING_OPTIONS},
+        }, timeout=timeout)
 
     async def _write(self, msg: JsonDict) -> None:
         """Write a JSON-RPC message to ALS stdin.
@@ -503,7 +644,8 @@ class ALSClient:
         When a response arrives:
         - If it has an 'error', the waiting Future gets ALSProtocolError
         - If it has a 'result', the waiting Future gets the result value
-        - Notifications (no 'id') are currently ignored
+        - A ``window/logMessage`` reporting a loaded project marks the
+          client ready (see wait_ready); other notifications are ignored
         """
         if not self.process or not self.process.stdout:
             raise RuntimeError("ALS process is not running (stdout unavailable)")
@@ -567,6 +709,10 @@ class ALSClient:
                             fut.set_exception(ALSProtocolError(msg["error"]))
                         else:
                             fut.set_result(msg["result"])
+                elif msg.get("method") == "window/logMessage" and not self._ready.is_set():
+                    text = str((msg.get("params") or {}).get("message", "")).lower()
+                    if "project" in text and "loaded" in text and "not loaded" not in text:
+                        self._ready.set()
         except asyncio.CancelledError:
             # Normal cancellation during shutdown
             raise
@@ -43,6 +43,7 @@ async def initialize_als_client(
         Initialized ALS client or None if --no-als
     """
     client = None
+    log = ui.log_line if ui else print
     
     if not no_als:
         metrics.start_timer('als_startup')
@@ -52,7 +53,7 @@ async def initialize_als_client(
                 project_file=project_file, 
                 stderr_file_path=stderr_path,
                 init_timeout=init_timeout,
-                logger=ui.log_line if ui else print,
+                logger=log,
                 debug_logger=debug_logger
             )
             await client.start()
@@ -61,91 +62,34 @@ async def initialize_als_client(
             startup_duration = metrics.end_timer('als_startup')
             metrics.record_als_startup(startup_duration, als_start_success, str(project_file))
         
-        # Readiness probe: Send dummy requests until ALS is fully initialized
-        # This replaces the fixed warmup delay with actual readiness detection
-        if ui:
-            ui.log_line("[als] Verifying ALS readiness...")
-        else:
-            print("[als] Verifying ALS readiness...")
-            
-        # Create a minimal Ada source for readiness check
-        dummy_ada_source = """package Dummy is
-   procedure Test;
-end Dummy;"""
-        
-        dummy_uri = "file:///tmp/adafmt_readiness_probe.ads"
+        # Formatting requests can only fail if ALS does not offer them
+        if not client.supports_formatting:
+            log("[als] Error: ALS does not advertise documentFormattingProvider; cannot format")
+            await client.shutdown()
+            raise SystemExit(1)
         
-        # Retry readiness check with exponential backoff
-        max_retries = max(1, als_ready_timeout // 5) if als_ready_timeout > 0 else 3  # Use timeout to determine retries
-        retry_delay = 2.0  # Start with 2 second delay
+        # Readiness: return as soon as ALS answers a probe or reports the
+        # project loaded; als_ready_timeout is an upper bound, not a delay
+        log("[als] Verifying ALS readiness...")
         
-        for attempt in range(max_retries):
-            try:
-                # Open dummy file
-                await client._notify("textDocument/didOpen", {
-                    "textDocument": {
-                        "uri": dummy_uri,
-                        "languageId": "ada",
-                        "version": 1,
-                        "text": dummy_ada_source
-                    }
-                })
-                
-                # Try formatting with extended timeout for first request
-                await client.request_with_timeout({
-                    "method": "textDocument/formatting",
-                    "params": {
-                        "textDocument": {"uri": dummy_uri},
-                        "options": {"tabSize": 3, "insertSpaces": True}
-                    }
-                }, timeout=60)  # Longer timeout for first request
-                
-                # Close dummy file
-                await client._notify("textDocument/didClose", {
-                    "textDocument": {"uri": dummy_uri}
-                })
-                
-                if ui:
-                    ui.log_line("[als] ALS is ready for formatting")
-                else:
-                    print("[als] ALS is ready for formatting")
-                break  # Success!
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    if ui:
-                        ui.log_line(f"[als] ALS not ready yet (attempt {attempt + 1}/{max_retries}), waiting {retry_delay}s...")
-                    else:
-                        print(f"[als] ALS not ready yet (attempt {attempt + 1}/{max_retries}), waiting {retry_delay}s...")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay = min(retry_delay * 1.5, 10.0)  # Exponential backoff, max 10s
-                else:
-                    if ui:
-                        ui.log_line(f"[als] Warning: Readiness check failed after {max_retries} attempts: {e}")
-                        ui.log_line("[als] Continuing anyway - first file may take longer")
-                    else:
-                        print(f"[als] Warning: Readiness check failed after {max_retries} attempts: {e}")
-                        print("[als] Continuing anyway - first file may take longer")
+        ready_bound = als_ready_timeout if als_ready_timeout > 0 else init_timeout
+        try:
+            await asyncio.wait_for(client.wait_ready(), timeout=ready_bound)
+            log("[als] ALS is ready for formatting")
+        except Exception as e:
+            reason = f"not ready after {ready_bound}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            log(f"[als] Warning: Readiness check failed: {reason}")
+            log("[als] Continuing anyway - first file may take longer")
             
         # Echo launch context for debugging
         launch_msg = f"[als] cwd={client._launch_cwd} cmd={client._launch_cmd}"
-        if ui:
-            ui.log_line(launch_msg)
-        else:
-            print(launch_msg)
+        log(launch_msg)
         
         # Display log paths early so users know where to find them
-        if ui:
-            ui.log_line(f"[als] ALS log: {client.als_log_path or '~/.als/ada_ls_log.*.log (default location)'}")
-            ui.log_line(f"[als] Stderr log: {client._stderr_log_path}")
-        else:
-            print(f"[als] ALS log: {client.als_log_path or '~/.als/ada_ls_log.*.log (default location)'}")
-            print(f"[als] Stderr log: {client._stderr_log_path}")
+        log(f"[als] ALS log: {client.als_log_path or '~/.als/ada_ls_log.*.log (default location)'}")
+        log(f"[als] Stderr log: {client._stderr_log_path}")
             
     else:
-        if ui:
-            ui.log_line("[als] ALS formatting disabled (--no-als)")
-        else:
-            print("[als] ALS formatting disabled (--no-als)")
+        log("[als] ALS formatting disabled (--no-als)")
             
     return client
\ No newline at end of file
@@ -1,10 +1,142 @@
 """Argument validation module for adafmt - validates CLI arguments and paths."""
 
+import os
+import stat
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from .path_validator import validate_path
+from .file_discovery import ADA_SUFFIXES
+from .path_validator import validate_path as _validate_path
+
+# Repeated --file arguments are validated once per distinct string
+validate_path = lru_cache(maxsize=4096)(_validate_path)
+
+# File arguments spread over at least this many directories are checked
+# from a thread pool
+PARALLEL_FILE_CHECK_MIN = 32
+
+
+def _resolve_relative(cwd: str, path: str, follow_symlinks: bool = False) -> Path:
+    """Make a relative path string absolute against ``cwd``.
+    
+    By default this is lexical (``os.path.abspath``): symlinks are not
+    followed and ``..`` is folded textually. With ``follow_symlinks`` the
+    path is resolved like ``Path.resolve()``, so ``link/..`` is the parent
+    of the link's target.
+    """
+    joined = os.path.join(cwd, os.path.expanduser(path))
+    return Path(os.path.realpath(joined) if follow_symlinks else os.path.abspath(joined))
+
+
+def _regular_file_status(path: Union[str, Path]) -> Optional[bool]:
+    """Check existence and file type with a single stat call.
+    
+    Returns:
+        None if the path does not exist, otherwise whether it is a regular file
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return stat.S_ISREG(st.st_mode)
+
+
+def _directory_file_statuses(directory: str, paths: List[str]) -> Dict[str, Optional[bool]]:
+    """Classify several paths in one directory with a single scandir.
+    
+    Entries carry their type from the directory listing, so no stat is
+    needed per file. Symlinks, names the listing does not contain (for
+    example on case-insensitive filesystems) and unreadable directories
+    fall back to :func:`_regular_file_status`.
+    """
+    wanted = {os.path.basename(p): p for p in paths}
+    statuses: Dict[str, Optional[bool]] = {}
+    try:
+        with os.scandir(directory or os.curdir) as entries:
+            for entry in entries:
+                path = wanted.get(entry.name)
+                if path is None or entry.is_symlink():
+                    continue
+                try:
+                    statuses[path] = entry.is_file(follow_symlinks=False)
+                except OSError:
+                    continue
+                if len(statuses) == len(wanted):
+                    break
+    except OSError:
+        pass
+    for path in paths:
+        if path not in statuses:
+            statuses[path] = _regular_file_status(path)
+    return statuses
+
+
+def _file_statuses(paths: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """Classify file arguments, listing each shared parent directory once.
+    
+    Paths alone in their directory are stat'ed directly. Many directories
+    are checked from a thread pool so the calls overlap, which matters on
+    network filesystems.
+    """
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        groups.setdefault(os.path.dirname(path), []).append(path)
+    
+    def classify(item: Tuple[str, List[str]]) -> Dict[str, Optional[bool]]:
+        directory, members = item
+        if len(members) == 1:
+            return {members[0]: _regular_file_status(members[0])}
+        return _directory_file_statuses(directory, members)
+    
+    if len(groups) < PARALLEL_FILE_CHECK_MIN:
+        results = map(classify, groups.items())
+    else:
+        # Imported here: concurrent.futures pulls in logging at import time
+        from concurrent.futures import ThreadPoolExecutor
+        workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(classify, groups.items()))
+    statuses: Dict[str, Optional[bool]] = {}
+    for result in results:
+        statuses.update(result)
+    return statuses
+
+
+def _validate_one_file(index: int, file_path: str, is_file: Optional[bool]) -> List[str]:
+    """Return the errors for one explicit file argument (1-based index).
+    
+    ``is_file`` is the argument's status from :func:`_file_statuses`.
+    """
+    errors = []
+    validation_error = validate_path(file_path)
+    if validation_error:
+        errors.append(f"File path {index} {validation_error}: {file_path}")
+        
+    if is_file is None:
+        errors.append(f"File does not exist: {file_path}")
+    elif not is_file:
+        errors.append(f"Path is not a file: {file_path}")
+    elif not file_path.lower().endswith(ADA_SUFFIXES):
+        errors.append(f"Not an Ada file: {file_path}")
+    return errors
+
+
+def _validate_files(files: List[str]) -> List[str]:
+    """Validate explicit file arguments, in order.
+    
+    A file given more than once is checked (and reported) once, under the
+    index of its first occurrence.
+    """
+    first_index: Dict[str, int] = {}
+    for i, file_path in enumerate(files, start=1):
+        first_index.setdefault(file_path, i)
+    statuses = _file_statuses(first_index)
+    errors: List[str] = []
+    for file_path, index in first_index.items():
+        errors.extend(_validate_one_file(index, file_path, statuses[file_path]))
+    return errors
 
 
 class ArgumentValidator:
@@ -31,76 +163,67 @@ class ArgumentValidator:
         errors = []
         
         # Validate project path
-        if not project_path.exists():
+        is_file = _regular_file_status(project_path)
+        if is_file is None:
             errors.append(f"Project path does not exist: {project_path}")
-        elif not project_path.is_file():
+        elif not is_file:
             errors.append(f"Project path is not a file: {project_path}")
         elif project_path.suffix.lower() != ".gpr":
             errors.append(f"Project path must be a .gpr file, got: {project_path}")
         else:
-            validation_error = validate_path(str(project_path))
+            validation_error = validate_path(os.fspath(project_path))
             if validation_error:
                 errors.append(f"Project path {validation_error}: {project_path}")
             
         # Validate include paths
         for i, include_path in enumerate(include_paths):
-            validation_error = validate_path(str(include_path))
+            validation_error = validate_path(os.fspath(include_path))
             if validation_error:
                 errors.append(f"Include path {i+1} {validation_error}: {include_path}")
             # Don't check existence - may be created later
                 
         # Validate exclude paths  
         for i, exclude_path in enumerate(exclude_paths):
-            validation_error = validate_path(str(exclude_path))
+            validation_error = validate_path(os.fspath(exclude_path))
             if validation_error:
                 errors.append(f"Exclude path {i+1} {validation_error}: {exclude_path}")
             # Don't check existence - pattern matching
                 
         # Validate patterns path
         if patterns_path and not no_patterns:
-            if not patterns_path.exists():
+            is_file = _regular_file_status(patterns_path)
+            if is_file is None:
                 errors.append(f"Patterns file does not exist: {patterns_path}")
-            elif not patterns_path.is_file():
+            elif not is_file:
                 errors.append(f"Patterns path is not a file: {patterns_path}")
             elif patterns_path.suffix.lower() != ".json":
                 errors.append(f"Patterns file must be a .json file, got: {patterns_path}")
             else:
-                validation_error = validate_path(str(patterns_path))
+                validation_error = validate_path(os.fspath(patterns_path))
                 if validation_error:
                     errors.append(f"Patterns path {validation_error}: {patterns_path}")
                 
         # Validate explicit files
         if files:
-            for i, file_path in enumerate(files):
-                validation_error = validate_path(file_path)
-                if validation_error:
-                    errors.append(f"File path {i+1} {validation_error}: {file_path}")
-                    
-                path = Path(file_path)
-                if not path.exists():
-                    errors.append(f"File does not exist: {file_path}")
-                elif not path.is_file():
-                    errors.append(f"Path is not a file: {file_path}")
-                elif path.suffix.lower() not in (".ads", ".adb", ".ada"):
-                    errors.append(f"Not an Ada file: {file_path}")
+            errors.extend(_validate_files(files))
                     
         # Validate log path
         if log_path:
-            validation_error = validate_path(str(log_path))
+            validation_error = validate_path(os.fspath(log_path))
             if validation_error:
                 errors.append(f"Log path {validation_error}: {log_path}")
             # Parent directory will be created if needed
                 
         # Validate stderr path  
         if stderr_path:
-            validation_error = validate_path(str(stderr_path))
+            validation_error = validate_path(os.fspath(stderr_path))
             if validation_error:
                 errors.append(f"Stderr path {validation_error}: {stderr_path}")
             # Parent directory will be created if needed
                 
         # Validate metrics path
         if metrics_path:
-            validation_error = validate_path(str(metrics_path))
+            validation_error = validate_path(os.fspath(metrics_path))
             if validation_error:
                 errors.append(f"Metrics path {validation_error}: {metrics_path}")
             # Parent directory will be created if needed
@@ -145,11 +268,39 @@ class ArgumentValidator:
         return len(errors) == 0, errors
         
     @staticmethod
-    def ensure_absolute_path(path: Path, name: str) -> Path:
-        """Ensure a path is absolute."""
+    def ensure_absolute_path(path: Path, name: str, cwd: Optional[str] = None,
+                             follow_symlinks: bool = False) -> Path:
+        """Ensure a path is absolute.
+        
+        ``cwd`` lets callers converting many paths look the working
+        directory up once; it defaults to the current one. Relative paths
+        are made absolute lexically unless ``follow_symlinks`` is set.
+        """
         if not path.is_absolute():
-            abs_path = path.expanduser().resolve()
+            abs_path = _resolve_relative(cwd or os.getcwd(), os.fspath(path), follow_symlinks)
             print(f"Note: Converting relative {name} to absolute: {path} → {abs_path}", 
                   file=sys.stderr)
             return abs_path
-        return path
\ No newline at end of file
+        return path
+    
+    @staticmethod
+    def ensure_absolute_paths(paths: Optional[Iterable[Path]], name: str,
+                              cwd: Optional[str] = None) -> Tuple[Path, ...]:
+        """Ensure every path in a repeated option is absolute.
+        
+        Relative paths are resolved with symlinks followed, as these are
+        include and exclude roots whose nesting is compared before
+        discovery walks them.
+        
+        Args:
+            paths: Paths as given on the command line (or None)
+            name: Option description used in conversion notes, e.g. "include path"
+            cwd: Working directory to resolve against (looked up once if None)
+            
+        Returns:
+            Tuple of absolute paths, in the original order
+        """
+        cwd = cwd or os.getcwd()
+        return tuple(ArgumentValidator.ensure_absolute_path(Path(p), f"{name} {i}", cwd,
+                                                            follow_symlinks=True)
+                     for i, p in enumerate(paths or (), start=1))
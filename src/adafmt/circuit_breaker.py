@@ -0,0 +1,89 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Circuit breaker for failing fast while ALS is unhealthy."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+PROBE_POLL_SECONDS = 0.05
+"""How often callers re-check a half-open breaker whose probes are in flight."""
+
+
+@dataclass
+class CircuitBreaker:
+    """Closed/Open/Half-Open state machine guarding calls to ALS.
+
+    The breaker opens after ``failure_threshold`` consecutive failures.
+    While open, allow() returns False and callers hold their requests
+    for retry_after() seconds instead of piling onto a struggling
+    server. After ``open_seconds`` it goes half-open
+    and lets ``half_open_probes`` calls through. If all of them succeed
+    it closes again; any failure reopens it.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the breaker (0 = never)
+        open_seconds: Time the breaker stays open before probing
+        half_open_probes: Successful probes required to close again
+        state: Current state (CLOSED, OPEN or HALF_OPEN)
+        consecutive_failures: Failures since the last success
+        opened_at: Clock value when the breaker last opened
+    """
+    failure_threshold: int = 5
+    open_seconds: float = 10.0
+    half_open_probes: int = 3
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    _probes_admitted: int = field(default=0, repr=False)
+    _probes_succeeded: int = field(default=0, repr=False)
+
+    def allow(self) -> bool:
+        """Return True if a call may go through now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if self.clock() - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._probes_admitted = 0
+            self._probes_succeeded = 0
+        if self._probes_admitted >= self.half_open_probes:
+            return False
+        self._probes_admitted += 1
+        return True
+
+    def retry_after(self) -> float:
+        """Return how long to wait before asking allow() again."""
+        if self.state == OPEN:
+            return max(0.0, self.opened_at + self.open_seconds - self.clock())
+        if self.state == HALF_OPEN:
+            return PROBE_POLL_SECONDS
+        return 0.0
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self.consecutive_failures = 0
+        if self.state == HALF_OPEN:
+            self._probes_succeeded += 1
+            if self._probes_succeeded >= self.half_open_probes:
+                self.state = CLOSED
+                self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker when warranted."""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+                self.failure_threshold > 0 and self.consecutive_failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = self.clock()
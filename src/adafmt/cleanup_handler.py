@@ -7,15 +7,19 @@
 
 """Cleanup and signal handling for the Ada formatter."""
 
+from __future__ import annotations
+
 import atexit
-import asyncio
 import contextlib
 import signal
 import sys
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import asyncio
 
-from .als_client import ALSClient
-from .logging_jsonl import JsonlLogger
+    from .als_client import ALSClient
+    from .logging_jsonl import JsonlLogger
 
 
 # Global cleanup state
@@ -24,45 +28,42 @@ cleanup_ui: Optional[Any] = None
 cleanup_logger: Optional[JsonlLogger] = None
 cleanup_pattern_logger: Optional[JsonlLogger] = None
 cleanup_restore_stderr: Optional[Any] = None
+# Event loop that owns cleanup_client (captured when the client is set)
+cleanup_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _terminate_client(client: ALSClient) -> None:
+    """Terminate the ALS process directly if it is still running."""
+    process = getattr(client, 'process', None)
+    if process is not None and process.returncode is None:
+        with contextlib.suppress(Exception):
+            process.terminate()
 
 
 def cleanup_handler(signum: Optional[int] = None, frame: Optional[Any] = None) -> None:
     """Clean up resources on exit or signal."""
     try:
         if cleanup_client:
-            # Force sync shutdown of ALS client
-            try:
-                try:
-                    # Try to get the running loop
-                    loop = asyncio.get_running_loop()
-                    # Schedule shutdown task
-                    loop.create_task(cleanup_client.shutdown())
-                except RuntimeError:
-                    # No running loop, create new one for shutdown
-                    asyncio.run(cleanup_client.shutdown())
-            except Exception:
-                # Force kill the process if graceful shutdown fails
-                if hasattr(cleanup_client, '_proc') and cleanup_client._proc:
-                    try:
-                        cleanup_client._proc.terminate()
-                    except Exception:
-                        pass
+            client = cleanup_client
+            loop = cleanup_loop
+            if signum is None and loop is not None and loop.is_running() and not loop.is_closed():
+                # Graceful LSP shutdown on the client's own loop
+                loop.call_soon_threadsafe(lambda: loop.create_task(client.shutdown()))
+            else:
+                # A signal exits right away and a finished loop cannot run
+                # the shutdown coroutine; never start a second event loop here
+                _terminate_client(client)
         
-        if cleanup_ui:
-            with contextlib.suppress(Exception):
-                cleanup_ui.close()
-        
-        if cleanup_logger:
-            with contextlib.suppress(Exception):
-                cleanup_logger.close()
-        
-        if cleanup_pattern_logger:
-            with contextlib.suppress(Exception):
-                cleanup_pattern_logger.close()
-                
-        if cleanup_restore_stderr:
-            with contextlib.suppress(Exception):
-                cleanup_restore_stderr()
+        # Close the remaining resources in order; one failure never skips the rest
+        for close in (
+            cleanup_ui.close if cleanup_ui else None,
+            cleanup_logger.close if cleanup_logger else None,
+            cleanup_pattern_logger.close if cleanup_pattern_logger else None,
+            cleanup_restore_stderr,
+        ):
+            if close:
+                with contextlib.suppress(Exception):
+                    close()
                 
     except Exception:
         pass  # Don't let cleanup errors crash the cleanup
@@ -79,9 +80,15 @@ def setup_cleanup_handlers() -> None:
 
 
 def set_cleanup_client(client: Optional[ALSClient]) -> None:
-    """Set the ALS client for cleanup."""
-    global cleanup_client
+    """Set the ALS client for cleanup, remembering the loop that runs it."""
+    import asyncio
+    
+    global cleanup_client, cleanup_loop
     cleanup_client = client
+    try:
+        cleanup_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        cleanup_loop = None
 
 
 def set_cleanup_ui(ui: Optional[Any]) -> None:
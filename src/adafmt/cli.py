@@ -10,38 +10,57 @@
 from __future__ import annotations
 
 
-import asyncio
+import os
 import sys
+import threading
 import time
+import traceback
 from pathlib import Path
-from typing import List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Any, Coroutine, List, NoReturn, Optional, Sequence, Tuple
 from enum import Enum
 
 import typer
+from typer.core import TyperGroup
 from typing_extensions import Annotated
 
-from .als_client import ALSClient
-from .file_discovery_new import discover_files
-from .file_processor import FileProcessor
-from .logging_jsonl import JsonlLogger
-from .pattern_formatter import PatternFormatter
-from .metrics import MetricsCollector
-from .pattern_validator import PatternValidator
+# Modules needed only by a formatting run (asyncio, ALS client, file
+# processing, patterns, reporting) are imported inside the functions that
+# use them, so --help, --version and license start without loading them.
+from .file_discovery import collapse_nested_paths
 from .argument_validator import ArgumentValidator
-from .pattern_loader import load_patterns
-from .als_initializer import initialize_als_client
-from .logging_setup import setup_loggers
-from .final_reporter import finalize_and_report
-from .stderr_handler import setup_stderr_redirect
-from .run_setup import execute_pre_hook, run_preflight_checks
 from .default_paths import get_default_paths
 from .cleanup_handler import (
     cleanup_handler, setup_cleanup_handlers,
     set_cleanup_client, set_cleanup_ui, set_cleanup_logger,
     set_cleanup_pattern_logger, set_cleanup_restore_stderr
 )
-from .cli_helpers import APP_VERSION, read_license_text, version_callback
+from .config import DEFAULT_CONCURRENCY, FormatConfig
+from .cli_helpers import APP_HEADER, APP_VERSION, read_license_text, version_callback
 from .tui import make_ui
+from .utils import new_run_id, parse_hook_command
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .als_client import ALSClient
+    from .file_processor import FileProcessor
+    from .logging_jsonl import JsonlLogger
+    from .metrics import MetricsCollector
+    from .pattern_formatter import PatternFormatter
+
+FOOTER_UPDATE_INTERVAL = 0.1
+"""Minimum seconds between per-file footer redraws (the last file always redraws)."""
+
+
+def _run_event_loop(main: Coroutine[Any, Any, int]) -> int:
+    """Run ``main`` on the libuv-based event loop when it is installed, else on asyncio."""
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+        return asyncio.run(main)
+    return uvloop.run(main)
+
 
 # Setup signal and cleanup handlers
 setup_cleanup_handlers()
@@ -56,23 +75,54 @@ class PreflightMode(str, Enum):
     aggressive = "aggressive"
     fail = "fail"
 
-app = typer.Typer(
-    name="adafmt",
-    help="Ada Language Formatter - Format Ada source code using the Ada Language Server (ALS).",
+class FsyncMode(str, Enum):
+    off = "off"
+    batched = "batched"
+    per_file = "per-file"
+
+class _LazyCommandGroup(TyperGroup):
+    """Command group that builds large subcommands only when they are used.
+    
+    Typer turns every annotated option into a Click parameter when the
+    group is built. Commands registered on their own Typer app in
+    ``_LAZY_COMMANDS`` are converted on first lookup instead, so
+    ``adafmt license`` and ``adafmt --version`` skip the ``format`` options.
+    """
+    
+    def list_commands(self, ctx: typer.Context) -> List[str]:
+        names = super().list_commands(ctx)
+        return names + [name for name in _LAZY_COMMANDS if name not in names]
+    
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> Optional[Any]:
+        if cmd_name in _LAZY_COMMANDS and cmd_name not in self.commands:
+            self.add_command(typer.main.get_command(_LAZY_COMMANDS[cmd_name]), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+_APP_SETTINGS = dict(
     add_completion=False,
     rich_markup_mode="rich",
     context_settings={"help_option_names": ["-h", "--help"]},
     pretty_exceptions_enable=False,
 )
 
+app = typer.Typer(
+    name="adafmt",
+    help="Ada Language Formatter - Format Ada source code using the Ada Language Server (ALS).",
+    cls=_LazyCommandGroup,
+    **_APP_SETTINGS,
+)
+
+# Single-command apps for the lazily built subcommands of ``app``
+_format_app = typer.Typer(**_APP_SETTINGS)
+_LAZY_COMMANDS = {"format": _format_app}
+
 @app.callback(invoke_without_command=False)
 def main_callback(
     version: Annotated[Optional[bool], typer.Option("--version", "-v", callback=version_callback, help="Show version and exit")] = None
 ) -> None:
     """Print header for all commands."""
-    print("=" * 80)
-    print(f"Ada Formatter  {APP_VERSION}")
-    print("=" * 80)
+    sys.stdout.write(APP_HEADER)
 
 async def _handle_pattern_validation(
     validate_patterns: bool, pattern_formatter: Optional[PatternFormatter],
@@ -80,6 +130,8 @@ async def _handle_pattern_validation(
     file_paths: List[Path], format_timeout: int, ui: Optional[Any]
 ) -> Optional[int]:
     """Handle pattern validation mode if requested."""
+    from .pattern_validator import PatternValidator
+    
     if not validate_patterns:
         return None
         
@@ -106,27 +158,32 @@ async def _handle_pattern_validation(
         await client.shutdown()
     return 1 if error_count > 0 else 0
 
+# Status column text, left-aligned with icon and padded to 11 chars
+_STATUS_DISPLAY = {
+    "found": "✓ found     ",
+    "formatted": "~ formatted ",
+    "amended": "Δ amended   ",
+    "unchanged": "= unchanged ",
+    "failed": "✗ failed    ",
+}
+_FAILED_TAG = f"[{_STATUS_DISPLAY['failed']}]"
+_FAILED_TAG_COLORED = f"\033[91m{_FAILED_TAG}\033[0m"
+
+# (stdout object, its isatty() result) for _stdout_is_tty
+_stdout_tty: Tuple[Any, bool] = (None, False)
+
 def _build_status_line(
     idx: int, total: int, path: Path, status: str,
-    note: Optional[str], no_als: bool,
-    pattern_formatter: Optional[PatternFormatter]
+    note: Optional[str], no_als: bool, patterns_active: bool
 ) -> str:
-    """Build status line for file processing output."""
+    """Build status line for file processing output.
+    
+    ``patterns_active`` is whether a pattern formatter is loaded and enabled;
+    callers evaluate it once per run rather than once per line.
+    """
     prefix = f"[{idx:>4}/{total}]"
     # Left-align status with icon, pad to 11 chars total
-    if status == "found":
-        status_display = "✓ found     "
-    elif status == "formatted":
-        status_display = "~ formatted "
-    elif status == "amended":
-        status_display = "Δ amended   "
-    elif status == "unchanged":
-        status_display = "= unchanged "
-    elif status == "failed":
-        status_display = "✗ failed    "
-    else:
-        # Fallback - left align with padding
-        status_display = f"{status:<11}"
+    status_display = _STATUS_DISPLAY.get(status) or f"{status:<11}"
     
     line = f"{prefix} [{status_display}] {path}"
     
@@ -134,16 +191,10 @@ def _build_status_line(
     if not no_als and status in ["formatted", "amended"]:
         line += " | ALS: ✓"
     
-    # Add pattern info if patterns were applied
-    if pattern_formatter and pattern_formatter.enabled:
-        pattern_result = pattern_formatter.files_touched.get(str(path))
-        if pattern_result:
-            patterns_applied = len(pattern_result.applied_names)
-            replacements = pattern_result.replacements_sum
-            if patterns_applied > 0:
-                line += f" | Patterns: applied={patterns_applied} ({replacements})"
-        elif status == "queued":
-            line += " | Patterns: queued"
+    # Per-file pattern counts are reported in the logs; the status line
+    # only notes files queued for pattern processing
+    if patterns_active and status == "queued":
+        line += " | Patterns: queued"
     
     if status == "failed":
         line += "  (details in the stderr log)"
@@ -152,18 +203,20 @@ def _build_status_line(
         
     return line
 
+def _stdout_is_tty() -> bool:
+    """Return sys.stdout.isatty(), asking once per stdout object."""
+    global _stdout_tty
+    stream = sys.stdout
+    if _stdout_tty[0] is not stream:
+        _stdout_tty = (stream, stream.isatty())
+    return _stdout_tty[1]
+
 def _print_colored_line(line: str) -> None:
     """Print status line with terminal colors."""
-    if sys.stdout.isatty():
-        # Check if line contains failed status with the cross mark
-        if "[✗ failed" in line and "]" in line:
-            # Find the exact failed status bracket
-            start_idx = line.find("[✗ failed")
-            # Find the closing bracket after the start
-            end_idx = line.find("]", start_idx) + 1
-            failed_text = line[start_idx:end_idx]
-            # Color the entire status bracket in bright red
-            colored_line = line[:start_idx] + "\033[91m" + failed_text + "\033[0m" + line[end_idx:]
+    if _stdout_is_tty():
+        if _FAILED_TAG in line:
+            # Color the failed status bracket in bright red
+            colored_line = line.replace(_FAILED_TAG, _FAILED_TAG_COLORED, 1)
         else:
             # All other statuses in light gray
             # Using 256-color palette: 253 (very light gray)
@@ -174,74 +227,121 @@ def _print_colored_line(line: str) -> None:
 
 async def _process_files(
     file_paths: List[Path], file_processor: FileProcessor,
-    run_start_time: float, ui: Optional[Any],
+    run_start: float, ui: Optional[Any],
     pattern_formatter: Optional[PatternFormatter], no_als: bool,
     log_path: Optional[Path], stderr_path: Optional[Path],
     pattern_log_path: Path, using_default_log: bool,
     using_default_stderr: bool, using_default_patterns: bool,
-    client: Optional[ALSClient]
+    client: Optional[ALSClient], concurrency: int = 1
 ) -> None:
-    """Process all files and report progress."""
+    """Process all files and report progress.
+    
+    Up to ``concurrency`` files are processed at the same time, so ALS
+    requests and file I/O for different files overlap. Each file's console
+    output (diffs, skip notices) is collected while it runs and emitted in
+    input order with its status line, and consecutive ALS timeouts are
+    counted in that same order, so output and the timeout limit match a
+    sequential run. ``run_start`` is the run's start on the
+    :func:`time.monotonic` clock.
+    """
+    import asyncio
+    
+    from .file_processor import FileOutput, FileTable
+    from .metrics_reporter import log_location_labels
+    
     total = len(file_paths)
     
     # Initialize worker pool if using parallel processing
     await file_processor.initialize_worker_pool()
     
-    for idx, path in enumerate(file_paths, start=1):
-        # Show "found" status
-        found_line = _build_status_line(
-            idx, total, path, "found", None, no_als, pattern_formatter)
-        if ui:
-            ui.log_line(found_line)
-        else:
-            _print_colored_line(found_line)
-        
-        # Process the file
-        file_start_time = time.time()
-        status, note = await file_processor.process_file(path, idx, total, run_start_time)
-        # Build status line
-        line = _build_status_line(
-            idx, total, path, status, note, no_als, pattern_formatter)
-        if ui:
-            ui.log_line(line)
-            ui.set_progress(idx, len(file_paths))
-            # Update footer stats
-            current_time = time.time()
-            elapsed = current_time - run_start_time
-            # Get current stats from processor
-            total_changed = file_processor.als_changed + file_processor.pattern_files_changed
-            total_failed = file_processor.als_failed
-            total_done = idx
-            total_unchanged = total_done - total_changed - total_failed
-            rate = total_done / elapsed if elapsed > 0 else 0
+    # Stat and build URIs for every file once, off the event loop
+    table = await asyncio.to_thread(FileTable.from_paths, file_paths)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    # Resolve the output sink once for all per-file lines
+    emit = ui.log_line if ui else _print_colored_line
+    # Footer log locations are fixed for the run
+    log_labels = log_location_labels(
+        log_path, stderr_path, pattern_log_path, using_default_log,
+        using_default_stderr, using_default_patterns, client, no_als) if ui else {}
+    patterns_active = bool(pattern_formatter and pattern_formatter.enabled)
+    last_footer_update = float("-inf")
+    
+    async def process_one(idx: int, path: Path) -> Tuple[str, Optional[str], FileOutput]:
+        output = FileOutput()
+        async with slots:
+            # Read the next file in the background while this one is processed
+            if idx < total:
+                file_processor.prefetch(file_paths[idx])
+            status, note = await file_processor.process_file(
+                path, idx, total, run_start,
+                size=table.sizes[idx - 1], uri=table.uris[idx - 1], output=output)
+        return status, note, output
+    
+    tasks = [asyncio.create_task(process_one(idx, path))
+             for idx, path in enumerate(file_paths, start=1)]
+    try:
+        for idx, (path, task) in enumerate(zip(file_paths, tasks), start=1):
+            # Show "found" status
+            emit(_build_status_line(
+                idx, total, path, "found", None, no_als, patterns_active))
             
-            ui.update_footer_stats(
-                total=len(file_paths), changed=total_changed,
-                unchanged=total_unchanged, failed=total_failed,
-                elapsed=elapsed, rate=rate,
-                jsonl_log=f"./{log_path} (default location)" if using_default_log else str(log_path) if log_path else "Not configured",
-                als_log=((client.als_log_path if client else None) or "~/.als/ada_ls_log.*.log (default location)") if not no_als else "N/A (ALS disabled)",
-                stderr_log=f"./{stderr_path} (default location)" if using_default_stderr else str(stderr_path) if stderr_path else "Not configured",
-                pattern_log=f"./{pattern_log_path} (default location)" if using_default_patterns else str(pattern_log_path)
-            )
-        else:
-            _print_colored_line(line)
+            # Wait for the file to finish processing, then emit its output
+            status, note, output = await task
+            output.replay()
+            # May abort the run once too many consecutive files timed out
+            file_processor.record_timeout(output.timed_out)
+            # Build status line
+            line = _build_status_line(
+                idx, total, path, status, note, no_als, patterns_active)
+            emit(line)
+            if ui:
+                # Update progress and footer stats, at most every FOOTER_UPDATE_INTERVAL
+                current_time = time.monotonic()
+                if current_time - last_footer_update < FOOTER_UPDATE_INTERVAL and idx < total:
+                    continue
+                last_footer_update = current_time
+                ui.set_progress(idx, total)
+                elapsed = current_time - run_start
+                # Get current stats from processor
+                total_changed = file_processor.als_changed + file_processor.pattern_files_changed
+                total_failed = file_processor.als_failed
+                total_done = idx
+                total_unchanged = total_done - total_changed - total_failed
+                rate = total_done / elapsed if elapsed > 0 else 0
+                
+                ui.update_footer_stats(
+                    total=total, changed=total_changed,
+                    unchanged=total_unchanged, failed=total_failed,
+                    elapsed=elapsed, rate=rate, **log_labels
+                )
+    finally:
+        # Stop outstanding files if reporting was aborted (e.g. timeout limit)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        file_processor.cancel_prefetches()
 
 
 async def _setup_formatter_environment(
     stderr_path: Optional[Path], log_path: Path, preflight_mode: str,
-    als_stale_minutes: int, pre_hook: Optional[str], hook_timeout: float,
+    als_stale_minutes: int, pre_hook: Optional[Tuple[str, ...]], hook_timeout: float,
     project_path: Path, no_als: bool, init_timeout: int,
     als_ready_timeout: int, validate_patterns: bool, write: bool,
     debug_patterns_path: Optional[Path] = None, debug_als_path: Optional[Path] = None
 ) -> Tuple[Any, Any, Any, Any, JsonlLogger, JsonlLogger, Path, Optional[JsonlLogger], Optional[Path], Optional[JsonlLogger], Optional[Path], MetricsCollector, Optional[ALSClient]]:
     """Set up the formatter environment including UI, loggers, and ALS client."""
+    from .als_initializer import initialize_als_client
+    from .logging_setup import setup_loggers
+    from .metrics import MetricsCollector
+    from .run_setup import execute_pre_hook, run_preflight_checks
+    from .stderr_handler import setup_stderr_redirect
+    
     # UI - always use plain TTY UI
     ui = make_ui("plain")
     set_cleanup_ui(ui)
     
     # Setup stderr redirection
-    _orig_stderr, _tee_fp, _restore_stderr = setup_stderr_redirect(stderr_path)
+    _orig_stderr, _stderr_fp, _restore_stderr = setup_stderr_redirect(stderr_path)
     set_cleanup_restore_stderr(_restore_stderr)
     
     # Setup UI mode display
@@ -263,7 +363,7 @@ async def _setup_formatter_environment(
     metrics = MetricsCollector(None)  # metrics_path will be set later if provided
     
     # Execute pre-hook
-    if not execute_pre_hook(pre_hook, hook_timeout, ui):
+    if not await execute_pre_hook(pre_hook, hook_timeout, ui):
         raise SystemExit(1)
     
     # Run preflight checks
@@ -278,71 +378,107 @@ async def _setup_formatter_environment(
     if client:
         set_cleanup_client(client)
         
-    return ui, _orig_stderr, _tee_fp, _restore_stderr, logger, pattern_logger, pattern_log_path, debug_pattern_logger, debug_pattern_log_path, debug_als_logger, debug_als_log_path, metrics, client
-
-async def run_formatter(
-    project_path: Path, include_paths: List[Path], exclude_paths: List[Path],
-    write: bool, diff: bool, check: bool, preflight_mode: str,
-    als_stale_minutes: int, pre_hook: Optional[str], post_hook: Optional[str],
-    init_timeout: int, als_ready_timeout: int, format_timeout: int,
-    max_attempts: int, log_path: Optional[Path], stderr_path: Optional[Path],
-    files: List[str], max_consecutive_timeouts: int, patterns_path: Optional[Path],
-    no_patterns: bool, patterns_timeout_ms: int, patterns_max_bytes: int,
-    hook_timeout: float, validate_patterns: bool = False,
-    debug_patterns_path: Optional[Path] = None, debug_als_path: Optional[Path] = None, metrics_path: Optional[Path] = None,
-    no_als: bool = False, max_file_size: int = 102400, num_workers: Optional[int] = None,
-    using_default_log: bool = False, using_default_stderr: bool = False,
-    using_default_patterns: bool = False,
-    using_default_debug_patterns: bool = False,
-    using_default_debug_als: bool = False) -> int:
+    return ui, _orig_stderr, _stderr_fp, _restore_stderr, logger, pattern_logger, pattern_log_path, debug_pattern_logger, debug_pattern_log_path, debug_als_logger, debug_als_log_path, metrics, client
+
+async def _cancel_discovery(task: Optional[asyncio.Task], stop: Optional[threading.Event]) -> None:
+    """Stop a streaming discovery task and wait until its walk has ended.
+    
+    ``stop`` halts the walker thread; the task itself only finishes once
+    that thread has returned.
+    """
+    import asyncio
+    
+    if task is None:
+        return
+    if stop is not None:
+        stop.set()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+async def run_formatter(cfg: FormatConfig) -> int:
     """Run the main formatting logic asynchronously."""
+    import asyncio
+    
+    from .file_discovery_new import consume_discovered_files, discover_files, stream_discovered_files
+    from .circuit_breaker import CircuitBreaker
+    from .file_processor import FileProcessor
+    from .final_reporter import finalize_and_report
+    from .pattern_loader import load_patterns
+    
+    # Wall clock for reported timestamps, monotonic clock for elapsed times
     run_start_time = time.time()
+    run_start = time.monotonic()
+    
+    # Start walking include paths now so discovery overlaps ALS startup
+    discovery_queue: Optional[asyncio.Queue] = None
+    discovery_task: Optional[asyncio.Task] = None
+    discovery_stop: Optional[threading.Event] = None
+    if cfg.stream_discovery and not cfg.files:
+        discovery_queue = asyncio.Queue()
+        discovery_stop = threading.Event()
+        discovery_task = asyncio.create_task(
+            stream_discovered_files(cfg.include_paths, cfg.exclude_paths, discovery_queue,
+                                    stop=discovery_stop))
     
     # Set up formatter environment
     try:
-        ui, _orig_stderr, _tee_fp, _restore_stderr, logger, pattern_logger, pattern_log_path, debug_pattern_logger, debug_pattern_log_path, debug_als_logger, debug_als_log_path, metrics, client = await _setup_formatter_environment(
-            stderr_path, log_path, preflight_mode, als_stale_minutes,
-            pre_hook, hook_timeout, project_path, no_als, init_timeout,
-            als_ready_timeout, validate_patterns, write, debug_patterns_path, debug_als_path
+        ui, _orig_stderr, _stderr_fp, _restore_stderr, logger, pattern_logger, pattern_log_path, debug_pattern_logger, debug_pattern_log_path, debug_als_logger, debug_als_log_path, metrics, client = await _setup_formatter_environment(
+            cfg.stderr_path, cfg.log_path, cfg.preflight_mode, cfg.als_stale_minutes,
+            cfg.pre_hook, cfg.hook_timeout, cfg.project_path, cfg.no_als, cfg.init_timeout,
+            cfg.als_ready_timeout, cfg.validate_patterns, cfg.write, cfg.debug_patterns_path, cfg.debug_als_path
         )
-    except SystemExit as e:
-        return e.code
+    except BaseException as e:
+        await _cancel_discovery(discovery_task, discovery_stop)
+        if isinstance(e, SystemExit):
+            return e.code
+        raise
+    log = ui.log_line if ui else print
     # Update metrics with the path if provided
-    if metrics_path:
-        metrics._metrics_path = str(metrics_path)
-    metrics_start_time = time.time()
+    if cfg.metrics_path:
+        metrics._metrics_path = str(cfg.metrics_path)
+    metrics_start_time = time.monotonic()
     # Discover files to process
-    file_paths = discover_files(files, include_paths, exclude_paths, ui)
-    # Log discovered files
-    if ui:
-        ui.log_line(f"[discovery] Found {len(file_paths)} Ada files to format")
+    if discovery_task:
+        try:
+            file_paths = await consume_discovered_files(discovery_queue, discovery_task, ui)
+        finally:
+            await _cancel_discovery(discovery_task, discovery_stop)
     else:
-        print(f"[discovery] Found {len(file_paths)} Ada files to format")
+        file_paths = discover_files(cfg.files, cfg.include_paths, cfg.exclude_paths, ui)
+    total_files = len(file_paths)
+    # Log discovered files
+    log(f"[discovery] Found {total_files} Ada files to format")
     
     # Load pattern formatter
     try:
         pattern_formatter, patterns_path = load_patterns(
-            patterns_path, no_patterns, using_default_patterns,
+            cfg.patterns_path, cfg.no_patterns, cfg.using_default_patterns,
             pattern_logger, ui, client, debug_pattern_logger
         )
     except SystemExit as e:
+        await _cancel_discovery(discovery_task, discovery_stop)
         if client:
             await client.shutdown()
         return e.code
     
+    # Reuse knowledge of sources the current patterns leave unchanged
+    if cfg.patterns_cache_path and pattern_formatter and pattern_formatter.enabled:
+        cached = pattern_formatter.load_clean_cache(cfg.patterns_cache_path)
+        log(f"[patterns] Loaded {cached} cached clean sources from {cfg.patterns_cache_path}")
+    
     # Log pattern run_start event
     pattern_logger.write({
         'ev': 'run_start',
         'patterns_path': str(patterns_path) if patterns_path else None,
         'patterns_loaded': pattern_formatter.loaded_count if pattern_formatter else 0,
-        'mode': 'VALIDATE' if validate_patterns else ('WRITE' if write else 'DRY'),
-        'timeout_ms': patterns_timeout_ms, 'max_bytes': patterns_max_bytes,
-        'validate_patterns': validate_patterns})
+        'mode': 'VALIDATE' if cfg.validate_patterns else ('WRITE' if cfg.write else 'DRY'),
+        'timeout_ms': cfg.patterns_timeout_ms, 'max_bytes': cfg.patterns_max_bytes,
+        'validate_patterns': cfg.validate_patterns})
     
     # Handle pattern validation if requested
     validation_result = await _handle_pattern_validation(
-        validate_patterns, pattern_formatter, pattern_logger,
-        client, file_paths, format_timeout, ui
+        cfg.validate_patterns, pattern_formatter, pattern_logger,
+        client, file_paths, cfg.format_timeout, ui
     )
     if validation_result is not None:
         return validation_result
@@ -359,59 +495,65 @@ async def run_formatter(
         return 0
     
     # Log that we're starting formatting
-    if ui:
-        ui.log_line("[formatter] Starting to format files...")
-    else:
-        print("[formatter] Starting to format files...")
+    log("[formatter] Starting to format files...")
     
     # Initialize file processor
     file_processor = FileProcessor(
         client=client, pattern_formatter=pattern_formatter,
         logger=logger, pattern_logger=pattern_logger,
-        ui=ui, metrics=metrics, no_als=no_als,
-        write=write, diff=diff, format_timeout=format_timeout,
-        max_consecutive_timeouts=max_consecutive_timeouts,
-        max_file_size=max_file_size, num_workers=num_workers)
+        ui=ui, metrics=metrics, no_als=cfg.no_als,
+        write=cfg.write, diff=cfg.diff, format_timeout=cfg.format_timeout,
+        max_consecutive_timeouts=cfg.max_consecutive_timeouts,
+        max_file_size=cfg.max_file_size, num_workers=cfg.num_workers,
+        patterns_max_bytes=cfg.patterns_max_bytes, fsync_mode=cfg.fsync_mode,
+        als_breaker=(CircuitBreaker(failure_threshold=cfg.als_circuit_threshold)
+                     if cfg.als_circuit_threshold > 0 else None))
     
     # Process all files
     await _process_files(
-        file_paths, file_processor, run_start_time, ui,
-        pattern_formatter, no_als, log_path, stderr_path,
-        pattern_log_path, using_default_log, using_default_stderr,
-        using_default_patterns, client)
+        file_paths, file_processor, run_start, ui,
+        pattern_formatter, cfg.no_als, cfg.log_path, cfg.stderr_path,
+        pattern_log_path, cfg.using_default_log, cfg.using_default_stderr,
+        cfg.using_default_patterns, client, cfg.concurrency)
     
     # Shutdown worker pool if used
     await file_processor.shutdown_worker_pool()
+    await file_processor.flush_writes()
+    
+    if cfg.patterns_cache_path and pattern_formatter and pattern_formatter.enabled:
+        pattern_formatter.save_clean_cache(cfg.patterns_cache_path)
     
     # Finalize and generate reports
     exit_code = await finalize_and_report(
         file_processor=file_processor, file_paths=file_paths,
-        run_start_time=run_start_time, als_ready_timeout=als_ready_timeout,
-        log_path=log_path, stderr_path=stderr_path,
-        pattern_log_path=pattern_log_path, using_default_log=using_default_log,
-        using_default_stderr=using_default_stderr, using_default_patterns=using_default_patterns,
+        run_start_time=run_start_time, run_start=run_start,
+        als_ready_timeout=cfg.als_ready_timeout,
+        log_path=cfg.log_path, stderr_path=cfg.stderr_path,
+        pattern_log_path=pattern_log_path, using_default_log=cfg.using_default_log,
+        using_default_stderr=cfg.using_default_stderr, using_default_patterns=cfg.using_default_patterns,
         pattern_logger=pattern_logger, client=client,
         pattern_formatter=pattern_formatter, ui=ui,
-        no_als=no_als, check=check,
-        post_hook=post_hook, hook_timeout=hook_timeout,
+        no_als=cfg.no_als, check=cfg.check,
+        post_hook=cfg.post_hook, hook_timeout=cfg.hook_timeout,
         debug_pattern_log_path=debug_pattern_log_path,
         debug_als_log_path=debug_als_log_path,
-        using_default_debug_patterns=using_default_debug_patterns,
-        using_default_debug_als=using_default_debug_als
+        using_default_debug_patterns=cfg.using_default_debug_patterns,
+        using_default_debug_als=cfg.using_default_debug_als
     )
     
     # Record run summary metrics
-    total_duration = time.time() - metrics_start_time
+    total_duration = time.monotonic() - metrics_start_time
     metrics.record_run_summary(
-        total_files=len(file_paths),
-        als_succeeded=file_processor.als_changed + (len(file_paths) - file_processor.als_changed - file_processor.als_failed),
+        total_files=total_files,
+        als_succeeded=file_processor.als_changed + (total_files - file_processor.als_changed - file_processor.als_failed),
         als_failed=file_processor.als_failed,
         patterns_changed=file_processor.pattern_files_changed,
         total_duration=total_duration)
     
-    # Close logger to ensure all data is written
-    if logger:
-        logger.close()
+    # Close loggers to ensure all data is written
+    for run_logger in (logger, pattern_logger, debug_pattern_logger, debug_als_logger):
+        if run_logger:
+            run_logger.close()
     _restore_stderr()
     return exit_code
 
@@ -426,7 +568,14 @@ def license_command() -> None:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
-@app.command(name="format")
+
+def _exit_with_errors(errors: Sequence[str]) -> NoReturn:
+    """Print all usage errors to stderr in one write and exit with status 2."""
+    typer.echo("\n".join(f"Error: {error}" for error in errors), err=True)
+    raise typer.Exit(2)
+
+
+@_format_app.command(name="format")
 def format_command(
     project_path: Annotated[Path, typer.Option("--project-path", help="Path to your GNAT project file (.gpr)")],
     als_stale_minutes: Annotated[int, typer.Option("--als-stale-minutes", help="Age threshold in minutes for considering ALS processes stale")] = 30,
@@ -448,6 +597,7 @@ def format_command(
     no_patterns: Annotated[bool, typer.Option("--no-patterns", help="Disable pattern processing")] = False,
     patterns_timeout_ms: Annotated[int, typer.Option("--patterns-timeout-ms", help="Timeout per pattern in milliseconds")] = 100,
     patterns_max_bytes: Annotated[int, typer.Option("--patterns-max-bytes", help="Skip patterns for files larger than this (bytes)")] = 10485760,
+    patterns_cache: Annotated[Optional[Path], typer.Option("--patterns-cache", envvar="ADAFMT_PATTERNS_CACHE", help="SQLite file remembering sources the patterns left unchanged, so later runs skip them")] = None,
     validate_patterns: Annotated[bool, typer.Option("--validate-patterns", help="Validate that applied patterns are acceptable to ALS")] = False,
     debug_patterns: Annotated[bool, typer.Option("--debug-patterns", help="Enable pattern debugging (uses default path if --debug-patterns-path not set)")] = False,
     debug_patterns_path: Annotated[Optional[Path], typer.Option("--debug-patterns-path", help="Write pattern debug output to this path")] = None,
@@ -456,9 +606,13 @@ def format_command(
     metrics_path: Annotated[Optional[Path], typer.Option("--metrics-path", help="Path to cumulative metrics file (default: ~/.adafmt/metrics.jsonl)")] = None,
     no_als: Annotated[bool, typer.Option("--no-als", help="Disable ALS formatting (patterns only)")] = False,
     max_consecutive_timeouts: Annotated[int, typer.Option("--max-consecutive-timeouts", help="Abort after this many timeouts in a row (0 = no limit)")] = 5,
+    als_circuit_threshold: Annotated[int, typer.Option("--als-circuit-threshold", help="Pause ALS requests for 10s after this many ALS failures in a row (0 = off)")] = 0,
     max_file_size: Annotated[int, typer.Option("--max-file-size", help="Skip files larger than this size in bytes (default: 102400 = 100KB)")] = 102400,
     num_workers: Annotated[Optional[int], typer.Option("--num-workers", help="Number of parallel workers for post-ALS processing (default: 1)")] = None,
+    concurrency: Annotated[int, typer.Option("--concurrency", envvar="ADAFMT_CONCURRENCY", help="Number of files formatted at the same time")] = DEFAULT_CONCURRENCY,
     write: Annotated[bool, typer.Option("--write", help="Apply changes to files")] = False,
+    fsync: Annotated[FsyncMode, typer.Option("--fsync", help="Flush written files to disk: off, batched (once at the end) or per-file")] = FsyncMode.off,
+    stream_discovery: Annotated[bool, typer.Option("--stream-discovery/--no-stream-discovery", help="Overlap file discovery with ALS startup, or finish discovery first", rich_help_panel="Discovery")] = True,
     files: Annotated[Optional[List[str]], typer.Argument(help="Specific Ada files to format")] = None,
 ) -> None:
     """Format Ada source code using the Ada Language Server (ALS)."""
@@ -467,33 +621,66 @@ def format_command(
         typer.echo("Error: No files or directories to process. You must provide --include-path or specific files.", err=True)
         typer.echo("Use 'adafmt format --help' for usage information.", err=True)
         raise typer.Exit(2)
-    
-    # Convert paths to absolute
-    project_path = ArgumentValidator.ensure_absolute_path(project_path, "project path")
-    include_paths = [ArgumentValidator.ensure_absolute_path(Path(p), f"include path {i+1}") 
-                     for i, p in enumerate(include_path)] if include_path else []
-    exclude_paths = [ArgumentValidator.ensure_absolute_path(Path(p), f"exclude path {i+1}") 
-                     for i, p in enumerate(exclude_path)] if exclude_path else []
+
+    # Reject cheap-to-detect misuse before any path resolution or async startup
+    early_errors = []
+    # Split hook commands once here; the runner executes the argument vectors
+    hook_argvs = {}
+    for name, value in (("--pre-hook", pre_hook), ("--post-hook", post_hook)):
+        try:
+            hook_argvs[name] = parse_hook_command(value)
+        except ValueError as e:
+            early_errors.append(f"{name} has invalid command format: {e}")
+    if not project_path.expanduser().exists():
+        early_errors.append(f"Project path does not exist: {project_path}")
+    for name, value in (("--init-timeout", init_timeout), ("--als-ready-timeout", als_ready_timeout),
+                        ("--format-timeout", format_timeout), ("--hook-timeout", hook_timeout),
+                        ("--concurrency", concurrency)):
+        if value <= 0:
+            early_errors.append(f"{name} must be positive, got: {value}")
+    for name, value in (("--max-attempts", max_attempts),
+                        ("--max-consecutive-timeouts", max_consecutive_timeouts),
+                        ("--als-circuit-threshold", als_circuit_threshold)):
+        if value < 0:
+            early_errors.append(f"{name} must be non-negative, got: {value}")
+    if early_errors:
+        _exit_with_errors(early_errors)
+
+    # Convert paths to absolute (the working directory is looked up once)
+    cwd = os.getcwd()
+    project_path = ArgumentValidator.ensure_absolute_path(project_path, "project path", cwd)
+    include_paths = ArgumentValidator.ensure_absolute_paths(include_path, "include path", cwd)
+    exclude_paths = ArgumentValidator.ensure_absolute_paths(exclude_path, "exclude path", cwd)
+    # Overlapping paths would only repeat discovery work and exclude checks
+    exclude_paths = collapse_nested_paths(exclude_paths)
+    include_paths = collapse_nested_paths(include_paths, keep_under=exclude_paths)
     if patterns_path:
-        patterns_path = ArgumentValidator.ensure_absolute_path(patterns_path, "patterns path")
+        patterns_path = ArgumentValidator.ensure_absolute_path(patterns_path, "patterns path", cwd)
     if log_path:
-        log_path = ArgumentValidator.ensure_absolute_path(log_path, "log path")
+        log_path = ArgumentValidator.ensure_absolute_path(log_path, "log path", cwd)
     if stderr_path:
-        stderr_path = ArgumentValidator.ensure_absolute_path(stderr_path, "stderr path")
+        stderr_path = ArgumentValidator.ensure_absolute_path(stderr_path, "stderr path", cwd)
+    if patterns_cache:
+        patterns_cache = ArgumentValidator.ensure_absolute_path(
+            patterns_cache.expanduser(), "patterns cache", cwd)
     
     # Process debug flags early for validation
-    # Generate timestamp for default paths
-    from datetime import datetime, timezone
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    # Generate a unique run id (timestamp + pid + sequence) if any default path needs one
+    needs_run_id = (log_path is None or stderr_path is None
+                    or (debug_patterns and not debug_patterns_path)
+                    or (debug_als and not debug_als_path))
+    timestamp = new_run_id() if needs_run_id else None
+    
+    # Usage errors are collected so every problem is reported in one run
+    usage_errors: List[str] = []
     
     # Handle debug patterns
     processed_debug_patterns_path = None
     using_default_debug_patterns = False
     if debug_patterns:
         if debug_patterns_path:
-            # Custom path provided - expand ~ and ensure parent exists
+            # Custom path provided - expand ~ (parent is created after validation)
             processed_debug_patterns_path = debug_patterns_path.expanduser()
-            processed_debug_patterns_path.parent.mkdir(parents=True, exist_ok=True)
             using_default_debug_patterns = False
         else:
             # Use default path in current directory
@@ -501,17 +688,15 @@ def format_command(
             using_default_debug_patterns = True
     elif debug_patterns_path:
         # Error: path provided without enabling debug
-        typer.echo("Error: --debug-patterns-path requires --debug-patterns", err=True)
-        raise typer.Exit(2)
+        usage_errors.append("--debug-patterns-path requires --debug-patterns")
     
     # Handle debug ALS
     processed_debug_als_path = None
     using_default_debug_als = False
     if debug_als:
         if debug_als_path:
-            # Custom path provided - expand ~ and ensure parent exists
+            # Custom path provided - expand ~ (parent is created after validation)
             processed_debug_als_path = debug_als_path.expanduser()
-            processed_debug_als_path.parent.mkdir(parents=True, exist_ok=True)
             using_default_debug_als = False
         else:
             # Use default path in current directory
@@ -519,57 +704,67 @@ def format_command(
             using_default_debug_als = True
     elif debug_als_path:
         # Error: path provided without enabling debug
-        typer.echo("Error: --debug-als-path requires --debug-als", err=True)
-        raise typer.Exit(2)
+        usage_errors.append("--debug-als-path requires --debug-als")
     
     # Validate paths
-    path_valid, path_errors = ArgumentValidator.validate_paths(
+    _, path_errors = ArgumentValidator.validate_paths(
         project_path=project_path, include_paths=include_paths,
         exclude_paths=exclude_paths, patterns_path=patterns_path,
         files=files, log_path=log_path, stderr_path=stderr_path,
         metrics_path=metrics_path, no_patterns=no_patterns,
         debug_patterns_path=debug_patterns_path, debug_als_path=debug_als_path)
-    
-    if not path_valid:
-        for error in path_errors:
-            typer.echo(f"Error: {error}", err=True)
-        raise typer.Exit(2)
+    usage_errors.extend(path_errors)
     
     # Validate options
-    options_valid, option_errors = ArgumentValidator.validate_options(
+    _, option_errors = ArgumentValidator.validate_options(
         no_patterns=no_patterns, no_als=no_als,
         validate_patterns=validate_patterns, write=write,
         diff=diff, check=check,
         debug_patterns_path=processed_debug_patterns_path, debug_als_path=processed_debug_als_path)
+    usage_errors.extend(option_errors)
     
-    if not options_valid:
-        for error in option_errors:
-            typer.echo(f"Error: {error}", err=True)
-        raise typer.Exit(2)
+    if usage_errors:
+        _exit_with_errors(usage_errors)
+    
+    # Ensure parent directories of custom debug logs exist
+    for debug_path, custom in ((processed_debug_patterns_path, not using_default_debug_patterns),
+                               (processed_debug_als_path, not using_default_debug_als)):
+        if debug_path is not None and custom:
+            debug_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Get default paths if not provided
     log_path, stderr_path, using_default_log, using_default_stderr = get_default_paths(
-        log_path, stderr_path)
+        log_path, stderr_path, run_id=timestamp)
     
     # Debug paths have already been processed above, using_default_debug_patterns and using_default_debug_als are set
     
-    # Run the async formatter
-    exit_code = asyncio.run(run_formatter(
-        project_path=project_path, include_paths=include_paths,
-        exclude_paths=exclude_paths, write=write, diff=diff, check=check,
+    # Bundle the validated options for the async formatter
+    cfg = FormatConfig(
+        project_path=project_path, include_paths=tuple(include_paths),
+        exclude_paths=tuple(exclude_paths), files=tuple(files or ()),
+        write=write, diff=diff, check=check,
         preflight_mode=preflight.value, als_stale_minutes=als_stale_minutes,
-        pre_hook=pre_hook, post_hook=post_hook, init_timeout=init_timeout,
-        als_ready_timeout=als_ready_timeout, format_timeout=format_timeout,
-        max_attempts=max_attempts, log_path=log_path, stderr_path=stderr_path,
-        files=files or [], max_consecutive_timeouts=max_consecutive_timeouts,
+        pre_hook=hook_argvs["--pre-hook"], post_hook=hook_argvs["--post-hook"],
+        hook_timeout=hook_timeout,
+        init_timeout=init_timeout, als_ready_timeout=als_ready_timeout,
+        format_timeout=format_timeout, max_attempts=max_attempts,
+        max_consecutive_timeouts=max_consecutive_timeouts,
+        als_circuit_threshold=als_circuit_threshold,
+        log_path=log_path, stderr_path=stderr_path,
         patterns_path=patterns_path, no_patterns=no_patterns,
         patterns_timeout_ms=patterns_timeout_ms, patterns_max_bytes=patterns_max_bytes,
-        hook_timeout=hook_timeout, validate_patterns=validate_patterns,
-        debug_patterns_path=processed_debug_patterns_path, debug_als_path=processed_debug_als_path, metrics_path=metrics_path, no_als=no_als,
-        max_file_size=max_file_size, num_workers=num_workers,
+        validate_patterns=validate_patterns, patterns_cache_path=patterns_cache,
+        debug_patterns_path=processed_debug_patterns_path, debug_als_path=processed_debug_als_path,
+        metrics_path=metrics_path, no_als=no_als,
+        max_file_size=max_file_size, num_workers=num_workers, concurrency=concurrency,
+        fsync_mode=fsync.value,
+        stream_discovery=stream_discovery,
         using_default_log=using_default_log, using_default_stderr=using_default_stderr,
         using_default_patterns=True, using_default_debug_patterns=using_default_debug_patterns,
-        using_default_debug_als=using_default_debug_als))
+        using_default_debug_als=using_default_debug_als)
+    
+    # Run the async formatter
+    exit_code = _run_event_loop(run_formatter(cfg))
     
     raise typer.Exit(exit_code)
 
@@ -580,7 +775,6 @@ def main() -> None:
         app()
     except Exception as e:
         print(f"[FATAL ERROR] {type(e).__name__}: {e}", file=sys.stderr)
-        import traceback
         traceback.print_exc()
         # Ensure cleanup runs even on exceptions
         cleanup_handler()
@@ -7,10 +7,10 @@
 
 """Helper functions for the CLI module."""
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
-import typer
-
 # Python 3.9+: importlib.resources.files
 try:
     from importlib.resources import files as pkg_files
@@ -25,37 +25,37 @@ except Exception:
     # Fallback for development/editable installs
     APP_VERSION = "0.0.0"
 
+_BANNER = "=" * 80 + "\n"
+APP_HEADER = f"{_BANNER}Ada Formatter  {APP_VERSION}\n{_BANNER}"
+"""Header printed before every command's output."""
+
 
+@lru_cache(maxsize=1)
 def read_license_text() -> str:
-    """Read the LICENSE file from package data or filesystem."""
-    # 1) Prefer a bundled copy inside the package: adafmt/LICENSE
+    """Read the LICENSE file bundled with the package."""
+    # 1) Prefer the package data copy: adafmt/LICENSE
     if pkg_files:
         try:
             return pkg_files("adafmt").joinpath("LICENSE").read_text(encoding="utf-8")
         except Exception:
             pass
 
-    # 2) Fallbacks for dev runs from a source checkout
-    here = Path(__file__).resolve()
-    for candidate in (
-        here.parent / "LICENSE",
-        here.parent.parent / "LICENSE",
-        here.parent.parent.parent / "LICENSE",  # src/adafmt -> src -> repo root
-        Path.cwd() / "LICENSE",
-    ):
-        if candidate.exists():
-            return candidate.read_text(encoding="utf-8")
-
-    raise FileNotFoundError("LICENSE not found. Bundle it as package data or run from repo root.")
+    # 2) Fallback for source checkouts where package data is unavailable
+    try:
+        return Path(__file__).with_name("LICENSE").read_text(encoding="utf-8")
+    except OSError:
+        raise FileNotFoundError("LICENSE not found. Bundle it as package data.") from None
 
 
 def version_callback(value: bool):
     """Show version and exit."""
+    import typer
+    
     if value:
         typer.echo(f"adafmt version {APP_VERSION}")
         raise typer.Exit()
 
 
 def abs_path(p: str) -> str:
-    """Convert a path string to an absolute path."""
-    return str(Path(p).expanduser().resolve())
\ No newline at end of file
+    """Convert a path string to an absolute path without following symlinks."""
+    return os.path.abspath(os.path.expanduser(p))
\ No newline at end of file
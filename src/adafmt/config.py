@@ -0,0 +1,103 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Run configuration for the Ada formatter.
+
+The CLI validates and normalizes its options once, then hands the
+formatter a single immutable :class:`FormatConfig` instead of a long
+keyword argument list.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .utils import parse_hook_command
+
+
+DEFAULT_CONCURRENCY = 1
+"""Default number of files processed at the same time (opt in to overlap with --concurrency)."""
+
+
+@dataclass(slots=True, frozen=True)
+class FormatConfig:
+    """Immutable options for one formatter run.
+
+    Path collections are stored as tuples; lists passed in are converted
+    on construction so downstream code never needs a defensive copy.
+    Hooks are stored as argument vectors, split once from command strings.
+    """
+
+    # Inputs
+    project_path: Path
+    include_paths: Tuple[Path, ...]
+    exclude_paths: Tuple[Path, ...]
+    files: Tuple[str, ...]
+
+    # Mode
+    write: bool
+    diff: bool
+    check: bool
+
+    # Environment preparation and hooks
+    preflight_mode: str
+    als_stale_minutes: int
+    pre_hook: Optional[Tuple[str, ...]]
+    post_hook: Optional[Tuple[str, ...]]
+    hook_timeout: float
+
+    # ALS timeouts and limits
+    init_timeout: int
+    als_ready_timeout: int
+    format_timeout: int
+    max_attempts: int
+    max_consecutive_timeouts: int
+
+    # Logs
+    log_path: Optional[Path]
+    stderr_path: Optional[Path]
+
+    # Patterns
+    patterns_path: Optional[Path]
+    no_patterns: bool
+    patterns_timeout_ms: int
+    patterns_max_bytes: int
+    validate_patterns: bool = False
+    patterns_cache_path: Optional[Path] = None
+
+    # Optional outputs and processing settings
+    debug_patterns_path: Optional[Path] = None
+    debug_als_path: Optional[Path] = None
+    metrics_path: Optional[Path] = None
+    no_als: bool = False
+    max_file_size: int = 102400
+    num_workers: Optional[int] = None
+    concurrency: int = DEFAULT_CONCURRENCY
+    als_circuit_threshold: int = 0
+    fsync_mode: str = "off"
+    stream_discovery: bool = True
+
+    # Whether paths above are defaults (affects how they are reported)
+    using_default_log: bool = False
+    using_default_stderr: bool = False
+    using_default_patterns: bool = False
+    using_default_debug_patterns: bool = False
+    using_default_debug_als: bool = False
+
+    def __post_init__(self) -> None:
+        """Freeze path collections into tuples and split hook commands."""
+        for name in ("include_paths", "exclude_paths", "files"):
+            value = getattr(self, name)
+            if not isinstance(value, tuple):
+                object.__setattr__(self, name, tuple(value or ()))
+        for name in ("pre_hook", "post_hook"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, tuple):
+                argv = parse_hook_command(value) if isinstance(value, str) else list(value)
+                object.__setattr__(self, name, tuple(argv) if argv else None)
@@ -8,14 +8,16 @@
 """Default path handling for the Ada formatter."""
 
 import os
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Tuple
 
+from .utils import new_run_id
+
 
 def get_default_paths(
     log_path: Optional[Path],
-    stderr_path: Optional[Path]
+    stderr_path: Optional[Path],
+    run_id: Optional[str] = None
 ) -> Tuple[Path, Path, bool, bool]:
     """
     Generate default paths for log and stderr files if not provided.
@@ -23,12 +25,15 @@ def get_default_paths(
     Args:
         log_path: User-provided log path or None
         stderr_path: User-provided stderr path or None
+        run_id: Identifier for default filenames (generated if None)
         
     Returns:
         Tuple of (log_path, stderr_path, using_default_log, using_default_stderr)
     """
-    # Generate timestamp for default filenames (ISO 8601 format)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    # Unique run id for default filenames (ISO 8601 timestamp + pid + sequence),
+    # so concurrent invocations never share or truncate each other's logs.
+    # Only generated if a default name is actually needed.
+    timestamp = run_id
     
     # Track if using default paths
     using_default_log = False
@@ -36,15 +41,17 @@ def get_default_paths(
     
     # Set default log path if not provided (check env var first)
     if log_path is None:
-        env_log_path = os.getenv("ADAFMT_LOG_FILE_PATH")
+        env_log_path = os.environ.get("ADAFMT_LOG_FILE_PATH")
         if env_log_path:
             log_path = Path(env_log_path)
         else:
+            timestamp = timestamp or new_run_id()
             log_path = Path(f"./adafmt_{timestamp}_log.jsonl")
             using_default_log = True
     
     # Set default stderr path if not provided  
     if stderr_path is None:
+        timestamp = timestamp or new_run_id()
         stderr_path = Path(f"./adafmt_{timestamp}_stderr.log")
         using_default_stderr = True
         
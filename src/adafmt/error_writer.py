@@ -7,13 +7,43 @@
 
 """Error writing utilities for the Ada formatter."""
 
+import asyncio
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
+from .stderr_handler import stderr_redirected
 from .utils import to_iso8601_basic
 
+STDERR_FLUSH_INTERVAL = 0.1
+"""Seconds error records may wait in the stderr buffer inside an event loop."""
+
+# (epoch second, formatted line prefix) of the most recent error record
+_prefix_cache: Tuple[int, str] = (-1, "")
+
+# Pending delayed flush of sys.stderr and the loop it was scheduled on
+_flush_handle: Optional[asyncio.TimerHandle] = None
+_flush_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _error_prefix() -> str:
+    """Return the timestamped line prefix, reformatted at most once per second."""
+    global _prefix_cache
+    second = int(time.time())
+    if _prefix_cache[0] != second:
+        stamp = to_iso8601_basic(datetime.fromtimestamp(second, timezone.utc))
+        _prefix_cache = (second, f"{stamp} | ERROR | ")
+    return _prefix_cache[1]
+
+
+def _flush_stderr() -> None:
+    """Flush sys.stderr on behalf of a scheduled flush."""
+    global _flush_handle
+    _flush_handle = None
+    sys.stderr.flush()
+
 
 def write_stderr_error(path: Path, error_type: str, error_msg: str, details: Optional[dict] = None) -> None:
     """Write detailed error information to stderr with timestamp.
@@ -24,17 +54,24 @@ def write_stderr_error(path: Path, error_type: str, error_msg: str, details: Opt
         error_msg: The error message
         details: Optional additional details as a dictionary
     """
+    global _flush_handle, _flush_loop
     # Only write to stderr if it has been properly redirected to a file
     # This prevents error details from appearing in the UI output
-    if hasattr(sys.stderr, '_streams') and sys.stderr._streams:
-        timestamp = to_iso8601_basic(datetime.now(timezone.utc))
-        stderr_msg = f"{timestamp} | ERROR | {error_type} | {path}\n"
-        stderr_msg += f"{timestamp} | ERROR | Message: {error_msg}\n"
-        
+    if stderr_redirected():
+        prefix = _error_prefix()
+        lines = [f"{error_type} | {path}", f"Message: {error_msg}"]
         if details:
-            for key, value in details.items():
-                stderr_msg += f"{timestamp} | ERROR | {key}: {value}\n"
+            lines.extend(f"{key}: {value}" for key, value in details.items())
+        lines.append('=' * 60)
         
-        stderr_msg += f"{timestamp} | ERROR | {'=' * 60}\n"
-        sys.stderr.write(stderr_msg)
-        sys.stderr.flush()
\ No newline at end of file
+        # One write per record; inside an event loop, records written within
+        # STDERR_FLUSH_INTERVAL share one flush
+        sys.stderr.write("".join(f"{prefix}{line}\n" for line in lines))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            sys.stderr.flush()
+            return
+        if _flush_handle is None or _flush_loop is not loop:
+            _flush_loop = loop
+            _flush_handle = loop.call_later(STDERR_FLUSH_INTERVAL, _flush_stderr)
\ No newline at end of file
@@ -12,7 +12,7 @@ based on include and exclude path patterns. It recursively searches directories
 and filters files by Ada extensions.
 
 Key features:
-    - Recursive directory traversal
+    - Recursive directory traversal using os.scandir
     - Support for both file and directory paths
     - Exclude path filtering (affects entire directory trees)
     - Case-insensitive extension matching
@@ -26,20 +26,151 @@ Supported Ada file extensions:
 
 from __future__ import annotations
 
+import os
+import stat
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Iterable, List, Set
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
 
-ADA_EXTS = {".ada", ".ads", ".adb"}
+ADA_EXTS = frozenset({".ada", ".ads", ".adb"})
 """Set of file extensions recognized as Ada source files."""
 
+ADA_SUFFIXES = tuple(sorted(ADA_EXTS))
+"""The same extensions as a tuple, for ``str.endswith`` checks."""
+
+def scan_ada_files(
+    include_paths: Iterable[Path],
+    exclude_paths: Iterable[Path],
+    exts: Collection[str] = ADA_EXTS,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[str]:
+    """Yield Ada source files from include paths as they are found.
+    
+    This is the incremental form of :func:`collect_files`. Directories are
+    walked iteratively with ``os.scandir``, whose entries carry cached type
+    information, so no per-entry ``stat`` or ``Path`` object is needed.
+    Excluded directories are pruned before they are entered.
+    
+    Args:
+        include_paths: Paths to search for Ada files. Can be files or directories.
+                      Directories are searched recursively.
+        exclude_paths: Paths to exclude from search. If a directory is excluded,
+                      all its subdirectories are also excluded.
+        exts: Lower-case file extensions to accept
+        stop: Event that ends the walk early; it is checked before each
+              include path and each directory is read
+    
+    Yields:
+        Absolute path strings in traversal order (unsorted). A file reachable
+        from several include paths may be yielded more than once.
+        
+    Note:
+        - Symlinked directories are not followed (same as ``Path.rglob``)
+        - Unreadable directories are skipped silently
+    """
+    # Resolve exclude paths once for efficient checking
+    excluded = tuple(str(ex.resolve()) for ex in exclude_paths if ex.exists())
+    excluded_prefixes = tuple(ex.rstrip(os.sep) + os.sep for ex in excluded)
+    
+    def should_skip(path: str) -> bool:
+        """Check if a path is an excluded path or lies under one."""
+        return path in excluded or path.startswith(excluded_prefixes)
+    
+    def is_ada(name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in exts
+    
+    # Process each include path
+    for p in include_paths:
+        if stop is not None and stop.is_set():
+            return
+        p = p.resolve()
+        root = str(p)
+        
+        # One stat answers both the file and the directory question
+        try:
+            mode = os.stat(root).st_mode
+        except (OSError, ValueError):
+            continue
+        if stat.S_ISREG(mode):
+            # Direct file inclusion
+            if is_ada(p.name):
+                yield root
+            continue
+        if not stat.S_ISDIR(mode) or should_skip(root):
+            continue
+        
+        pending = deque([root])
+        while pending:
+            if stop is not None and stop.is_set():
+                return
+            directory = pending.popleft()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not should_skip(entry.path):
+                                    pending.append(entry.path)
+                            elif is_ada(entry.name) and entry.is_file() and not should_skip(entry.path):
+                                yield entry.path
+                        except OSError:
+                            continue
+            except OSError:
+                # Handle permission errors or other OS errors gracefully
+                # Just skip this directory if we can't access it
+                continue
+
+
+def collapse_nested_paths(paths: Iterable[Path], keep_under: Iterable[Path] = ()) -> List[Path]:
+    """Drop duplicate paths and paths nested under another listed path.
+    
+    Nesting is decided on resolved paths (``os.path.realpath``), the same
+    locations discovery walks, so a symlink under a listed directory is
+    only dropped when its target is really inside it. The walk does not
+    follow symlinked directories, so collapsing on the link name alone
+    would lose the files behind it.
+    
+    Resolved paths are sorted component-wise, which places every ancestor
+    before its descendants, so a single pass comparing each path against
+    the last kept covering path is enough. Paths kept only because of
+    ``keep_under`` never become the covering path, so siblings that follow
+    them are still checked against their real ancestor.
+    
+    Args:
+        paths: Absolute paths to collapse
+        keep_under: Paths whose descendants must be kept even when nested.
+                   Used for include paths that sit inside an excluded tree,
+                   where the outer include would no longer cover them.
+    
+    Returns:
+        The top-most paths as given, ordered by their resolved location
+    """
+    keep_parts = [Path(os.path.realpath(k)).parts for k in keep_under]
+    resolved: Dict[Tuple[str, ...], Path] = {}
+    for p in paths:
+        resolved.setdefault(Path(os.path.realpath(p)).parts, p)
+    kept: List[Path] = []
+    cover: Tuple[str, ...] = ()
+    for parts in sorted(resolved):
+        if any(parts[:len(k)] == k for k in keep_parts):
+            kept.append(resolved[parts])
+            continue
+        if cover and parts[:len(cover)] == cover:
+            continue
+        kept.append(resolved[parts])
+        cover = parts
+    return kept
+
+
 def collect_files(include_paths: Iterable[Path], exclude_paths: Iterable[Path]) -> List[Path]:
     """Collect all Ada source files from include paths, filtering by exclude paths.
     
     This function implements an optimized algorithm that avoids redundant scanning:
-    1. Resolve all exclude paths to a set for fast lookup
+    1. Resolve all exclude paths once for fast prefix checks
     2. For each include path:
        - If it's a file with Ada extension, add it
-       - If it's a directory, walk it recursively, skipping excluded paths
+       - If it's a directory, walk it with os.scandir, pruning excluded paths
     3. Sort results for deterministic output
     
     Args:
@@ -64,45 +195,5 @@ def collect_files(include_paths: Iterable[Path], exclude_paths: Iterable[Path])
         ... )
         >>> # Returns all .ads/.adb files in src/ and tests/, except src/generated/
     """
-    files: Set[Path] = set()
-    
-    # Resolve exclude paths once for efficient checking
-    excluded_dirs: Set[Path] = set()
-    for ex in exclude_paths:
-        ex = ex.resolve()
-        if ex.exists():
-            excluded_dirs.add(ex)
-    
-    def should_skip(path: Path) -> bool:
-        """Check if a path should be skipped based on exclude list."""
-        for excluded in excluded_dirs:
-            try:
-                # Check if path is relative to (under) the excluded directory
-                path.relative_to(excluded)
-                return True
-            except ValueError:
-                # Not relative to this excluded path
-                continue
-        return False
-    
-    # Process each include path
-    for p in include_paths:
-        p = p.resolve()
-        
-        if p.is_file() and p.suffix.lower() in ADA_EXTS:
-            # Direct file inclusion
-            files.add(p)
-        elif p.is_dir() and not should_skip(p):
-            # Directory traversal with exclusion checking
-            # Use rglob to recursively find all files
-            try:
-                for f in p.rglob("*"):
-                    if f.is_file() and f.suffix.lower() in ADA_EXTS and not should_skip(f):
-                        files.add(f)
-            except (OSError, PermissionError):
-                # Handle permission errors or other OS errors gracefully
-                # Just skip this directory if we can't access it
-                pass
-    
     # Sort for deterministic output
-    return sorted(files)
+    return sorted({Path(f) for f in scan_ada_files(include_paths, exclude_paths)})
@@ -7,16 +7,44 @@
 
 """File discovery and resolution logic for the Ada formatter."""
 
+import asyncio
+import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Any
+from typing import Iterable, List, Optional, Any, Union
 
-from .file_discovery import collect_files
+from .file_discovery import ADA_SUFFIXES, collect_files, scan_ada_files
 from .path_validator import validate_path
 
+DISCOVERY_BATCH_SIZE = 64
+"""Number of discovered paths pushed to the discovery queue per batch."""
 
-def is_ada_file(path: Path) -> bool:
+
+def is_ada_file(path: Union[str, Path]) -> bool:
     """Check if a path points to an Ada source file."""
-    return path.suffix.lower() in (".ads", ".adb", ".ada")
+    return os.fspath(path).lower().endswith(ADA_SUFFIXES)
+
+
+def _accept_paths(candidates: Iterable[Any], ui: Optional[Any] = None,
+                  check_suffix: bool = True) -> List[Path]:
+    """Filter candidates to valid absolute Ada file paths, warning on rejects.
+    
+    ``check_suffix`` may be disabled for candidates that came from discovery,
+    which only yields Ada files.
+    """
+    accepted: List[Path] = []
+    log = ui.log_line if ui else print
+    for p in candidates:
+        # Check the suffix on the string so rejects never build a Path
+        if not check_suffix or is_ada_file(p):
+            abs_path = Path(p).resolve()
+            # Validate path after resolving to absolute
+            validation_error = validate_path(str(abs_path))
+            if validation_error:
+                log(f"[warning] Skipping invalid file path '{p}' (resolved to '{abs_path}') - {validation_error}")
+                continue
+            accepted.append(abs_path)
+    return accepted
 
 
 def discover_files(
@@ -27,60 +55,115 @@ def discover_files(
 ) -> List[Path]:
     """
     Discover and validate Ada files to process.
-    
+
     Args:
         files: Specific files to process (if provided, discovery is skipped)
         include_paths: Directories to search for Ada files
         exclude_paths: Directories to exclude from search
         ui: UI instance for logging (optional)
-        
+
     Returns:
         List of validated absolute paths to Ada files
     """
-    file_paths: List[Path] = []
-    
     if files:
         # User specified specific files
         # Convert to absolute paths and filter Ada files
-        for p in files:
-            path = Path(p)
-            if is_ada_file(path):
-                abs_path = path.resolve()
-                # Validate path after resolving to absolute
-                validation_error = validate_path(str(abs_path))
-                if validation_error:
-                    if ui:
-                        ui.log_line(f"[warning] Skipping invalid file path '{p}' (resolved to '{abs_path}') - {validation_error}")
-                    else:
-                        print(f"[warning] Skipping invalid file path '{p}' (resolved to '{abs_path}') - {validation_error}")
-                    continue
-                file_paths.append(abs_path)
-    else:
-        # Discover files in include paths
-        if ui:
-            ui.log_line("[discovery] Starting file discovery...")
-        else:
-            print("[discovery] Starting file discovery...")
-        
-        # Collect files and convert to absolute paths
-        collected_files = collect_files(include_paths or [], exclude_paths or [])
-        for p in collected_files:
-            path = Path(p)
-            if is_ada_file(path):
-                abs_path = path.resolve()
-                # Validate path after resolving to absolute
-                validation_error = validate_path(str(abs_path))
-                if validation_error:
-                    if ui:
-                        ui.log_line(f"[warning] Skipping invalid file path '{p}' (resolved to '{abs_path}') - {validation_error}")
-                    else:
-                        print(f"[warning] Skipping invalid file path '{p}' (resolved to '{abs_path}') - {validation_error}")
-                    continue
-                file_paths.append(abs_path)
-        
-        if ui:
-            ui.log_line("[discovery] File discovery completed")
-        else:
-            print("[discovery] File discovery completed")
-            
-    return file_paths
\ No newline at end of file
+        return _accept_paths(files, ui)
+
+    # Discover files in include paths
+    log = ui.log_line if ui else print
+    log("[discovery] Starting file discovery...")
+
+    # Collect files and convert to absolute paths
+    file_paths = _accept_paths(collect_files(include_paths or [], exclude_paths or []), ui,
+                               check_suffix=False)
+
+    log("[discovery] File discovery completed")
+
+    return file_paths
+
+
+async def stream_discovered_files(
+    include_paths: Optional[List[Path]],
+    exclude_paths: Optional[List[Path]],
+    queue: asyncio.Queue,
+    batch: int = DISCOVERY_BATCH_SIZE,
+    stop: Optional[threading.Event] = None
+) -> None:
+    """
+    Walk include paths in a worker thread and stream results into a queue.
+
+    Discovered paths are pushed as lists of up to ``batch`` entries while the
+    walk is still running, so the event loop stays free for other startup work
+    (such as ALS initialization). A ``None`` sentinel is always pushed last,
+    even if the walk fails.
+
+    Cancelling the task sets ``stop``, and the task only finishes once the
+    worker thread has noticed it and returned, so no walk outlives it.
+
+    Args:
+        include_paths: Directories to search for Ada files
+        exclude_paths: Directories to exclude from search
+        queue: Queue receiving batches of paths followed by ``None``
+        batch: Maximum number of paths per queued batch
+        stop: Event that ends the walk early (one is created if None)
+    """
+    loop = asyncio.get_running_loop()
+    stop = stop or threading.Event()
+
+    def walk() -> None:
+        chunk: List[str] = []
+        for path in scan_ada_files(include_paths or [], exclude_paths or [], stop=stop):
+            if stop.is_set():
+                return
+            chunk.append(path)
+            if len(chunk) >= batch:
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                chunk = []
+        if chunk:
+            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+    walker = asyncio.ensure_future(asyncio.to_thread(walk))
+    try:
+        await asyncio.shield(walker)
+    except asyncio.CancelledError:
+        stop.set()
+        await asyncio.gather(walker, return_exceptions=True)
+        raise
+    finally:
+        queue.put_nowait(None)
+
+
+async def consume_discovered_files(
+    queue: asyncio.Queue,
+    producer: "asyncio.Task[None]",
+    ui: Optional[Any] = None
+) -> List[Path]:
+    """
+    Drain batches produced by :func:`stream_discovered_files`.
+
+    Each batch is validated as soon as it arrives. The result is deduplicated
+    and sorted so it matches :func:`discover_files` output exactly.
+
+    Args:
+        queue: Queue fed by the discovery producer
+        producer: The producer task (awaited to surface walk errors)
+        ui: UI instance for logging (optional)
+
+    Returns:
+        Sorted list of validated absolute paths to Ada files
+    """
+    log = ui.log_line if ui else print
+    log("[discovery] Starting file discovery...")
+
+    found = set()
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            break
+        found.update(_accept_paths(chunk, ui, check_suffix=False))
+    await producer
+
+    log("[discovery] File discovery completed")
+
+    return sorted(found)
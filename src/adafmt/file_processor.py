@@ -8,17 +8,22 @@
 """File processing logic for the Ada formatter."""
 
 import asyncio
-import contextlib
+import os
 import time
 import traceback
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from .als_client import ALSClient
+from .als_client import ALSClient, ALSProtocolError
+from .circuit_breaker import CircuitBreaker
 from .edits import apply_text_edits, unified_diff
+from .error_writer import write_stderr_error
 from .logging_jsonl import JsonlLogger
 from .metrics import MetricsCollector
 from .pattern_formatter import PatternFormatter, FileApplyResult
+from .stderr_handler import stderr_redirected
 from .worker_pool import WorkerPool
 from .worker_context import WorkItem
 from .thread_safe_metrics import ThreadSafeMetrics
@@ -26,7 +31,82 @@ from .thread_safe_metrics import ThreadSafeMetrics
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .tui import UI
-from .utils import atomic_write
+from .utils import atomic_write, fsync_paths, read_source_text
+
+
+def _read_source_text(path: Path, max_size: Optional[int] = None) -> Optional[str]:
+    """Read an Ada source file, or return None if it exceeds ``max_size`` bytes."""
+    if max_size is not None and path.stat().st_size > max_size:
+        return None
+    return read_source_text(path)
+
+
+@dataclass(frozen=True)
+class FileTable:
+    """Per-file facts gathered once per run, stored as parallel tuples.
+    
+    Attributes:
+        paths: Files to process, in processing order
+        uris: Document URI for each path
+        sizes: Size in bytes for each path, or None if it could not be
+            stat'ed (process_file then checks the file itself)
+    """
+    paths: Tuple[Path, ...]
+    uris: Tuple[str, ...]
+    sizes: Tuple[Optional[int], ...]
+    
+    @classmethod
+    def from_paths(cls, paths: Sequence[Path]) -> "FileTable":
+        """Stat each path and build its URI (blocking; run in a thread)."""
+        sizes: List[Optional[int]] = []
+        for path in paths:
+            try:
+                sizes.append(os.stat(path).st_size)
+            except OSError:
+                sizes.append(None)
+        return cls(tuple(paths), tuple(path.as_uri() for path in paths), tuple(sizes))
+
+
+@dataclass
+class FileOutput:
+    """Console output and timeout outcome of one file, kept for later replay.
+    
+    Files processed concurrently record their output here instead of
+    printing it, so the caller can emit each file's diff and notices next
+    to its status line, in input order.
+    
+    Attributes:
+        messages: (write, text) pairs in the order they were produced
+        timed_out: True if ALS timed out, False if the ALS request
+            succeeded, None if the file does not affect the timeout count
+    """
+    messages: List[Tuple[Callable[[str], Any], str]] = field(default_factory=list)
+    timed_out: Optional[bool] = None
+    
+    def replay(self) -> None:
+        """Write the recorded messages."""
+        for write, text in self.messages:
+            write(text)
+
+
+def _fits_pattern_limit(text: str, limit: Optional[int], encoded_size: Optional[int] = None) -> bool:
+    """Return True if text is at most ``limit`` bytes when UTF-8 encoded.
+    
+    A known ``encoded_size`` (such as the on-disk size) is used directly.
+    Otherwise the character count bounds the encoded size (1 to 4 bytes
+    per character), and the text is only encoded when the bounds straddle
+    the limit.
+    """
+    if limit is None:
+        return True
+    if encoded_size is not None:
+        return encoded_size <= limit
+    chars = len(text)
+    if chars > limit:
+        return False
+    if 4 * chars <= limit:
+        return True
+    return len(text.encode("utf-8", "surrogatepass")) <= limit
 
 
 class FileProcessor:
@@ -47,7 +127,10 @@ class FileProcessor:
         format_timeout: int = 60,
         max_consecutive_timeouts: int = 5,
         max_file_size: int = 102400,  # 100KB default
-        num_workers: Optional[int] = None
+        num_workers: Optional[int] = None,
+        patterns_max_bytes: Optional[int] = None,
+        fsync_mode: str = "off",
+        als_breaker: Optional[CircuitBreaker] = None
     ):
         """Initialize the file processor.
         
@@ -65,12 +148,19 @@ class FileProcessor:
             max_consecutive_timeouts: Max consecutive timeouts before aborting
             max_file_size: Maximum file size in bytes to process (default 100KB)
             num_workers: Number of parallel workers (None = default)
+            patterns_max_bytes: Skip patterns for larger texts (None = no limit)
+            fsync_mode: "off", "per-file" (flush each write) or "batched"
+                (flush all writes together in flush_writes)
+            als_breaker: Circuit breaker pacing ALS requests after
+                repeated failures (None = disabled)
         """
         self.client = client
         self.pattern_formatter = pattern_formatter
         self.logger = logger
         self.pattern_logger = pattern_logger
         self.ui = ui
+        # Resolve the log sink once instead of branching on every message
+        self._log = ui.log_line if ui else print
         self.metrics = metrics
         self.no_als = no_als
         self.write = write
@@ -79,6 +169,15 @@ class FileProcessor:
         self.max_consecutive_timeouts = max_consecutive_timeouts
         self.max_file_size = max_file_size
         self.num_workers = num_workers
+        self.patterns_max_bytes = patterns_max_bytes
+        self.fsync_mode = fsync_mode
+        # Requests wait while this is open instead of hammering a failing ALS
+        self.als_breaker = als_breaker
+        # Files written but not yet flushed (batched fsync mode)
+        self._unflushed: List[Path] = []
+        
+        # Background reads started ahead of processing (see prefetch)
+        self._prefetched: Dict[Path, asyncio.Task] = {}
         
         # UI queue for worker completion messages
         self.ui_queue: Optional[asyncio.Queue] = None
@@ -130,10 +229,7 @@ class FileProcessor:
             ui_queue=self.ui_queue
         )
         
-        if self.ui:
-            self.ui.log_line(f"[parallel] Started {self.worker_pool.num_workers} workers for post-ALS processing")
-        else:
-            print(f"[parallel] Started {self.worker_pool.num_workers} workers for post-ALS processing")
+        self._log(f"[parallel] Started {self.worker_pool.num_workers} workers for post-ALS processing")
     
     async def shutdown_worker_pool(self) -> None:
         """Shutdown the worker pool and sync metrics."""
@@ -158,11 +254,73 @@ class FileProcessor:
             self.total_errors += snapshot['errors']
             
         
-    async def format_file_with_als(self, path: Path) -> List[Dict[str, Any]]:
+    def prefetch(self, path: Path) -> None:
+        """Start reading a file in a worker thread ahead of processing it.
+        
+        Lets disk reads for the next file overlap the ALS round trip of the
+        current one. The read is consumed by the file's own processing, or
+        discarded if process_file skips the file. Files above the size limit
+        are not read, since process_file will skip them.
+        
+        Args:
+            path: File that will be processed next
+        """
+        if path not in self._prefetched:
+            self._prefetched[path] = asyncio.create_task(
+                asyncio.to_thread(_read_source_text, path, self.max_file_size))
+    
+    def _discard_prefetch(self, path: Path) -> None:
+        """Drop a prefetched read for a file that will not be processed."""
+        task = self._prefetched.pop(path, None)
+        if task is not None:
+            task.cancel()
+            # Mark any read error as retrieved so it is not reported at exit
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    
+    def cancel_prefetches(self) -> None:
+        """Drop all prefetched reads that were not consumed (e.g. after an abort)."""
+        for path in list(self._prefetched):
+            self._discard_prefetch(path)
+    
+    async def _read_source(self, path: Path) -> str:
+        """Read a source file off the event loop, using a prefetched read if any.
+        
+        Raises:
+            FileNotFoundError, PermissionError, IOError: With the path in the message
+        """
+        task = self._prefetched.pop(path, None)
+        try:
+            content = await task if task is not None else None
+            if content is None:
+                content = await asyncio.to_thread(_read_source_text, path)
+            return content
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {path}")
+        except PermissionError:
+            raise PermissionError(f"Permission denied reading file: {path}")
+        except Exception as e:
+            raise IOError(f"Failed to read file {path}: {e}")
+    
+    async def _write_source(self, path: Path, content: str) -> None:
+        """Atomically write a source file off the event loop."""
+        await asyncio.to_thread(atomic_write, path, content, self.fsync_mode == "per-file")
+        if self.fsync_mode == "batched":
+            self._unflushed.append(path)
+    
+    async def flush_writes(self) -> None:
+        """Flush files written in batched fsync mode to stable storage."""
+        if self._unflushed:
+            paths, self._unflushed = self._unflushed, []
+            await asyncio.to_thread(fsync_paths, paths)
+    
+    async def format_file_with_als(self, path: Path, content: Optional[str] = None,
+                                   uri: Optional[str] = None) -> List[Dict[str, Any]]:
         """Format a single Ada file using ALS.
         
         Args:
             path: Path to the file to format
+            content: Current file text, if already read (read from disk otherwise)
+            uri: Document URI for path, if already known
             
         Returns:
             List of edits from ALS
@@ -174,17 +332,15 @@ class FileProcessor:
             return []
             
         # Get debug logger from ALS client if available
-        debug_logger = self.client.debug_logger if self.client and hasattr(self.client, 'debug_logger') else None
+        debug_logger = getattr(self.client, 'debug_logger', None)
         
         # Open the file in ALS
-        try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
-        except FileNotFoundError:
-            raise FileNotFoundError(f"File not found: {path}")
-        except PermissionError:
-            raise PermissionError(f"Permission denied reading file: {path}")
-        except Exception as e:
-            raise IOError(f"Failed to read file {path}: {e}")
+        if content is None:
+            content = await self._read_source(path)
+        
+        # One document URI is shared by didOpen, formatting and didClose
+        if uri is None:
+            uri = path.as_uri()
         
         # Log file start
         if debug_logger:
@@ -194,14 +350,7 @@ class FileProcessor:
                 'size': len(content),
                 'lines': content.count('\n') + 1
             })
-        await self.client._notify("textDocument/didOpen", {
-            "textDocument": {
-                "uri": path.as_uri(),
-                "languageId": "ada",
-                "version": 1,
-                "text": content
-            }
-        })
+        await self.client.notify_did_open(uri, content)
         
         # Request formatting
         try:
@@ -211,21 +360,12 @@ class FileProcessor:
                     'ev': 'als_format_request',
                     'path': str(path),
                     'method': 'textDocument/formatting',
-                    'uri': path.as_uri(),
+                    'uri': uri,
                     'tab_size': 3,
                     'insert_spaces': True
                 })
             
-            res = await self.client.request_with_timeout(
-                {
-                    "method": "textDocument/formatting",
-                    "params": {
-                        "textDocument": {"uri": path.as_uri()},
-                        "options": {"tabSize": 3, "insertSpaces": True}
-                    }
-                },
-                timeout=self.format_timeout
-            )
+            res = await self.client.request_formatting(uri, timeout=self.format_timeout)
             
             # Log formatting response
             if debug_logger:
@@ -264,21 +404,42 @@ class FileProcessor:
                 })
             raise
         finally:
-            # Always close the file
-            with contextlib.suppress(Exception):
-                await self.client._notify("textDocument/didClose", {"textDocument": {"uri": path.as_uri()}})
+            # Always close the file. Each document is formatted once per run,
+            # so keeping it open would only delay this notification and grow
+            # ALS memory; there is no later request that could reuse it.
+            try:
+                await self.client._notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+            except Exception:
+                pass
         
         # Validate response
         if res is not None and not isinstance(res, list):
             raise TypeError(f"ALS returned unexpected type for {path}: {type(res).__name__} instead of list")
         return res
     
+    def _use_patterns(self, path: Path, text: str, encoded_size: Optional[int] = None) -> bool:
+        """Return True if patterns are enabled and text is within the size limit."""
+        if not self.pattern_formatter or not self.pattern_formatter.enabled:
+            return False
+        if _fits_pattern_limit(text, self.patterns_max_bytes, encoded_size):
+            return True
+        if self.logger:
+            self.logger.write({
+                'ev': 'patterns_skipped_too_large',
+                'path': str(path),
+                'max_bytes': self.patterns_max_bytes
+            })
+        return False
+    
     async def process_file(
         self,
         path: Path,
         idx: int,
         total: int,
-        run_start_time: float
+        run_start_time: float,
+        size: Optional[int] = None,
+        uri: Optional[str] = None,
+        output: Optional[FileOutput] = None
     ) -> Tuple[str, Optional[str]]:
         """Process a single file.
         
@@ -287,6 +448,11 @@ class FileProcessor:
             idx: 1-based index of this file
             total: Total number of files
             run_start_time: Start time of the overall run
+            size: File size from a FileTable (the file is stat'ed if None)
+            uri: Document URI from a FileTable (derived from path if None)
+            output: Collects console output and the timeout outcome instead
+                of printing and counting them (the caller must then call
+                ``output.replay()`` and :meth:`record_timeout`)
             
         Returns:
             Tuple of (status, note) where status is one of:
@@ -294,11 +460,11 @@ class FileProcessor:
             - "failed": Processing failed
             - "ok": File unchanged
         """
-        file_start_time = time.time()
+        file_start_time = time.monotonic()
         
         # Check file size limit
         try:
-            file_size = path.stat().st_size
+            file_size = path.stat().st_size if size is None else size
             if file_size > self.max_file_size:
                 if self.logger:
                     self.logger.write({
@@ -307,10 +473,8 @@ class FileProcessor:
                         'size_bytes': file_size,
                         'max_bytes': self.max_file_size
                     })
-                if self.ui:
-                    self.ui.log_line(f"[formatter] Skipping {path} - file too large ({file_size:,} bytes > 100KB)")
-                else:
-                    print(f"[formatter] Skipping {path} - file too large ({file_size:,} bytes > 100KB)")
+                self._say(output, self._log, f"[formatter] Skipping {path} - file too large ({file_size:,} bytes > 100KB)")
+                self._discard_prefetch(path)
                 self.total_errors += 1
                 return "failed", "file too large"
         except FileNotFoundError:
@@ -321,6 +485,7 @@ class FileProcessor:
                     'path': str(path),
                     'error': error_msg
                 })
+            self._discard_prefetch(path)
             self.total_errors += 1
             return "failed", error_msg
         except Exception as e:
@@ -330,15 +495,16 @@ class FileProcessor:
                     'path': str(path),
                     'error': str(e)
                 })
+            self._discard_prefetch(path)
             self.total_errors += 1
             return "failed", f"stat error: {e}"
         
         # Process with patterns only if --no-als
         if self.no_als:
-            return await self._process_patterns_only(path, idx, total, file_start_time, run_start_time)
+            return await self._process_patterns_only(path, idx, total, file_start_time, run_start_time, file_size, output)
         
         # Process with ALS and optionally patterns
-        return await self._process_with_als(path, idx, total, file_start_time, run_start_time)
+        return await self._process_with_als(path, idx, total, file_start_time, run_start_time, uri, file_size, output)
     
     async def _process_patterns_only(
         self,
@@ -346,23 +512,21 @@ class FileProcessor:
         idx: int,
         total: int,
         file_start_time: float,
-        run_start_time: float
+        run_start_time: float,
+        size: Optional[int] = None,
+        output: Optional[FileOutput] = None
     ) -> Tuple[str, Optional[str]]:
-        """Process file with patterns only (no ALS)."""
+        """Process file with patterns only (no ALS).
+        
+        ``size`` is the on-disk size, used for the patterns size limit.
+        """
         try:
-            try:
-                original_content = path.read_text(encoding="utf-8", errors="ignore")
-            except FileNotFoundError:
-                raise FileNotFoundError(f"File not found: {path}")
-            except PermissionError:
-                raise PermissionError(f"Permission denied reading file: {path}")
-            except Exception as e:
-                raise IOError(f"Failed to read file {path}: {e}")
+            original_content = await self._read_source(path)
             formatted_content = original_content
             
             # Apply patterns if available
             pattern_result = None
-            if self.pattern_formatter and self.pattern_formatter.enabled:
+            if self._use_patterns(path, original_content, size):
                 try:
                     formatted_content, pattern_result = self.pattern_formatter.apply(
                         path, original_content
@@ -382,12 +546,12 @@ class FileProcessor:
                 
                 if self.write:
                     try:
-                        atomic_write(path, formatted_content)
+                        await self._write_source(path, formatted_content)
                     except Exception as e:
                         raise RuntimeError(f"Failed to write file: {e}")
                 
                 if self.diff:
-                    print(unified_diff(str(path), original_content, formatted_content))
+                    self._say(output, print, unified_diff(original_content, formatted_content, str(path)))
                 
                 status = "edited"
             else:
@@ -411,35 +575,66 @@ class FileProcessor:
                 })
             return "failed", str(e)
     
+    async def _wait_for_als(self, path: Path, output: Optional[FileOutput]) -> None:
+        """Hold a file until the open ALS circuit admits a request.
+        
+        The file is not skipped: once the cooldown ends it is sent as a
+        half-open probe, so a recovered ALS is used again straight away.
+        """
+        breaker = self.als_breaker
+        if stderr_redirected():
+            self._say(output, partial(write_stderr_error, path, "CIRCUIT_OPEN"),
+                      f"Waiting for ALS after {breaker.consecutive_failures} consecutive ALS failures")
+        while not breaker.allow():
+            await asyncio.sleep(breaker.retry_after())
+    
     async def _process_with_als(
         self,
         path: Path,
         idx: int,
         total: int,
         file_start_time: float,
-        run_start_time: float
+        run_start_time: float,
+        uri: Optional[str] = None,
+        size: Optional[int] = None,
+        output: Optional[FileOutput] = None
     ) -> Tuple[str, Optional[str]]:
-        """Process file with ALS and optionally patterns."""
+        """Process file with ALS and optionally patterns.
+        
+        ``size`` is the on-disk size, used for the patterns size limit of
+        files ALS leaves unchanged.
+        """
         edits = []
         status = "ok"
         note = None
         pattern_result = None
         
+        breaker = self.als_breaker
+        if breaker is not None and not breaker.allow():
+            await self._wait_for_als(path, output)
+        
         try:
-            # Get ALS edits
-            edits = await self.format_file_with_als(path)
+            # Read once; the same text is sent to ALS and used for edits/patterns
+            original_content = await self._read_source(path)
+            
+            # Get ALS edits. An error response means ALS is alive and
+            # rejected this file; anything else counts against ALS health.
+            try:
+                edits = await self.format_file_with_als(path, original_content, uri)
+            except ALSProtocolError:
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+            except Exception:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            if breaker is not None:
+                breaker.record_success()
             
             if edits:
                 self.als_changed += 1
                 # Apply edits to get formatted content
-                try:
-                    original_content = path.read_text(encoding="utf-8", errors="ignore")
-                except FileNotFoundError:
-                    raise FileNotFoundError(f"File not found: {path}")
-                except PermissionError:
-                    raise PermissionError(f"Permission denied reading file: {path}")
-                except Exception as e:
-                    raise IOError(f"Failed to read file {path}: {e}")
                 formatted_content = apply_text_edits(original_content, edits)
                 
                 # Use worker pool if available, otherwise process inline
@@ -450,7 +645,8 @@ class FileProcessor:
                         content=formatted_content,
                         index=idx,
                         total=total,
-                        queue_time=time.time()
+                        queue_time=time.time(),
+                        apply_patterns=self._use_patterns(path, formatted_content)
                     )
                     await self.worker_pool.submit(work_item)
                     # Worker will handle patterns, writing, and logging
@@ -458,7 +654,7 @@ class FileProcessor:
                 else:
                     # Process inline (original behavior)
                     # Apply patterns if enabled
-                    if self.pattern_formatter and self.pattern_formatter.enabled:
+                    if self._use_patterns(path, formatted_content):
                         try:
                             formatted_content, pattern_result = self.pattern_formatter.apply(
                                 path, formatted_content
@@ -475,27 +671,18 @@ class FileProcessor:
                     # Write changes if requested
                     if self.write:
                         try:
-                            atomic_write(path, formatted_content)
+                            await self._write_source(path, formatted_content)
                         except Exception as e:
                             raise RuntimeError(f"Failed to write file: {e}")
                     
                     # Show diff if requested
                     if self.diff:
-                        print(unified_diff(str(path), original_content, formatted_content))
+                        self._say(output, print, unified_diff(original_content, formatted_content, str(path)))
                     
                     status = "edited"
             else:
                 # No ALS changes, but still check patterns
-                if self.pattern_formatter and self.pattern_formatter.enabled:
-                    try:
-                        original_content = path.read_text(encoding="utf-8", errors="ignore")
-                    except FileNotFoundError:
-                        raise FileNotFoundError(f"File not found: {path}")
-                    except PermissionError:
-                        raise PermissionError(f"Permission denied reading file: {path}")
-                    except Exception as e:
-                        raise IOError(f"Failed to read file {path}: {e}")
-                    
+                if self._use_patterns(path, original_content, size):
                     # Use worker pool if available
                     if self.use_parallel and self.worker_pool:
                         # Queue for parallel processing
@@ -516,27 +703,28 @@ class FileProcessor:
                         if formatted_content != original_content:
                             self.pattern_files_changed += 1
                             if self.write:
-                                atomic_write(path, formatted_content)
+                                await self._write_source(path, formatted_content)
                             if self.diff:
-                                print(unified_diff(str(path), original_content, formatted_content))
+                                self._say(output, print, unified_diff(original_content, formatted_content, str(path)))
                             status = "edited"
                         
         except asyncio.TimeoutError:
-            self.consecutive_timeouts += 1
             self.als_failed += 1
             status = "failed"
             note = f"timeout after {self.format_timeout}s"
-            if self.max_consecutive_timeouts > 0 and self.consecutive_timeouts >= self.max_consecutive_timeouts:
-                raise RuntimeError(
-                    f"Too many consecutive timeouts ({self.consecutive_timeouts}) while processing files. "
-                    f"Consider increasing --timeout or checking if ALS is responding properly."
-                )
+            if output is None:
+                self.record_timeout(True)
+            else:
+                output.timed_out = True
         except Exception as e:
             self.als_failed += 1
             status = "failed"
             note = str(e)
         else:
-            self.consecutive_timeouts = 0
+            if output is None:
+                self.record_timeout(False)
+            else:
+                output.timed_out = False
         
         # Record metrics and log
         self._record_file_metrics(
@@ -545,6 +733,36 @@ class FileProcessor:
         
         return status, note
     
+    def record_timeout(self, timed_out: Optional[bool]) -> None:
+        """Update the consecutive ALS timeout count for one file.
+        
+        Args:
+            timed_out: True after a timeout, False after a successful ALS
+                request, None if the file did not reach ALS
+            
+        Raises:
+            RuntimeError: If the consecutive timeout limit is reached
+        """
+        if timed_out is None:
+            return
+        if not timed_out:
+            self.consecutive_timeouts = 0
+            return
+        self.consecutive_timeouts += 1
+        if self.max_consecutive_timeouts > 0 and self.consecutive_timeouts >= self.max_consecutive_timeouts:
+            raise RuntimeError(
+                f"Too many consecutive timeouts ({self.consecutive_timeouts}) while processing files. "
+                f"Consider increasing --timeout or checking if ALS is responding properly."
+            )
+    
+    @staticmethod
+    def _say(output: Optional[FileOutput], write: Callable[[str], Any], text: str) -> None:
+        """Write ``text`` now, or record it in ``output`` for replay."""
+        if output is None:
+            write(text)
+        else:
+            output.messages.append((write, text))
+    
     def _record_file_metrics(
         self,
         path: Path,
@@ -556,43 +774,51 @@ class FileProcessor:
         note: Optional[str]
     ) -> None:
         """Record metrics and logs for a processed file."""
-        file_duration = time.time() - file_start_time
+        file_duration = time.monotonic() - file_start_time
+        path_str = str(path)
+        # Shared by every record below
+        applied = pattern_result.applied_names if pattern_result else []
+        replacements = pattern_result.replacements_sum if pattern_result else 0
+        als_ok = status != "failed"
         
         # Pattern logger
         if self.pattern_logger:
             self.pattern_logger.write({
                 'ev': 'file',
-                'path': str(path),
-                'als_ok': status != "failed",
+                'path': path_str,
+                'als_ok': als_ok,
                 'als_edits': als_edits,
-                'patterns_applied': pattern_result.applied_names if pattern_result else [],
-                'replacements': pattern_result.replacements_sum if pattern_result else 0
+                'patterns_applied': applied,
+                'replacements': replacements
             })
         
         # Metrics
         if self.metrics:
             self.metrics.record_file_format(
-                file_path=str(path),
-                als_success=status != "failed" if als_used else None,
+                file_path=path_str,
+                als_success=als_ok if als_used else None,
                 als_edits=als_edits if als_used else None,
-                patterns_applied=pattern_result.applied_names if pattern_result else [],
+                patterns_applied=applied,
                 duration=file_duration,
-                error=note if status == "failed" else None
+                error=None if als_ok else note
             )
         
         # Main logger
         if self.logger:
             self.logger.write({
-                "path": str(path),
+                "path": path_str,
                 "status": status,
                 "note": note,
                 "als_edits": als_edits if als_used else None,
-                "patterns_applied": pattern_result.applied_names if pattern_result else [],
-                "patterns_replacements": pattern_result.replacements_sum if pattern_result else 0
+                "patterns_applied": applied,
+                "patterns_replacements": replacements
             })
     
     async def _ui_consumer(self) -> None:
         """Consume completion messages from workers and display them."""
+        from .cli import _build_status_line, _print_colored_line
+        emit = self.ui.log_line if self.ui else _print_colored_line
+        patterns_active = bool(self.pattern_formatter and self.pattern_formatter.enabled)
         while True:
             try:
                 message = await self.ui_queue.get()
@@ -612,22 +838,16 @@ class FileProcessor:
                     prefix = f"[{index:>4}/{total}]"
                     
                     # Build status line using CLI formatter
-                    from .cli import _build_status_line
                     line = _build_status_line(
                         index, total, path, status, note,
-                        self.no_als, self.pattern_formatter
+                        self.no_als, patterns_active
                     )
                     
                     # Add worker info
                     line += f" | Worker: {worker_id}"
                     
                     # Display the line
-                    if self.ui:
-                        self.ui.log_line(line)
-                    else:
-                        # Use CLI's colored print function
-                        from .cli import _print_colored_line
-                        _print_colored_line(line)
+                    emit(line)
                         
             except asyncio.CancelledError:
                 break
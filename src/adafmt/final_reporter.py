@@ -10,19 +10,21 @@
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Sequence
 
-from .metrics_reporter import MetricsReporter
+from .metrics_reporter import MetricsReporter, log_location_labels
 from .file_processor import FileProcessor
 from .pattern_formatter import PatternFormatter
 from .als_client import ALSClient
-from .logging_jsonl import JsonlLogger
+from .logging_jsonl import JsonlLogger, flush_all
+from .utils import run_hook_async
 
 
 async def finalize_and_report(
     file_processor: FileProcessor,
     file_paths: List[Path],
     run_start_time: float,
+    run_start: float,
     als_ready_timeout: int,
     log_path: Path,
     stderr_path: Optional[Path],
@@ -36,7 +38,7 @@ async def finalize_and_report(
     ui: Optional[Any],
     no_als: bool,
     check: bool,
-    post_hook: Optional[str],
+    post_hook: Optional[Sequence[str]],
     hook_timeout: float,
     debug_pattern_log_path: Optional[Path] = None,
     debug_als_log_path: Optional[Path] = None,
@@ -46,6 +48,10 @@ async def finalize_and_report(
     """
     Handle final metrics calculation, reporting, and cleanup.
     
+    ``run_start_time`` is the wall clock start used for reported timestamps;
+    ``run_start`` is the same instant on the :func:`time.monotonic` clock and
+    is used for elapsed times.
+    
     Returns:
         Exit code (0 for success, 1 if changes found in check mode)
     """
@@ -57,33 +63,35 @@ async def finalize_and_report(
     false_positives = 0  # TODO: Track false positives in FileProcessor
     
     # Calculate statistics
-    end_time = time.time()
-    elapsed_seconds = max(0.1, end_time - run_start_time)
+    # Derive the end timestamp from monotonic elapsed time so clock
+    # adjustments during the run cannot skew the reported duration
+    elapsed = time.monotonic() - run_start
+    end_time = run_start_time + elapsed
+    elapsed_seconds = max(0.1, elapsed)
     
     # Calculate final metrics
     total_processed = len(file_paths)
     total_changed = als_changed + pattern_files_changed
     total_failed = als_failed
     als_unchanged = total_processed - als_changed - als_failed if client else 0
-    total_unchanged = len(file_paths) - total_changed - total_failed
+    total_unchanged = total_processed - total_changed - total_failed
     
-    rate = len(file_paths) / elapsed_seconds if len(file_paths) > 0 else 0
+    rate = total_processed / elapsed_seconds if total_processed > 0 else 0
 
     # Update final UI state before shutdown
     if ui:
-        ui.set_progress(len(file_paths), len(file_paths))
+        ui.set_progress(total_processed, total_processed)
         # Final footer update
         ui.update_footer_stats(
-            total=len(file_paths),
+            total=total_processed,
             changed=total_changed,
             unchanged=total_unchanged,
             failed=total_failed,
             elapsed=elapsed_seconds,
             rate=rate,
-            jsonl_log=f"./{log_path} (default location)" if using_default_log else str(log_path) if log_path else "Not configured",
-            als_log=((client.als_log_path if client else None) or "~/.als/ada_ls_log.*.log (default location)") if not no_als else "N/A (ALS disabled)",
-            stderr_log=f"./{stderr_path} (default location)" if using_default_stderr else str(stderr_path) if stderr_path else "Not configured",
-            pattern_log=f"./{pattern_log_path} (default location)" if using_default_patterns else str(pattern_log_path)
+            **log_location_labels(
+                log_path, stderr_path, pattern_log_path, using_default_log,
+                using_default_stderr, using_default_patterns, client, no_als)
         )
         
         # Only show warnings if there were false positives
@@ -171,10 +179,10 @@ async def finalize_and_report(
     if client:
         await client.shutdown()
     
-    # Run post-hook if provided
+    # Run post-hook if provided, with run logs complete on disk
     if post_hook:
-        from .utils import run_hook
-        run_hook(post_hook, "post", logger=(ui.log_line if ui else print) if ui else print, timeout=hook_timeout, dry_run=False)
+        flush_all()
+        await run_hook_async(post_hook, "post", logger=(ui.log_line if ui else print) if ui else print, timeout=hook_timeout, dry_run=False)
 
     if check and total_changed:
         return 1
@@ -25,9 +25,33 @@ Typical log entries:
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from .utils import open_log_file
+
+LOG_BUFFER_SIZE = 64 * 1024
+"""Write buffer size for loggers that coalesce records between flushes."""
+
+_coalescing: "weakref.WeakSet[JsonlLogger]" = weakref.WeakSet()
+
+
+def flush_all() -> None:
+    """Flush every logger that is holding buffered records.
+    
+    Called before handing log files to other processes (such as the
+    post-hook) and at interpreter exit.
+    """
+    for logger in list(_coalescing):
+        logger.flush()
+
+
+atexit.register(flush_all)
+
 
 class JsonlLogger:
     """Logger that writes JSON objects to a file, one per line.
@@ -35,20 +59,29 @@ class JsonlLogger:
     The logger overwrites the log file on each run rather than appending
     to previous runs. This ensures each adafmt execution has a clean log.
     
+    With a positive ``flush_interval`` records are buffered and written
+    together at most that many seconds after the first pending record,
+    instead of one write per record. Outside a running event loop every
+    record is still flushed immediately.
+    
     Attributes:
         path: Path to the JSONL log file
+        flush_interval: Maximum seconds a record may stay buffered (0 = flush each write)
         _file: Open file handle (managed internally)
     """
     
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, flush_interval: float = 0.0) -> None:
         """Initialize the logger with a file path.
         
         Args:
             path: Path where the JSONL file will be written.
                   Parent directories are created if needed.
+            flush_interval: Seconds to coalesce records before flushing
         """
         self.path = Path(path)
+        self.flush_interval = flush_interval
         self._file = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
     
     def __repr__(self):
         """Boring representation to avoid leaking paths when printed."""
@@ -71,17 +104,20 @@ class JsonlLogger:
         
         This method:
         1. Creates parent directories if they don't exist
-        2. Opens the file in write mode (truncating if exists)
+        2. Opens the file truncated, in append mode (see open_log_file)
         3. Keeps the file open for subsequent writes
         
         Note:
             This is called automatically when using the logger as a
             context manager, but can be called explicitly.
         """
-        self.path.parent.mkdir(parents=True, exist_ok=True)
         if self._file:
-            self._file.close()
-        self._file = self.path.open("w", encoding="utf-8")
+            self.close()
+        if self.flush_interval > 0:
+            self._file = open_log_file(self.path, buffering=LOG_BUFFER_SIZE)
+            _coalescing.add(self)
+        else:
+            self._file = open_log_file(self.path)
 
     def write(self, record: Dict[str, Any]) -> None:
         """Write a single record as a JSON line.
@@ -95,7 +131,8 @@ class JsonlLogger:
         Note:
             - Uses ensure_ascii=False to preserve Unicode characters
             - Writes to the open file handle
-            - Flushes after each write for crash safety
+            - Flushes after each write for crash safety, or within
+              flush_interval seconds when coalescing
             
         Example:
             >>> logger.write({"path": "test.ads", "status": "ok"})
@@ -104,13 +141,33 @@ class JsonlLogger:
         if not self._file:
             self.start_fresh()
         self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self._flush_handle is not None:
+            return
+        if self.flush_interval > 0:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._flush_handle = loop.call_later(self.flush_interval, self.flush)
+                return
         self._file.flush()  # Ensure crash safety
     
+    def flush(self) -> None:
+        """Write out any buffered records."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._file:
+            self._file.flush()
+    
     def close(self) -> None:
         """Close the log file if open."""
         if self._file:
+            self.flush()
             self._file.close()
             self._file = None
+        _coalescing.discard(self)
 
     def append_notes(self, file: str, notes: List[str]) -> None:
         """Write a record containing multiple notes for a file.
@@ -7,10 +7,18 @@
 
 """Logging setup and initialization for the Ada formatter."""
 
+import re
 from pathlib import Path
 from typing import Tuple, Optional
 
 from .logging_jsonl import JsonlLogger
+from .utils import new_run_id
+
+# Run id in a default log name, e.g. adafmt_20250920T220311Z-4242-1a2b_log.jsonl
+_RUN_ID_RE = re.compile(r'adafmt_(\d{8}T\d{6}Z(?:-[0-9a-f]+)*)_')
+
+LOG_FLUSH_INTERVAL = 0.05
+"""Seconds run log records are coalesced before being written out."""
 
 
 def setup_loggers(log_path: Path, debug_patterns_path: Optional[Path] = None, debug_als_path: Optional[Path] = None) -> Tuple[JsonlLogger, JsonlLogger, Path, Optional[JsonlLogger], Optional[Path], Optional[JsonlLogger], Optional[Path]]:
@@ -28,19 +36,16 @@ def setup_loggers(log_path: Path, debug_patterns_path: Optional[Path] = None, de
                  debug_als_logger, debug_als_log_path)
     """
     # Main logger - always create a logger (log_path is always set now)
-    logger = JsonlLogger(log_path)
+    logger = JsonlLogger(log_path, LOG_FLUSH_INTERVAL)
     logger.start_fresh()  # Create empty file, ensuring it exists
     
-    # Pattern logger - create pattern log file
-    # Try to extract timestamp from log filename, or use current time
-    try:
-        timestamp = log_path.name.split('_')[1].split('.')[0]  # Extract timestamp from main log filename
-    except (IndexError, AttributeError):
-        from datetime import datetime as dt
-        timestamp = dt.now().strftime('%Y%m%dT%H%M%SZ')
+    # Pattern logger - reuse the run id of a default main log name so the
+    # files of one run sort together; custom log names get a fresh run id
+    match = _RUN_ID_RE.match(log_path.name)
+    timestamp = match.group(1) if match else new_run_id()
     
     pattern_log_path = log_path.parent / f"adafmt_{timestamp}_patterns.log"
-    pattern_logger = JsonlLogger(pattern_log_path)
+    pattern_logger = JsonlLogger(pattern_log_path, LOG_FLUSH_INTERVAL)
     pattern_logger.start_fresh()
     
     # Debug pattern logger - only create if path is provided
@@ -52,7 +57,7 @@ def setup_loggers(log_path: Path, debug_patterns_path: Optional[Path] = None, de
             debug_pattern_log_path = debug_patterns_path
         else:
             debug_pattern_log_path = log_path.parent / debug_patterns_path
-        debug_pattern_logger = JsonlLogger(debug_pattern_log_path)
+        debug_pattern_logger = JsonlLogger(debug_pattern_log_path, LOG_FLUSH_INTERVAL)
         debug_pattern_logger.start_fresh()
     
     # Debug ALS logger - only create if path is provided
@@ -64,7 +69,7 @@ def setup_loggers(log_path: Path, debug_patterns_path: Optional[Path] = None, de
             debug_als_log_path = debug_als_path
         else:
             debug_als_log_path = log_path.parent / debug_als_path
-        debug_als_logger = JsonlLogger(debug_als_log_path)
+        debug_als_logger = JsonlLogger(debug_als_log_path, LOG_FLUSH_INTERVAL)
         debug_als_logger.start_fresh()
     
     return logger, pattern_logger, pattern_log_path, debug_pattern_logger, debug_pattern_log_path, debug_als_logger, debug_als_log_path
\ No newline at end of file
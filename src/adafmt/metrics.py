@@ -29,6 +29,9 @@ from contextlib import contextmanager
 
 from .utils import to_iso8601_basic
 
+if sys.platform != 'win32':
+    import fcntl
+
 
 class MetricsCollector:
     """Collects and persists performance metrics.
@@ -63,7 +66,6 @@ class MetricsCollector:
         with open(self.path, 'a', encoding='utf-8') as f:
             if sys.platform != 'win32':
                 # Unix: Use fcntl for file locking
-                import fcntl
                 fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 try:
                     yield f
@@ -96,7 +98,7 @@ class MetricsCollector:
         Args:
             name: Timer name (e.g., 'als_startup', 'file_format')
         """
-        self._timers[name] = time.time()
+        self._timers[name] = time.monotonic()
     
     def end_timer(self, name: str, **kwargs) -> float:
         """End a named timer and record the duration.
@@ -111,7 +113,7 @@ class MetricsCollector:
         if name not in self._timers:
             return 0.0
         
-        duration = time.time() - self._timers[name]
+        duration = time.monotonic() - self._timers[name]
         del self._timers[name]
         
         # Write timing metric
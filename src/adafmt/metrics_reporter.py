@@ -9,8 +9,7 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Any
-from tabulate import tabulate
+from typing import Any, Dict, List, Optional, Sequence
 
 from .utils import to_iso8601_basic
 
@@ -18,6 +17,50 @@ from .als_client import ALSClient
 from .pattern_formatter import PatternFormatter
 
 
+def _print_table(rows: Sequence[Sequence[Any]], align: Sequence[str],
+                 headers: Optional[Sequence[str]] = None, indent: str = "  ") -> None:
+    """Print rows as aligned columns separated by two spaces.
+    
+    The layout matches tabulate's "plain" format, or "simple" when headers
+    are given (each column is then at least two wider than its header and
+    the header is underlined with dashes).
+    
+    Args:
+        rows: Table rows; cells are converted with str()
+        align: "left" or "right" for each column
+        headers: Optional column headers
+        indent: Prefix for every printed line
+    """
+    cells = [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[col]) for row in cells) for col in range(len(align))]
+    if headers:
+        widths = [max(width, len(header) + 2) for width, header in zip(widths, headers)]
+        cells = [list(headers), ["-" * width for width in widths], *cells]
+    for row in cells:
+        line = "  ".join(
+            f"{cell:>{width}}" if side == "right" else f"{cell:<{width}}"
+            for cell, width, side in zip(row, widths, align))
+        print(f"{indent}{line.rstrip()}")
+
+
+def log_location_labels(
+    log_path: Optional[Path], stderr_path: Optional[Path], pattern_log_path: Optional[Path],
+    using_default_log: bool, using_default_stderr: bool, using_default_patterns: bool,
+    client: Optional[ALSClient], no_als: bool
+) -> Dict[str, str]:
+    """Build the display strings for the run's log file locations.
+    
+    Keys match the log keyword arguments of ui.update_footer_stats. The
+    labels do not change during a run, so callers build them once.
+    """
+    return {
+        'jsonl_log': f"./{log_path} (default location)" if using_default_log else str(log_path) if log_path else "Not configured",
+        'als_log': ((client.als_log_path if client else None) or "~/.als/ada_ls_log.*.log (default location)") if not no_als else "N/A (ALS disabled)",
+        'stderr_log': f"./{stderr_path} (default location)" if using_default_stderr else str(stderr_path) if stderr_path else "Not configured",
+        'pattern_log': f"./{pattern_log_path} (default location)" if using_default_patterns else str(pattern_log_path),
+    }
+
+
 class MetricsReporter:
     """Handles formatting and display of metrics after processing."""
     
@@ -89,7 +132,8 @@ class MetricsReporter:
         """
         elapsed_seconds = max(0.1, run_end_time - run_start_time)
         als_elapsed = elapsed_seconds - pattern_elapsed
-        rate = len(file_paths) / elapsed_seconds if len(file_paths) > 0 else 0
+        total_files = len(file_paths)
+        rate = total_files / elapsed_seconds if total_files > 0 else 0
         
         # Print separator
         print("\n" + "=" * 80)
@@ -150,9 +194,7 @@ class MetricsReporter:
         ]
         
         # Print table with 2-space indent
-        table_str = tabulate(file_stats, tablefmt="plain", colalign=("left", "right", "right"))
-        for line in table_str.split('\n'):
-            print(f"  {line}")
+        _print_table(file_stats, ("left", "right", "right"))
         
         # Show Started timestamp
         print(f"  Started    {to_iso8601_basic(als_start_time)}")
@@ -163,9 +205,7 @@ class MetricsReporter:
             ["Elapsed", f"{als_elapsed:.1f}s"],
             ["Rate", f"{rate:.1f} files/s"]
         ]
-        table_str = tabulate(timing_data, tablefmt="plain")
-        for line in table_str.split('\n'):
-            print(f"  {line}")
+        _print_table(timing_data, ("left", "left"))
     
     def _print_pattern_metrics(
         self,
@@ -214,10 +254,7 @@ class MetricsReporter:
             
             # Print table with consistent alignment
             headers = ["Pattern", "Applied", "Replaced", "Failed"]
-            table_str = tabulate(pattern_data, headers=headers, tablefmt="simple", 
-                                colalign=("left", "right", "right", "right"))
-            for line in table_str.split('\n'):
-                print(f"  {line}")
+            _print_table(pattern_data, ("left", "right", "right", "right"), headers=headers)
         else:
             print()  # blank line after Files
             print("  No patterns were applied to any files")
@@ -247,9 +284,7 @@ class MetricsReporter:
                 replacements_rate = total_replacements / pattern_elapsed
                 pattern_timing_data.append(["Rate (replacements)", f"{replacements_rate:.1f} replacements/s"])
         
-        table_str = tabulate(pattern_timing_data, tablefmt="plain")
-        for line in table_str.split('\n'):
-            print(f"  {line}")
+        _print_table(pattern_timing_data, ("left", "left"))
     
     def _print_run_summary(
         self,
@@ -265,9 +300,7 @@ class MetricsReporter:
             ["Completed", to_iso8601_basic(adafmt_end_time)],
             ["Total Elapsed", f"{elapsed_seconds:.1f}s"]
         ]
-        table_str = tabulate(completion_data, tablefmt="plain")
-        for line in table_str.split('\n'):
-            print(f"  {line}")
+        _print_table(completion_data, ("left", "left"))
     
     def _print_log_files(
         self,
@@ -289,20 +322,19 @@ class MetricsReporter:
         # Always print log files section
         print("\nLOG FILES")
         
+        labels = log_location_labels(
+            log_path, stderr_path, pattern_log_path, using_default_log,
+            using_default_stderr, using_default_patterns, client, no_als)
+        
         # Build log files table in the specified order
         log_files = []
         
         # 1. Adafmt Log
-        if log_path:
-            log_display = f"./{log_path} (default location)" if using_default_log else str(log_path)
-            log_files.append(["Adafmt", log_display])
-        else:
-            log_files.append(["Adafmt", "Not configured"])
+        log_files.append(["Adafmt", labels['jsonl_log']])
         
         # 2. ALS Log
         if not no_als:
-            als_log_display = (client.als_log_path if client else None) or "~/.als/ada_ls_log.*.log (default location)"
-            log_files.append(["ALS", als_log_display])
+            log_files.append(["ALS", labels['als_log']])
         
         # 3. Debug ALS Log (if present)
         if debug_als_log_path:
@@ -321,19 +353,12 @@ class MetricsReporter:
             log_files.append(["Debug Patterns", debug_patterns_display])
         
         # 5. Patterns Log
-        pattern_log_display = f"./{pattern_log_path} (default location)" if using_default_patterns else str(pattern_log_path)
-        log_files.append(["Patterns", pattern_log_display])
+        log_files.append(["Patterns", labels['pattern_log']])
         
         # 6. Performance Log
         log_files.append(["Performance", "~/.adafmt/metrics.jsonl (default location)"])
         
         # 7. Stderr Log
-        if stderr_path:
-            stderr_display = f"./{stderr_path} (default location)" if using_default_stderr else str(stderr_path)
-            log_files.append(["Stderr", stderr_display])
-        else:
-            log_files.append(["Stderr", "Not configured"])
+        log_files.append(["Stderr", labels['stderr_log']])
         
-        table_str = tabulate(log_files, tablefmt="plain", colalign=("left", "left"))
-        for line in table_str.split('\n'):
-            print(f"  {line}")
\ No newline at end of file
+        _print_table(log_files, ("left", "left"))
@@ -21,6 +21,16 @@ import re
 import unicodedata
 from typing import Optional
 
+# Letters, numbers, space, and common path characters
+# Removed: < > | " * ? \ (unsafe across platforms)
+# Kept: & = from original pattern for compatibility
+_ALLOWED_CHARS = r'A-Za-z0-9 ._:/@()[\]{},!$+=~`\'&\-'
+_ALLOWED_CHAR_RE = re.compile(f'^[{_ALLOWED_CHARS}]+$')
+# Whole paths made only of allowed characters skip the per-character scan
+_ALLOWED_PATH_RE = re.compile(f'[{_ALLOWED_CHARS}]+')
+_URL_ENCODED_RE = re.compile(r'%[0-9A-Fa-f]{2}')
+_URL_SCHEMES = ('http://', 'https://', 'file://', 'ftp://')
+
 
 def is_supplementary_code_point(char: str) -> bool:
     """Check if a character is outside the Basic Multilingual Plane.
@@ -58,44 +68,37 @@ def validate_path(input_path: str) -> Optional[str]:
         return "Path cannot be empty"
     
     # Check for URL schemes
-    url_schemes = ['http://', 'https://', 'file://', 'ftp://']
-    for scheme in url_schemes:
-        if input_path.lower().startswith(scheme):
+    lowered = input_path[:8].lower()
+    for scheme in _URL_SCHEMES:
+        if lowered.startswith(scheme):
             return f"Path appears to be a URL ({scheme}). Please provide a filesystem path instead"
     
-    # Check for URL-encoded sequences
-    if '%' in input_path:
-        # Pattern to match URL encoding: %XX where XX are hexadecimal digits
-        url_encoded_pattern = re.compile(r'%[0-9A-Fa-f]{2}')
-        if url_encoded_pattern.search(input_path):
-            return "Path appears to be URL-encoded. Please provide the decoded path instead"
-    
-    # Updated pattern for allowed characters - now includes space and more common chars
-    # Letters, numbers, space, and common path characters
-    # Removed: < > | " * ? \ (unsafe across platforms)
-    # Kept: & = from original pattern for compatibility
-    allowed_pattern = re.compile(r'^[A-Za-z0-9 ._:/@()[\]{},!$+=~`\'&\-]+$')
+    # Check for URL-encoded sequences (%XX where XX are hexadecimal digits)
+    if '%' in input_path and _URL_ENCODED_RE.search(input_path):
+        return "Path appears to be URL-encoded. Please provide the decoded path instead"
     
-    for i, char in enumerate(input_path):
-        # Check for supplementary Unicode characters (outside BMP)
-        if is_supplementary_code_point(char):
-            return f"Path contains Unicode supplementary character at position {i}"
-            
-        # Check for whitespace other than regular space
-        if char.isspace() and char != ' ':
-            return f"Path contains whitespace character '{repr(char)}' at position {i}"
-            
-        # Check for control characters
-        if unicodedata.category(char) in ('Cc', 'Cf', 'Co', 'Cn'):
-            return f"Path contains control character '{repr(char)}' at position {i}"
-            
-        # Check if character matches allowed pattern
-        if not allowed_pattern.match(char):
-            return f"Path contains illegal character '{char}' at position {i}"
+    # Common case: one regex pass over an all-allowed path. Otherwise find
+    # the first offending character to report it.
+    if not _ALLOWED_PATH_RE.fullmatch(input_path):
+        for i, char in enumerate(input_path):
+            # Check for supplementary Unicode characters (outside BMP)
+            if is_supplementary_code_point(char):
+                return f"Path contains Unicode supplementary character at position {i}"
+                
+            # Check for whitespace other than regular space
+            if char.isspace() and char != ' ':
+                return f"Path contains whitespace character '{repr(char)}' at position {i}"
+                
+            # Check for control characters
+            if unicodedata.category(char) in ('Cc', 'Cf', 'Co', 'Cn'):
+                return f"Path contains control character '{repr(char)}' at position {i}"
+                
+            # Check if character matches allowed pattern
+            if not _ALLOWED_CHAR_RE.match(char):
+                return f"Path contains illegal character '{char}' at position {i}"
     
     # Additional validation - only check for .. as a complete path segment
-    path_segments = input_path.split('/')
-    if '..' in path_segments:
+    if '..' in input_path and '..' in input_path.split('/'):
         return "Path contains directory traversal sequence (..)"
     
-    return None  # Path is valid
\ No newline at end of file
+    return None  # Path is valid
@@ -24,9 +24,12 @@ Key features:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import signal
-from contextlib import contextmanager
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing, contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Pattern, Tuple
@@ -65,6 +68,12 @@ SUPPORTED_FLAGS = {
     'DOTALL': re.DOTALL
 }
 
+# Number of source texts remembered as left unchanged by the loaded patterns
+CLEAN_CACHE_SIZE = 65536
+
+# Bytes of each text digest kept in the clean-text cache
+TEXT_DIGEST_SIZE = 16
+
 # Valid pattern categories
 VALID_CATEGORIES = {
     'comment', 'hygiene', 'operator', 'delimiter', 'declaration', 'attribute'
@@ -175,6 +184,102 @@ class PatternFormatter:
         self.files_touched: Dict[str, int] = {}
         self.replacements: Dict[str, int] = {}
         self.debug_logger = debug_logger
+        self.cache_hits: int = 0
+        # Keyed digests of texts on which every rule matched nothing
+        self._clean: OrderedDict[bytes, None] = OrderedDict()
+        self._fingerprint_rules: Tuple[CompiledRule, ...] = ()
+        self._fingerprint: bytes = b""
+        self._text_hasher = hashlib.sha256()
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hex digest identifying the loaded rules and regex engine."""
+        return self._rules_key().hex()
+    
+    def _rules_key(self) -> bytes:
+        """Return the rules digest, recomputing it if the rules changed.
+        
+        The clean-text cache is dropped whenever the rules change.
+        """
+        if self.rules is not self._fingerprint_rules:
+            h = hashlib.sha256(REGEX_MODULE.encode())
+            for rule in self.rules:
+                h.update(json.dumps([rule.name, rule.find.pattern, rule.find.flags,
+                                     rule.replace]).encode('utf-8'))
+            self._fingerprint = h.digest()
+            self._fingerprint_rules = self.rules
+            self._text_hasher = hashlib.sha256(self._fingerprint)
+            self._clean.clear()
+        return self._fingerprint
+    
+    def _text_digest(self, text: str) -> bytes:
+        """Hash text keyed by the rules digest.
+        
+        SHA-256 is used because OpenSSL runs it on the CPU's SHA
+        instructions where available. The hasher is seeded with the rules
+        digest once and copied for each text.
+        """
+        self._rules_key()
+        h = self._text_hasher.copy()
+        h.update(text.encode('utf-8', 'surrogatepass'))
+        return h.digest()[:TEXT_DIGEST_SIZE]
+    
+    def _remember_clean(self, digest: bytes) -> None:
+        """Record a text digest as unchanged by all rules (LRU bounded)."""
+        self._clean[digest] = None
+        self._clean.move_to_end(digest)
+        if len(self._clean) > CLEAN_CACHE_SIZE:
+            self._clean.popitem(last=False)
+    
+    def load_clean_cache(self, path: Path) -> int:
+        """Load digests of unchanged texts persisted by an earlier run.
+        
+        Only entries recorded for the current rules fingerprint are used.
+        The cache is best effort: unreadable files are ignored.
+        
+        Args:
+            path: SQLite cache file
+            
+        Returns:
+            Number of entries loaded
+        """
+        if not self.rules or not path.exists():
+            return 0
+        fingerprint = self.fingerprint
+        try:
+            with closing(sqlite3.connect(path)) as db:
+                rows = db.execute(
+                    "SELECT digest FROM clean WHERE fingerprint = ? LIMIT ?",
+                    (fingerprint, CLEAN_CACHE_SIZE)).fetchall()
+        except sqlite3.Error:
+            return 0
+        for (digest,) in rows:
+            self._clean[bytes(digest)] = None
+        return len(rows)
+    
+    def save_clean_cache(self, path: Path) -> None:
+        """Persist digests of unchanged texts for the current rules.
+        
+        Entries for other fingerprints (other pattern files) are kept.
+        Failures are ignored; the cache only saves work.
+        
+        Args:
+            path: SQLite cache file (parent directories are created)
+        """
+        if not self.rules:
+            return
+        fingerprint = self.fingerprint
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(path)) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS clean ("
+                           "fingerprint TEXT NOT NULL, digest BLOB NOT NULL, "
+                           "PRIMARY KEY (fingerprint, digest)) WITHOUT ROWID")
+                db.execute("DELETE FROM clean WHERE fingerprint = ?", (fingerprint,))
+                db.executemany("INSERT INTO clean VALUES (?, ?)",
+                               ((fingerprint, d) for d in self._clean))
+        except (OSError, sqlite3.Error):
+            pass
     
     @classmethod
     def load_from_json(
@@ -376,11 +481,23 @@ class PatternFormatter:
             
         Note:
             If no patterns are loaded or enabled=False, returns
-            the original text unchanged.
+            the original text unchanged. Texts on which every rule
+            previously matched nothing are remembered by content hash
+            and returned without running the rules again (except when
+            debug logging, which needs the per-rule events).
         """
         if not self.enabled or not self.rules:
             return text, FileApplyResult()
         
+        digest = None
+        if not self.debug_logger:
+            digest = self._text_digest(text)
+            if digest in self._clean:
+                self._clean.move_to_end(digest)
+                self.cache_hits += 1
+                return text, FileApplyResult()
+        failed = False
+        
         result = FileApplyResult()
         current_text = text
         timeout_seconds = timeout_ms / 1000.0
@@ -519,6 +636,7 @@ class PatternFormatter:
                     })
                 if ui:
                     ui.show_error(f"Pattern '{rule.name}' timed out")
+                failed = True
                 continue
                 
             except Exception as e:
@@ -532,6 +650,7 @@ class PatternFormatter:
                     })
                 if ui:
                     ui.show_error(f"Pattern '{rule.name}' error: {e}")
+                failed = True
                 continue
         
         # Debug: Log file complete event
@@ -548,6 +667,9 @@ class PatternFormatter:
                 'final_content_preview': current_text[:500] if len(current_text) > 500 else current_text
             })
         
+        if digest is not None and not failed and not result.applied_names:
+            self._remember_clean(digest)
+        
         return current_text, result
     
     def get_summary(self) -> Dict[str, Dict[str, int]]:
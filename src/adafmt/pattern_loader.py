@@ -42,6 +42,7 @@ def load_patterns(
         SystemExit: If explicitly provided patterns file not found
     """
     pattern_formatter = None
+    log = ui.log_line if ui else print
     
     if not no_patterns:
         # Use default path if not provided
@@ -50,7 +51,8 @@ def load_patterns(
             using_default_patterns = True
         
         # Check if patterns file exists when explicitly provided
-        if not using_default_patterns and not patterns_path.exists():
+        patterns_exist = patterns_path.exists()
+        if not using_default_patterns and not patterns_exist:
             if ui:
                 ui.log_line(f"[error] Patterns file not found: {patterns_path}")
                 ui.close()
@@ -60,7 +62,7 @@ def load_patterns(
             raise SystemExit(2)
         
         # For default path, it's OK if it doesn't exist
-        if patterns_path.exists():
+        if patterns_exist:
             if ui:
                 ui.log_line(f"[patterns] Loading patterns from: {patterns_path}")
             
@@ -74,10 +76,7 @@ def load_patterns(
                 
                 # Check if patterns file is empty (no patterns loaded)
                 if pattern_formatter.loaded_count == 0:
-                    if ui:
-                        ui.log_line("[patterns] Warning: Pattern file is empty, only ALS formatting will be performed")
-                    else:
-                        print("[patterns] Warning: Pattern file is empty, only ALS formatting will be performed")
+                    log("[patterns] Warning: Pattern file is empty, only ALS formatting will be performed")
                     pattern_formatter = None  # Same as --no-patterns
                 else:
                     if ui:
@@ -87,14 +86,8 @@ def load_patterns(
                 raise
         else:
             # Default patterns file doesn't exist - that's OK, continue without patterns
-            if ui:
-                ui.log_line("[patterns] No patterns file found, only ALS formatting will be performed")
-            else:
-                print("[patterns] No patterns file found, only ALS formatting will be performed")
+            log("[patterns] No patterns file found, only ALS formatting will be performed")
     else:
-        if ui:
-            ui.log_line("[patterns] Pattern processing disabled (--no-patterns)")
-        else:
-            print("[patterns] Pattern processing disabled (--no-patterns)")
+        log("[patterns] Pattern processing disabled (--no-patterns)")
             
     return pattern_formatter, patterns_path
\ No newline at end of file
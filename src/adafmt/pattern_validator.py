@@ -7,6 +7,7 @@ from typing import List, Tuple, Any
 from .als_client import ALSClient
 from .pattern_formatter import PatternFormatter
 from .logging_jsonl import JsonlLogger
+from .utils import read_source_text
 
 
 class PatternValidator:
@@ -28,26 +29,32 @@ class PatternValidator:
             Tuple of (error_count, error_messages)
         """
         errors_encountered = []
-        ui = self.ui
+        log = self.ui.log_line if self.ui else print
+        # Per-file progress and the summary are UI-only; without a UI they are dropped
+        progress = self.ui.log_line if self.ui else (lambda _line: None)
         
-        ui.log_line(f"[validate] Validating {self.pattern_formatter.loaded_count} patterns against {len(file_paths)} files")
+        log(f"[validate] Validating {self.pattern_formatter.loaded_count} patterns against {len(file_paths)} files")
         
         # Track results
         total_files = len(file_paths)
         validated_count = 0
         error_count = 0
         
+        def start_read(path: Path) -> "asyncio.Task[str]":
+            return asyncio.create_task(asyncio.to_thread(read_source_text, path, 'strict'))
+        
+        # Each file is read once, in a worker thread, while the previous
+        # file is still being checked by ALS
+        next_read = start_read(file_paths[0]) if file_paths else None
         for idx, file_path in enumerate(file_paths, 1):
+            current_read = next_read
+            next_read = start_read(file_paths[idx]) if idx < total_files else None
             try:
-                # Progress update using log_line
-                if ui:
-                    progress = f"[{idx:4d}/{total_files}]"
-                    ui.log_line(
-                        f"[validate] {progress} Checking {file_path.name}..."
-                    )
+                # Progress update
+                progress(f"[validate] [{idx:4d}/{total_files}] Checking {file_path.name}...")
                 
                 # Read original content
-                original_content = file_path.read_text(encoding='utf-8')
+                original_content = await current_read
                 
                 # Apply patterns first
                 pattern_content, pattern_result = self.pattern_formatter.apply(
@@ -61,23 +68,11 @@ class PatternValidator:
                     continue
                 
                 # Run pattern result through ALS
-                await self.client._notify("textDocument/didOpen", {
-                    "textDocument": {
-                        "uri": file_path.as_uri(),
-                        "languageId": "ada",
-                        "version": 1,
-                        "text": pattern_content,
-                    }
-                })
+                uri = file_path.as_uri()
+                await self.client.notify_did_open(uri, pattern_content)
                 
                 try:
-                    edits = await self.client.request_with_timeout({
-                        "method": "textDocument/formatting",
-                        "params": {
-                            "textDocument": {"uri": file_path.as_uri()},
-                            "options": {"tabSize": 3, "insertSpaces": True},
-                        }
-                    }, timeout=format_timeout)
+                    edits = await self.client.request_formatting(uri, timeout=format_timeout)
                     
                     if edits:
                         # ALS wants to make changes to pattern output
@@ -97,7 +92,7 @@ class PatternValidator:
                     error_count += 1
                 finally:
                     await self.client._notify("textDocument/didClose", {
-                        "textDocument": {"uri": file_path.as_uri()}
+                        "textDocument": {"uri": uri}
                     })
                     
             except Exception as e:
@@ -106,20 +101,19 @@ class PatternValidator:
                 error_count += 1
                 
         # Final summary (use log_line instead of footer which doesn't exist in PlainUI)
-        if ui:
-            ui.log_line(
-                f"[validate] Summary: Validated: {validated_count}/{total_files} | "
-                f"Errors: {error_count} | "
-                f"Patterns: {self.pattern_formatter.loaded_count}"
-            )
+        progress(
+            f"[validate] Summary: Validated: {validated_count}/{total_files} | "
+            f"Errors: {error_count} | "
+            f"Patterns: {self.pattern_formatter.loaded_count}"
+        )
             
         if error_count > 0:
-            ui.log_line(f"\n[validate] ❌ Validation failed with {error_count} errors:")
+            log(f"\n[validate] ❌ Validation failed with {error_count} errors:")
             for error in errors_encountered[:10]:  # Show first 10 errors
-                ui.log_line(f"  • {error}")
+                log(f"  • {error}")
             if len(errors_encountered) > 10:
-                ui.log_line(f"  ... and {len(errors_encountered) - 10} more errors")
+                log(f"  ... and {len(errors_encountered) - 10} more errors")
         else:
-            ui.log_line(f"\n[validate] ✅ All {validated_count} files validated successfully!")
+            log(f"\n[validate] ✅ All {validated_count} files validated successfully!")
             
         return error_count, errors_encountered
\ No newline at end of file
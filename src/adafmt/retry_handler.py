@@ -8,6 +8,7 @@
 """Retry handler for transient errors."""
 
 import asyncio
+import random
 from typing import TypeVar, Callable, Optional, Tuple
 from pathlib import Path
 
@@ -84,6 +85,10 @@ class RetryHandler:
     ) -> Tuple[T, int]:
         """Retry an async function with exponential backoff.
         
+        Delays use full jitter: each wait is drawn uniformly from zero to
+        the capped exponential delay, so concurrent retries spread out
+        instead of hitting a struggling resource in lockstep.
+        
         Args:
             func: Async function to retry
             *args: Positional arguments for func
@@ -113,11 +118,11 @@ class RetryHandler:
                 if not RetryHandler.is_transient_error(e) or attempt >= max_attempts:
                     raise
                 
-                # Calculate backoff
-                backoff = min(
+                # Calculate backoff (truncated exponential, full jitter)
+                backoff = random.uniform(0, min(
                     backoff_base * (2 ** (attempt - 1)),
                     backoff_max
-                )
+                ))
                 
                 # Notify retry callback
                 if on_retry:
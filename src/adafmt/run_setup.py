@@ -8,13 +8,13 @@
 """Run setup and initialization for the Ada formatter."""
 
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Sequence
 
-from .utils import run_hook, preflight
+from .utils import run_hook_async, preflight
 
 
-def execute_pre_hook(
-    pre_hook: Optional[str],
+async def execute_pre_hook(
+    pre_hook: Optional[Sequence[str]],
     hook_timeout: float,
     ui: Optional[Any] = None
 ) -> bool:
@@ -22,7 +22,7 @@ def execute_pre_hook(
     Execute pre-hook if provided.
     
     Args:
-        pre_hook: Command to run before formatting
+        pre_hook: Pre-parsed command (argument vector) to run before formatting
         hook_timeout: Timeout in seconds
         ui: UI instance for logging
         
@@ -30,17 +30,15 @@ def execute_pre_hook(
         True if hook succeeded or not provided, False if failed
     """
     if pre_hook:
-        ok = run_hook(
+        log = ui.log_line if ui else print
+        ok = await run_hook_async(
             pre_hook, "pre", 
-            logger=(ui.log_line if ui else print), 
+            logger=log, 
             timeout=hook_timeout, 
             dry_run=False
         )
         if not ok:
-            if ui:
-                ui.log_line("[error] pre-hook failed; aborting.")
-            else:
-                print("[error] pre-hook failed; aborting.")
+            log("[error] pre-hook failed; aborting.")
             return False
     return True
 
@@ -8,71 +8,83 @@
 """Stderr redirection and handling for the Ada formatter."""
 
 import contextlib
-import io
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Any, Tuple
 
-from .utils import to_iso8601_basic
+from .utils import open_log_file, to_iso8601_basic
 
 
-class Tee(io.TextIOBase):
-    """Redirect output to multiple streams."""
-    def __init__(self, *streams):
-        self._streams = [s for s in streams if s is not None]
-    
-    def write(self, s):
-        wrote = 0
-        for st in self._streams:
-            try:
-                wrote = st.write(s)
-                st.flush()
-            except Exception:
-                pass
-        return wrote
-    
-    def flush(self):
-        for st in self._streams:
-            try:
-                st.flush()
-            except Exception:
-                pass
+STDERR_BUFFER_SIZE = 64 * 1024
+"""Buffer size for sys.stderr while redirected; flushed explicitly, not per write."""
+
+STDERR_FD = 2
+
+# True while file descriptor 2 points at the stderr capture file
+_STDERR_REDIRECTED = False
+
+
+def stderr_redirected() -> bool:
+    """Return True while stderr is redirected to the capture file."""
+    return _STDERR_REDIRECTED
 
 
 def setup_stderr_redirect(stderr_path: Optional[Path]) -> Tuple[Any, Any, Any]:
     """
     Set up stderr redirection to a file.
     
+    The capture file is installed on file descriptor 2 itself, so Python
+    writes, native library output and inherited child stderr all go to the
+    file without a Python-level wrapper; nothing reaches the terminal.
+    
     Args:
         stderr_path: Path to redirect stderr to (or None to skip)
         
     Returns:
-        Tuple of (original_stderr, tee_fp, restore_function)
+        Tuple of (original_stderr, redirected_stderr, restore_function)
     """
+    global _STDERR_REDIRECTED
     orig_stderr = sys.stderr
-    tee_fp = None
+    saved_fd: Optional[int] = None
+    redirected = None
     
     def restore_stderr():
-        nonlocal tee_fp, orig_stderr
+        nonlocal saved_fd, redirected
+        global _STDERR_REDIRECTED
+        if redirected is not None:
+            with contextlib.suppress(Exception):
+                redirected.flush()
+        if saved_fd is not None:
+            with contextlib.suppress(Exception):
+                os.dup2(saved_fd, STDERR_FD)
+            with contextlib.suppress(Exception):
+                os.close(saved_fd)
+            saved_fd = None
+        _STDERR_REDIRECTED = False
         try:
             sys.stderr = orig_stderr
         except Exception:
             pass
-        if tee_fp:
+        if redirected is not None:
             with contextlib.suppress(Exception):
-                tee_fp.flush()
-                tee_fp.close()
-            tee_fp = None
+                redirected.close()
+            redirected = None
     
     try:
         if stderr_path:
-            stderr_path.parent.mkdir(parents=True, exist_ok=True)
-            tee_fp = open(stderr_path, "w", encoding="utf-8")
-            tee_fp.write(f"{to_iso8601_basic(datetime.now(timezone.utc))} | INFO  | ADAFMT STDERR START\n")
-            tee_fp.flush()
-            sys.stderr = Tee(tee_fp)  # Only write to file, not to terminal
+            with open_log_file(stderr_path) as capture:
+                capture.write(f"{to_iso8601_basic(datetime.now(timezone.utc))} | INFO  | ADAFMT STDERR START\n")
+                with contextlib.suppress(Exception):
+                    orig_stderr.flush()
+                saved_fd = os.dup(STDERR_FD)
+                os.dup2(capture.fileno(), STDERR_FD)
+            redirected = open(STDERR_FD, "w", encoding="utf-8", errors="backslashreplace",
+                              buffering=STDERR_BUFFER_SIZE, closefd=False)
+            sys.stderr = redirected
+            _STDERR_REDIRECTED = True
     except Exception:
-        sys.stderr = orig_stderr
+        restore_stderr()
         
-    return orig_stderr, tee_fp, restore_stderr
\ No newline at end of file
+    return orig_stderr, redirected, restore_stderr
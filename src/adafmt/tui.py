@@ -210,6 +210,8 @@ class PlainUI(BaseUI):
         """Initialize plain UI."""
         super().__init__()
         self._start_time = time.time()
+        # Status-line printer, imported from the CLI on first use only
+        self._print_status = None
     
     def log_line(self, msg: str) -> None:
         """Add a timestamped log message.
@@ -229,8 +231,10 @@ class PlainUI(BaseUI):
             # Special handling for file processing messages
             if msg.startswith("[") and ("/") in msg and ("] [") in msg:
                 # Use the CLI color function for consistent coloring
-                from .cli import _print_colored_line
-                _print_colored_line(msg)
+                if self._print_status is None:
+                    from .cli import _print_colored_line
+                    self._print_status = _print_colored_line
+                self._print_status(msg)
             else:
                 # Regular message, just print it
                 print(msg)
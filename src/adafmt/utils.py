@@ -19,8 +19,14 @@ safe, robust implementations of common tasks.
 
 from __future__ import annotations
 
+import contextlib
+import getpass
+import itertools
 import os
+import re
+import shlex
 import signal
+import stat
 import sys
 import tempfile
 import shutil
@@ -29,7 +35,7 @@ import time
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, Iterable, List, Optional, Sequence
 
 def ensure_abs(p: str, flag: str) -> str:
     """Ensure a path is absolute, raising an error if not.
@@ -86,20 +92,92 @@ def to_iso8601_basic(dt: datetime) -> str:
     # format: 20250920T220311Z
     return dt_utc.strftime("%Y%m%dT%H%M%SZ")
 
-def atomic_write(path: str, data: str) -> None:
+LOG_OPEN_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND
+                  | getattr(os, "O_CLOEXEC", 0))
+"""Flags for run log files: fresh file, every write lands at the end."""
+
+
+def open_log_file(path: Path, buffering: int = 1):
+    """Open a run log file for line-oriented writing.
+    
+    The file is truncated like ``open(path, "w")`` but opened with
+    ``O_APPEND``, so each record write is positioned at end-of-file by the
+    kernel and cannot interleave with another writer mid-line. The
+    descriptor is close-on-exec so hooks and the ALS subprocess do not
+    inherit it.
+    
+    Args:
+        path: Log file path; parent directories are created if needed
+        buffering: Buffering policy as for open(); 1 (the default) is
+                   line buffered, larger values defer writes until flush
+        
+    Returns:
+        Text file object (UTF-8)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), LOG_OPEN_FLAGS, 0o644)
+    return os.fdopen(fd, "w", encoding="utf-8", buffering=buffering)
+
+
+_run_sequence = itertools.count()
+
+
+def new_run_id(now: Optional[datetime] = None) -> str:
+    """Build a unique identifier for default run file names.
+    
+    Combines the ISO 8601 basic timestamp with the process id and a
+    per-process sequence number, so two invocations started in the same
+    second never share log files and repeated calls within one process
+    always differ. The id contains no underscores, keeping
+    ``adafmt_<run_id>_<kind>`` names splittable on ``_``.
+    
+    Args:
+        now: Timestamp to use (defaults to current UTC time)
+        
+    Returns:
+        Identifier such as ``20250920T220311Z-4242-0``
+    """
+    stamp = to_iso8601_basic(now or datetime.now(timezone.utc))
+    return f"{stamp}-{os.getpid()}-{next(_run_sequence)}"
+
+
+def read_source_text(path: Path, errors: str = "ignore") -> str:
+    """Read a UTF-8 source file with universal newlines.
+    
+    Decodes the raw bytes directly instead of going through a text
+    wrapper; line endings are normalized to ``\\n`` exactly as
+    ``read_text`` would, but only when the file contains a ``\\r``.
+    
+    Args:
+        path: File to read
+        errors: Decoding error handler, as for ``bytes.decode``
+        
+    Returns:
+        File content with ``\\r\\n`` and lone ``\\r`` replaced by ``\\n``
+    """
+    text = path.read_bytes().decode("utf-8", errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def atomic_write(path: str, data: str, fsync: bool = False) -> None:
     """Write data to a file atomically.
 
     This function ensures that the file is either completely written
     or not modified at all, preventing partial writes or corruption.
 
     The atomic write process:
-    1. Create parent directories if needed
-    2. Write data to a temporary file in the same directory
+    1. Write data to a temporary file in the same directory
+       (creating parent directories only if they are missing)
+    2. Give the temporary file the permissions of the file it replaces
     3. Atomically rename the temp file to the target path
 
     Args:
         path: Target file path
         data: String data to write
+        fsync: Flush the data and the directory entry to stable storage
+            before returning (see also fsync_paths for batching)
 
     Note:
         - The temporary file is created in the same directory as the target
@@ -112,11 +190,65 @@ def atomic_write(path: str, data: str) -> None:
         # File is written atomically, no partial content possible
     """
     target = Path(path)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=str(target.parent)) as tmp:
-        tmp.write(data)
-        tmp_path = Path(tmp.name)
-    tmp_path.replace(target)  # Atomic rename on same filesystem
+    try:
+        tmp = tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=str(target.parent))
+    except FileNotFoundError:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=str(target.parent))
+    tmp_path = Path(tmp.name)
+    try:
+        with tmp:
+            # Temporary files are private (0600); keep the original mode
+            with contextlib.suppress(FileNotFoundError):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(target).st_mode))
+            tmp.write(data)
+            if fsync:
+                tmp.flush()
+                os.fsync(tmp.fileno())
+        tmp_path.replace(target)  # Atomic rename on same filesystem
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink()
+        raise
+    if fsync:
+        _fsync_dir(target.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush a directory entry to stable storage (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        with contextlib.suppress(OSError):
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_paths(paths: Iterable[Path]) -> None:
+    """Flush already written files, then each of their directories once.
+
+    Used to make a batch of atomic_write() calls durable together: the
+    kernel can write back all files at once instead of waiting on each.
+
+    Args:
+        paths: Files to flush (missing files are skipped)
+    """
+    directories = set()
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        directories.add(Path(path).parent)
+    for directory in directories:
+        _fsync_dir(directory)
 
 def list_als_pids() -> List[int]:
     """List process IDs of running Ada Language Server instances.
@@ -169,7 +301,6 @@ class ProcessInfo:
 
 def _current_username() -> str:
     try:
-        import getpass
         return getpass.getuser()
     except Exception:
         return ""
@@ -302,28 +433,41 @@ def kill_als_processes(mode: str = "safe", stale_minutes: int = 30, logger=None,
                         logger(f"[preflight] Failed to kill {proc.pid}: {e}")
     return killed
 
-def _iter_lock_dirs(search_paths: List[Path]):
+def _scan_lock_root(root: Path) -> List[Path]:
+    """Find .als-lock directories and .als-alire files under one root in a single walk."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # os.walk never descends into symlinks; matches are checked by target type
+        for name, entries, is_kind in ((".als-lock", dirnames, Path.is_dir),
+                                       (".als-alire", filenames, Path.is_file)):
+            if name in entries:
+                p = Path(dirpath, name)
+                try:
+                    p = p.resolve()
+                except Exception:
+                    pass
+                if is_kind(p):
+                    found.append(p)
+    return found
+
+def _iter_lock_dirs(search_paths: List[Path], parallelism: Optional[int] = None):
+    """Yield ALS lock paths under the search paths, each once.
+    
+    Several roots are walked at the same time on up to ``parallelism``
+    threads (default: CPU count); results keep the search path order.
+    """
+    roots = [Path(root) for root in (search_paths or [Path.cwd()])]
+    workers = min(len(roots), parallelism or os.cpu_count() or 1)
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_lock_root, roots))
+    else:
+        results = map(_scan_lock_root, roots)
     seen = set()
-    for root in (search_paths or [Path.cwd()]):
-        root = Path(root)
-        if not root.exists():
-            continue
-        # Look for .als-lock directories
-        for p in root.rglob(".als-lock"):
-            try:
-                p = p.resolve()
-            except Exception:
-                p = Path(p)
-            if p.is_dir() and str(p) not in seen:
-                seen.add(str(p))
-                yield p
-        # Also look for .als-alire lock files (created by ALS)
-        for p in root.rglob(".als-alire"):
-            try:
-                p = p.resolve()
-            except Exception:
-                p = Path(p)
-            if p.is_file() and str(p) not in seen:
+    for found in results:
+        for p in found:
+            if str(p) not in seen:
                 seen.add(str(p))
                 yield p
 
@@ -341,10 +485,11 @@ def _pid_alive(pid: int) -> bool:
     except Exception:
         return False
 
-def find_stale_locks(search_paths: List[Path], ttl_minutes: int = 10) -> List[Path]:
+def find_stale_locks(search_paths: List[Path], ttl_minutes: int = 10,
+                     parallelism: Optional[int] = None) -> List[Path]:
     now = time.time()
     stale = []
-    for lock_path in _iter_lock_dirs(search_paths):
+    for lock_path in _iter_lock_dirs(search_paths, parallelism):
         try:
             age_min = (now - lock_path.stat().st_mtime) / 60.0
         except Exception:
@@ -367,9 +512,10 @@ def find_stale_locks(search_paths: List[Path], ttl_minutes: int = 10) -> List[Pa
             stale.append(lock_path)
     return stale
 
-def clean_stale_locks(search_paths: List[Path], ttl_minutes: int = 10, logger=None, dry_run: bool=False) -> int:
+def clean_stale_locks(search_paths: List[Path], ttl_minutes: int = 10, logger=None, dry_run: bool=False,
+                      parallelism: Optional[int] = None) -> int:
     removed = 0
-    for lock_path in find_stale_locks(search_paths, ttl_minutes=ttl_minutes):
+    for lock_path in find_stale_locks(search_paths, ttl_minutes=ttl_minutes, parallelism=parallelism):
         if logger:
             logger(f"[preflight] Removing stale lock: {lock_path}" + (" [dry-run]" if dry_run else ""))
         if not dry_run:
@@ -385,12 +531,40 @@ def clean_stale_locks(search_paths: List[Path], ttl_minutes: int = 10, logger=No
     return removed
 
 
+def parse_hook_command(hook_cmd: Optional[str]) -> Optional[List[str]]:
+    """Split a hook command line into an argument vector.
+    
+    Args:
+        hook_cmd: Command line as typed by the user, or None
+        
+    Returns:
+        Argument list, or None if no hook (or an empty one) was given
+        
+    Raises:
+        ValueError: If the command has unbalanced quotes or escapes
+    """
+    if not hook_cmd:
+        return None
+    return shlex.split(hook_cmd) or None
+
+
+def _log_hook_output(phase: str, stdout: str, stderr: str, logger) -> None:
+    """Forward captured hook output to the logger, one line at a time."""
+    if not logger:
+        return
+    if stdout:
+        for line in stdout.strip().splitlines():
+            logger(f"[{phase}-hook] {line}")
+    if stderr:
+        for line in stderr.strip().splitlines():
+            logger(f"[{phase}-hook] [stderr] {line}")
+
+
 def run_hook(hook_cmd: Optional[str], phase: str, logger=None, timeout: int=60, dry_run: bool=False) -> bool:
     if not hook_cmd:
         return True
 
     # Parse command safely without shell
-    import shlex
     try:
         cmd_list = shlex.split(hook_cmd)
     except ValueError as e:
@@ -406,12 +580,7 @@ def run_hook(hook_cmd: Optional[str], phase: str, logger=None, timeout: int=60,
     try:
         # Execute without shell for security
         result = subprocess.run(cmd_list, capture_output=True, text=True, timeout=timeout, check=False)
-        if result.stdout and logger:
-            for line in result.stdout.strip().splitlines():
-                logger(f"[{phase}-hook] {line}")
-        if result.stderr and logger:
-            for line in result.stderr.strip().splitlines():
-                logger(f"[{phase}-hook] [stderr] {line}")
+        _log_hook_output(phase, result.stdout, result.stderr, logger)
         if result.returncode != 0:
             if logger:
                 logger(f"[{phase}-hook] exited with code {result.returncode}")
@@ -426,6 +595,54 @@ def run_hook(hook_cmd: Optional[str], phase: str, logger=None, timeout: int=60,
             logger(f"[{phase}-hook] error: {e}")
         return False
 
+async def run_hook_async(hook_argv: Optional[Sequence[str]], phase: str, logger=None,
+                         timeout: float = 60, dry_run: bool = False) -> bool:
+    """Run a pre-parsed hook command without blocking the event loop.
+    
+    The asyncio counterpart of :func:`run_hook`. The command is executed
+    directly (no shell) and both output pipes are drained by a single
+    ``communicate()`` call bounded by ``timeout``.
+    
+    Args:
+        hook_argv: Argument vector from :func:`parse_hook_command`, or None
+        phase: Hook phase used as the log prefix ("pre" or "post")
+        logger: Callable receiving log lines (optional)
+        timeout: Maximum seconds to wait for the hook
+        dry_run: Log the command without running it
+        
+    Returns:
+        True if there is no hook or it exited with code 0, False otherwise
+    """
+    if not hook_argv:
+        return True
+
+    if logger:
+        logger(f"[{phase}-hook] {' '.join(hook_argv)}" + (" [dry-run]" if dry_run else ""))
+    if dry_run:
+        return True
+    import asyncio
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *hook_argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except Exception as e:
+        if logger:
+            logger(f"[{phase}-hook] error: {e}")
+        return False
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        if logger:
+            logger(f"[{phase}-hook] timeout after {timeout}s")
+        return False
+    _log_hook_output(phase, out.decode(errors="replace"), err.decode(errors="replace"), logger)
+    if proc.returncode != 0:
+        if logger:
+            logger(f"[{phase}-hook] exited with code {proc.returncode}")
+        return False
+    return True
+
 def preflight(
     mode: str = "safe",
     als_stale_minutes: int = 30,
@@ -433,18 +650,26 @@ def preflight(
     search_paths: Optional[List[Path]] = None,
     logger=None,
     dry_run: bool=False,
+    parallelism: Optional[int] = None,
 ) -> int:
     """Preflight environment for formatting.
        Returns 0 on success, non-zero to abort.
+       Search paths are scanned for locks on up to ``parallelism`` threads
+       while the process table is read.
     """
     mp = (mode or "").lower()
     if mp in ("off", "none"):
         return 0
 
+    search_paths = search_paths or [Path.cwd()]
 
-    # Report counts
-    als_pids = list(_als_processes(only_user=True))
-    locks = list(find_stale_locks(search_paths or [Path.cwd()], ttl_minutes=lock_ttl_minutes))
+    # Report counts; the lock walk overlaps the process table scan
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        lock_scan = pool.submit(find_stale_locks, search_paths,
+                                ttl_minutes=lock_ttl_minutes, parallelism=parallelism)
+        als_pids = list(_als_processes(only_user=True))
+        locks = list(lock_scan.result())
     if logger:
         logger(f"[preflight] ALS processes (user): {len(als_pids)}; stale locks: {len(locks)}")
 
@@ -467,7 +692,9 @@ def preflight(
 
     # Clean locks if requested
     if mp in ("kill+clean", "aggressive"):
-        removed = clean_stale_locks(search_paths or [Path.cwd()], ttl_minutes=lock_ttl_minutes, logger=logger, dry_run=dry_run)
+        # Rescan: locks held by processes killed above are stale now
+        removed = clean_stale_locks(search_paths, ttl_minutes=lock_ttl_minutes, logger=logger,
+                                    dry_run=dry_run, parallelism=parallelism)
         if logger and removed:
             logger(f"[preflight] Removed {removed} stale ALS locks")
 
@@ -476,6 +703,10 @@ def preflight(
 
 # --- New function for traces config parsing ---
 
+# Output line of an ALS traces config, e.g. ">/tmp/als.log:buffer_size=0"
+_TRACES_LINE_RE = re.compile(r'^\s*>\s*((?:[A-Za-z]:)?[^:]*?)(?::.*)?\s*')
+
+
 def extract_log_path_from_traces_cfg(cfg_path: str) -> Optional[str]:
     """Extract the log file path from a GNATCOLL traces config file.
 
@@ -492,10 +723,6 @@ def extract_log_path_from_traces_cfg(cfg_path: str) -> Optional[str]:
         >/tmp/als.log:buffer_size=0
         >als.log:buffer_size=0
     """
-    import re
-
-    traces_line_pattern = re.compile(r'^\s*>\s*((?:[A-Za-z]:)?[^:]*?)(?::.*)?\s*')
-
     try:
         p = Path(cfg_path).expanduser().resolve()
         if not p.exists():
@@ -506,7 +733,7 @@ def extract_log_path_from_traces_cfg(cfg_path: str) -> Optional[str]:
                 if not line.lstrip().startswith('>'):
                     continue
 
-                m = traces_line_pattern.match(line)
+                m = _TRACES_LINE_RE.match(line)
                 if not m:
                     continue
 
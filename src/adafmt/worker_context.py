@@ -25,6 +25,7 @@ class WorkItem:
     index: int
     total: int
     queue_time: float  # Time when queued (for wait time tracking)
+    apply_patterns: bool = True  # False when the text exceeds the patterns size limit
 
 
 @dataclass
@@ -287,7 +287,8 @@ class WorkerPool:
             patterns_applied = 0
             total_replacements = 0
             
-            if self.context.pattern_formatter and self.context.pattern_formatter.enabled:
+            if (item.apply_patterns and self.context.pattern_formatter
+                    and self.context.pattern_formatter.enabled):
                 pattern_start = time.time()
                 
                 formatted_content, result = self.context.pattern_formatter.apply(
@@ -33,6 +33,7 @@ import shutil
 import subprocess
 
 from adafmt.cli import run_formatter
+from adafmt.config import FormatConfig
 from adafmt.utils import kill_als_processes
 
 
@@ -49,7 +50,7 @@ async def run_formatter_with_defaults(**kwargs):
         'using_default_patterns': False
     }
     defaults.update(kwargs)
-    return await run_formatter(**defaults)
+    return await run_formatter(FormatConfig(**defaults))
 
 
 @pytest.mark.integration
@@ -19,7 +19,9 @@ the adafmt formatter. Tests cover:
 
 These utilities ensure safe, reliable operation of the formatter in various environments.
 """
+import os
 import signal
+from datetime import datetime, timezone
 from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
@@ -27,10 +29,14 @@ from unittest.mock import patch, MagicMock
 from adafmt.utils import (
     ensure_abs,
     atomic_write,
+    fsync_paths,
     list_als_pids,
     preflight,
     kill_als_processes,
     find_stale_locks,
+    new_run_id,
+    open_log_file,
+    read_source_text,
     ProcessInfo
 )
 
@@ -180,6 +186,131 @@ class TestAtomicWrite:
             assert target.read_text() == "original"
 
 
+    def test_preserves_existing_mode(self, tmp_path):
+        """Test replacing a file keeps its permission bits.
+        
+        Given: An existing file with mode 0644
+        When: atomic_write replaces it
+        Then: The new file still has mode 0644 and no temp file remains
+        """
+        target = tmp_path / "mode.adb"
+        target.write_text("old")
+        target.chmod(0o644)
+        
+        atomic_write(str(target), "new")
+        
+        assert target.stat().st_mode & 0o777 == 0o644
+        assert [p.name for p in tmp_path.iterdir()] == ["mode.adb"]
+    
+    def test_temp_file_removed_when_rename_fails(self, tmp_path):
+        """Test a failed rename leaves neither target changes nor temp files.
+        
+        Given: An existing file and a rename that fails
+        When: atomic_write is called
+        Then: The error propagates, the file is unchanged and no temp file remains
+        """
+        target = tmp_path / "keep.adb"
+        target.write_text("original")
+        
+        with patch.object(Path, "replace", side_effect=OSError("busy")):
+            with pytest.raises(OSError):
+                atomic_write(str(target), "new content")
+        
+        assert target.read_text() == "original"
+        assert [p.name for p in tmp_path.iterdir()] == ["keep.adb"]
+    
+    def test_fsync_options(self, tmp_path):
+        """Test per-file and batched durability flush data and directories.
+        
+        Given: Two files written with and without the fsync flag
+        When: atomic_write(fsync=True) and fsync_paths are used
+        Then: os.fsync is called for the file data and the directory
+        """
+        first, second = tmp_path / "a.adb", tmp_path / "b.adb"
+        with patch("adafmt.utils.os.fsync") as fsync:
+            atomic_write(str(first), "a", fsync=True)
+            assert fsync.call_count == 2  # temp file + directory
+            
+            fsync.reset_mock()
+            atomic_write(str(second), "b")
+            assert fsync.call_count == 0
+            fsync_paths([first, second, tmp_path / "missing.adb"])
+            assert fsync.call_count == 3  # two files + one shared directory
+
+
+class TestReadSourceText:
+    """Test suite for the read_source_text function."""
+    
+    def test_matches_read_text_newline_handling(self, tmp_path):
+        """Test line endings are normalized like Path.read_text.
+        
+        Given: A file mixing CRLF, lone CR and LF line endings
+        When: read_source_text is called
+        Then: The result equals read_text with universal newlines
+        """
+        source = tmp_path / "mixed.adb"
+        source.write_bytes(b"a\r\nb\rc\nd\r\n")
+        
+        assert read_source_text(source) == "a\nb\nc\nd\n"
+        assert read_source_text(source) == source.read_text(encoding="utf-8")
+    
+    def test_error_handler(self, tmp_path):
+        """Test invalid UTF-8 is dropped by default and raises when strict.
+        
+        Given: A file containing an invalid UTF-8 byte
+        When: read_source_text is called with default and strict errors
+        Then: The byte is ignored by default and strict decoding raises
+        """
+        source = tmp_path / "bad.adb"
+        source.write_bytes(b"x\xffy\n")
+        
+        assert read_source_text(source) == "xy\n"
+        with pytest.raises(UnicodeDecodeError):
+            read_source_text(source, "strict")
+
+
+class TestRunLogFiles:
+    """Test suite for run log file naming and opening.
+    
+    Tests the unique run id used for default log names and the
+    append-mode opener used for JSONL and stderr logs.
+    """
+    
+    def test_run_ids_are_unique_and_splittable(self):
+        """Test run ids differ between calls and contain no underscores.
+        
+        Given: Two run ids generated back to back for the same timestamp
+        When: They are compared and embedded in a default log name
+        Then: They differ only in the sequence number, and the name splits
+              back to the run id on '_'
+        """
+        now = datetime(2025, 9, 20, 22, 3, 11, tzinfo=timezone.utc)
+        first, second = new_run_id(now), new_run_id(now)
+        
+        stamp, pid, seq = first.split("-")
+        assert (stamp, pid) == ("20250920T220311Z", str(os.getpid()))
+        assert second == f"{stamp}-{pid}-{int(seq) + 1}"
+        assert "_" not in first
+        assert f"adafmt_{first}_log.jsonl".split("_")[1] == first
+    
+    def test_open_log_file_truncates_and_appends(self, tmp_path):
+        """Test open_log_file starts a fresh file that is written in order.
+        
+        Given: An existing log file with stale content in a missing directory tree
+        When: open_log_file is used to write two lines
+        Then: Only the new lines remain, in write order
+        """
+        target = tmp_path / "logs" / "run.log"
+        target.parent.mkdir()
+        target.write_text("stale\n")
+        
+        with open_log_file(target) as fp:
+            fp.write("one\n")
+            fp.write("two\n")
+        
+        assert target.read_text(encoding="utf-8") == "one\ntwo\n"
+
+
 class TestListAlsPids:
     """Test suite for the list_als_pids function.
     
@@ -501,4 +632,27 @@ class TestFindStaleLocks:
         result = find_stale_locks([Path("/tmp")], ttl_minutes=10)
         
         assert len(result) == 1
-        assert result[0] == lock1
\ No newline at end of file
+        assert result[0] == lock1
+
+    @pytest.mark.parametrize("parallelism", [1, 4])
+    def test_lock_scan_across_roots(self, tmp_path, parallelism):
+        """Test one walk per root finds both lock kinds without duplicates.
+        
+        Given: Two search roots, one nested inside the other, holding a lock
+               directory, a lock file and decoys of the wrong type
+        When: find_stale_locks scans them sequentially or in parallel
+        Then: Each real lock is reported once, in search path order
+        """
+        (tmp_path / "a" / ".als-lock").mkdir(parents=True)
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / ".als-alire").write_text("")
+        (tmp_path / "b" / ".als-lock").write_text("")  # Not a directory
+        (tmp_path / "c" / ".als-alire").mkdir(parents=True)  # Not a file
+        
+        result = find_stale_locks([tmp_path / "b", tmp_path], ttl_minutes=0,
+                                  parallelism=parallelism)
+        
+        assert result == [
+            (tmp_path / "b" / ".als-alire").resolve(),
+            (tmp_path / "a" / ".als-lock").resolve(),
+        ]
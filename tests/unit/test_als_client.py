@@ -27,7 +27,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import os
 import pytest
 
-from adafmt.als_client import ALSClient, ALSProtocolError, build_als_command, _has_cmd, _timestamp
+from adafmt.als_initializer import initialize_als_client
+from adafmt.metrics import MetricsCollector
+from adafmt.als_client import ALSClient, ALSCommunicationError, ALSProtocolError, build_als_command, _has_cmd, _timestamp
 
 
 class TestUtilityFunctions:
@@ -381,6 +383,156 @@ class TestALSClient:
                 timeout=0.001
             )
     
+    @pytest.mark.asyncio
+    async def test_request_timeout_covers_write_and_cancels(self, client):
+        """Test a hung write counts against the request timeout.
+        
+        Given: An ALS whose stdin never drains
+        When: request_with_timeout is called with a short timeout
+        Then: TimeoutError is raised promptly and $/cancelRequest is sent
+        """
+        async def hang(msg):
+            await asyncio.sleep(60)
+        client._write = AsyncMock(side_effect=hang)
+        client._notify = AsyncMock()
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                client.request_with_timeout({"method": "test", "params": {}}, timeout=0.01),
+                timeout=2)
+        
+        method, params = client._notify.await_args.args
+        assert method == "$/cancelRequest"
+        assert params == {"id": str(client._id)}
+        assert client._pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_request_fails_fast_when_reader_stopped(self, client):
+        """Test requests fail immediately once the response reader has ended.
+        
+        Given: A client whose reader task has finished (ALS exited)
+        When: request_with_timeout is called with a long timeout
+        Then: ALSCommunicationError is raised without sending anything
+        """
+        client._reader_task = asyncio.get_running_loop().create_future()
+        client._reader_task.set_result(None)
+        client._send = AsyncMock()
+        
+        with pytest.raises(ALSCommunicationError):
+            await client.request_with_timeout({"method": "test", "params": {}}, timeout=60)
+        
+        client._send.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_notify_did_open_matches_generic_notification(self, client):
+        """Test didOpen is framed by the generic message writer.
+        
+        Given: A document with quotes, newlines and non-ASCII text
+        When: notify_did_open writes it to ALS stdin
+        Then: One write carries an exact header and the expected message body
+        """
+        mock_stdin = MagicMock()
+        mock_stdin.drain = AsyncMock()
+        client.process = MagicMock()
+        client.process.stdin = mock_stdin
+        text = 'Put_Line ("héllo");\n-- "quoted"\n'
+        
+        await client.notify_did_open("file:///src/a%20b.adb", text)
+        
+        header, body = mock_stdin.write.call_args.args[0].split(b"\r\n\r\n", 1)
+        header += b"\r\n\r\n"
+        assert header == f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+        assert json.loads(body) == {
+            "jsonrpc": "2.0", "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": "file:///src/a%20b.adb", "languageId": "ada",
+                                        "version": 1, "text": text}}}
+    
+    @pytest.mark.asyncio
+    async def test_request_reply_during_write_is_not_lost(self, client):
+        """Test a reply that arrives before the write finishes is delivered.
+        
+        Given: An ALS that answers while the request is still being written
+        When: request_with_timeout is called
+        Then: The result is returned and no pending entry is left behind
+        """
+        async def write_and_reply(msg):
+            # Simulate the reader loop resolving the request mid-drain
+            client._pending.pop(msg["id"]).set_result({"ok": True})
+        client._write = AsyncMock(side_effect=write_and_reply)
+        
+        result = await client.request_with_timeout({"method": "test", "params": {}}, timeout=1)
+        
+        assert result == {"ok": True}
+        assert client._pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_request_formatting_builds_standard_request(self, client):
+        """Test formatting requests share one options object.
+        
+        Given: A client whose transport is mocked
+        When: request_formatting is called for two documents
+        Then: Each request targets its URI and reuses FORMATTING_OPTIONS
+        """
+        from adafmt.als_client import FORMATTING_OPTIONS
+        client.request_with_timeout = AsyncMock(return_value=[])
+        
+        await client.request_formatting("file:///a.adb", timeout=5)
+        await client.request_formatting("file:///b.adb", timeout=5)
+        
+        first, second = (c.args[0] for c in client.request_with_timeout.await_args_list)
+        assert first["method"] == "textDocument/formatting"
+        assert first["params"]["textDocument"] == {"uri": "file:///a.adb"}
+        assert second["params"]["textDocument"] == {"uri": "file:///b.adb"}
+        assert first["params"]["options"] is second["params"]["options"] is FORMATTING_OPTIONS
+    
+    @pytest.mark.asyncio
+    async def test_wait_ready_returns_on_first_probe_reply(self, client):
+        """Test readiness is reported as soon as the probe is answered.
+        
+        Given: An ALS that answers the formatting probe immediately
+        When: wait_ready is awaited
+        Then: It returns after one probe and closes the probe document
+        """
+        sent = []
+        async def write_and_reply(msg):
+            sent.append(msg.get("method"))
+            if "id" in msg:
+                client._pending.pop(msg["id"]).set_result([])
+        client._write = AsyncMock(side_effect=write_and_reply)
+        client.notify_did_open = AsyncMock()
+        
+        await asyncio.wait_for(client.wait_ready(), timeout=1)
+        
+        assert sent == ["textDocument/formatting", "textDocument/didClose"]
+        assert client._ready.is_set()
+    
+    @pytest.mark.asyncio
+    async def test_wait_ready_returns_on_project_loaded_message(self, client):
+        """Test a project-loaded log message ends the wait without a reply.
+        
+        Given: An ALS that never answers the probe
+        When: The reader loop receives a "Project loaded" window/logMessage
+        Then: wait_ready returns without waiting for the probe timeout
+        """
+        client._write = AsyncMock()
+        client.notify_did_open = AsyncMock()
+        message = json.dumps({"jsonrpc": "2.0", "method": "window/logMessage",
+                              "params": {"type": 3, "message": "Project loaded"}})
+        mock_stdout = AsyncMock()
+        mock_stdout.readline.side_effect = [
+            f"Content-Length: {len(message)}\r\n".encode(), b"\r\n", b""
+        ]
+        mock_stdout.readexactly.return_value = message.encode()
+        client.process = MagicMock()
+        client.process.stdout = mock_stdout
+        
+        waiter = asyncio.create_task(client.wait_ready(probe_timeout=30))
+        await asyncio.sleep(0)
+        await client._reader_loop()
+        
+        await asyncio.wait_for(waiter, timeout=1)
+        assert client._pending == {}
+    
     def test_summary_with_metrics(self, client):
         """Test summary generation with complete execution metrics.
         
@@ -544,4 +696,55 @@ class TestALSClient:
         await client.restart()
         
         client.shutdown.assert_called_once()
-        client.start.assert_called_once()
\ No newline at end of file
+        client.start.assert_called_once()
+    
+    def test_supports_formatting_from_capabilities(self, client):
+        """Test formatting support is read from the server capabilities.
+        
+        Given: A client with unknown, formatting and non-formatting capabilities
+        When: supports_formatting is read
+        Then: Only capabilities lacking documentFormattingProvider report False
+        """
+        assert client.supports_formatting  # nothing reported yet
+        client.server_capabilities = {"documentFormattingProvider": True}
+        assert client.supports_formatting
+        client.server_capabilities = {"hoverProvider": True}
+        assert not client.supports_formatting
+        client.server_capabilities = {"documentFormattingProvider": False}
+        assert not client.supports_formatting
+    
+    def test_supports_formatting_with_options_object(self, client):
+        """Test a DocumentFormattingOptions object counts as support.
+        
+        Given: Capabilities giving documentFormattingProvider as an options object
+        When: supports_formatting is read
+        Then: Both an empty and a populated object report True
+        """
+        client.server_capabilities = {"documentFormattingProvider": {}}
+        assert client.supports_formatting
+        client.server_capabilities = {"documentFormattingProvider": {"workDoneProgress": True}}
+        assert client.supports_formatting
+    
+    @pytest.mark.asyncio
+    async def test_initializer_rejects_server_without_formatting(self, tmp_path):
+        """Test startup stops when ALS cannot format documents.
+        
+        Given: An ALS that starts but does not advertise formatting
+        When: initialize_als_client runs
+        Then: The client is shut down and SystemExit(1) is raised before any probe
+        """
+        fake = MagicMock()
+        fake.start = AsyncMock()
+        fake.shutdown = AsyncMock()
+        fake.wait_ready = AsyncMock()
+        fake.supports_formatting = False
+        
+        with patch('adafmt.als_initializer.ALSClient', return_value=fake):
+            with pytest.raises(SystemExit) as exc:
+                await initialize_als_client(
+                    tmp_path / "p.gpr", False, None, 5, 5, MetricsCollector(str(tmp_path / "m.jsonl")),
+                    ui=None)
+        
+        assert exc.value.code == 1
+        fake.shutdown.assert_awaited_once()
+        fake.wait_ready.assert_not_called()
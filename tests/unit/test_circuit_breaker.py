@@ -0,0 +1,95 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the ALS circuit breaker."""
+
+from adafmt.circuit_breaker import CLOSED, HALF_OPEN, OPEN, PROBE_POLL_SECONDS, CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced clock for breaker timing."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the breaker and block calls."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_success_resets_failure_count(self):
+        """Test a success between failures keeps the breaker closed."""
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_probes_close_breaker(self):
+        """Test the breaker admits limited probes after cooldown and closes on success."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, half_open_probes=2, clock=clock)
+        breaker.record_failure()
+        clock.now += 9.9
+        assert not breaker.allow()
+
+        clock.now += 0.2
+        assert breaker.allow() and breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # probe budget used up
+
+        breaker.record_success()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_half_open_failure_reopens(self):
+        """Test a failed probe reopens the breaker and restarts the cooldown."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=5, open_seconds=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+        clock.now += 10
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.opened_at == clock.now
+        assert not breaker.allow()
+
+    def test_zero_threshold_never_opens(self):
+        """Test failure_threshold=0 disables the breaker."""
+        breaker = CircuitBreaker(failure_threshold=0, clock=FakeClock())
+        for _ in range(100):
+            breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+
+    def test_retry_after_reports_remaining_cooldown(self):
+        """Test retry_after counts down the open period and polls while half-open."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, half_open_probes=1, clock=clock)
+        assert breaker.retry_after() == 0.0
+        breaker.record_failure()
+        clock.now += 4
+        assert breaker.retry_after() == 6
+        clock.now += 6
+        assert breaker.allow()
+        assert not breaker.allow()
+        assert breaker.retry_after() == PROBE_POLL_SECONDS
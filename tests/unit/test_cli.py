@@ -10,7 +10,7 @@
 This module contains comprehensive unit tests for the command-line interface
 implementation of adafmt. Tests cover:
 
-- Stderr capture and redirection (Tee functionality)
+- Stderr capture and redirection
 - Error message formatting and output
 - Path validation and normalization
 - UI mode selection and initialization
@@ -20,78 +20,86 @@ implementation of adafmt. Tests cover:
 All tests use mocks to avoid side effects and ensure isolated testing.
 """
 
-import io
+import asyncio
+import os
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 
 from adafmt import cli
 from adafmt.file_discovery_new import is_ada_file
-from adafmt.stderr_handler import Tee
+from adafmt.stderr_handler import setup_stderr_redirect, stderr_redirected
 from adafmt import cleanup_handler
 from adafmt.error_writer import write_stderr_error
+from adafmt.utils import to_iso8601_basic
 from adafmt.cli_helpers import abs_path
+from adafmt import argument_validator
+from adafmt.argument_validator import ArgumentValidator
 
 
-class TestTeeClass:
-    """Test suite for the Tee class used for stderr capture.
+class TestStderrRedirect:
+    """Test suite for stderr capture via file descriptor redirection.
     
-    Tests the Tee implementation that allows capturing stderr output
-    to a file while optionally echoing to the terminal. This is used
-    to capture compiler and ALS error messages for display in the UI.
+    Tests that stderr output, from Python and from the raw descriptor, is
+    captured in the stderr file and never reaches the terminal, and that the
+    original descriptor is restored afterwards.
     """
     
-    def test_tee_writes_to_single_stream(self):
-        """Test _Tee writes to file stream without terminal echo.
+    def test_redirect_captures_fd_and_restores(self, tmp_path):
+        """Test stderr file descriptor 2 is redirected and restored.
         
-        Given: A file stream for capturing output
-        When: Data is written through the Tee
-        Then: Data appears only in the file stream (GPT-5 fix: no terminal echo)
+        Given: A stderr capture path
+        When: Output is written via sys.stderr and directly to fd 2
+        Then: Both land in the file and fd 2 is restored on restore_stderr()
         """
-        # Create test streams
-        file_stream = io.StringIO()
-        
-        # Create tee with single stream (GPT-5 fix behavior)
-        tee = Tee(file_stream)
+        capture = tmp_path / "stderr.log"
+        before = os.fstat(2)
         
-        # Write test data
-        test_data = "Test stderr output\n"
-        written = tee.write(test_data)
+        orig, redirected, restore = setup_stderr_redirect(capture)
+        try:
+            assert stderr_redirected()
+            assert sys.stderr is redirected
+            print("python line", file=sys.stderr)
+            sys.stderr.flush()
+            os.write(2, b"raw line\n")
+        finally:
+            restore()
         
-        # Verify stream received the data
-        assert file_stream.getvalue() == test_data
-        assert written == len(test_data)
+        assert not stderr_redirected()
+        assert sys.stderr is orig
+        after = os.fstat(2)
+        assert (after.st_dev, after.st_ino) == (before.st_dev, before.st_ino)
+        lines = capture.read_text().splitlines()
+        assert lines[0].endswith("ADAFMT STDERR START")
+        assert lines[1:] == ["python line", "raw line"]
     
-    def test_tee_flush(self):
-        """Test _Tee flush method compatibility.
+    def test_restore_is_idempotent(self, tmp_path):
+        """Test restore_stderr can run twice (normal exit and atexit cleanup).
         
-        Given: A Tee instance with a file stream
-        When: flush() is called
-        Then: Method executes without error (required for stderr compatibility)
+        Given: An active stderr redirect
+        When: restore_stderr() is called twice
+        Then: The second call is a no-op
         """
-        file_stream = io.StringIO()
-        tee = Tee(file_stream)
-        
-        # Should not raise
-        tee.flush()
+        _orig, _redirected, restore = setup_stderr_redirect(tmp_path / "stderr.log")
+        restore()
+        restore()
+        assert not stderr_redirected()
     
-    def test_tee_with_real_stderr(self):
-        """Test _Tee can replace sys.stderr for error capture.
+    def test_no_path_leaves_stderr_alone(self):
+        """Test a missing stderr path skips redirection.
         
-        Given: A Tee instance with capture stream
-        When: Assigned to sys.stderr and used for printing
-        Then: Output is captured in the stream while maintaining stderr interface
+        Given: No stderr path
+        When: setup_stderr_redirect is called
+        Then: sys.stderr is unchanged and nothing is reported as redirected
         """
-        original_stderr = sys.stderr
-        file_stream = io.StringIO()
-        
-        try:
-            sys.stderr = Tee(file_stream)
-            print("Test message", file=sys.stderr)
-            assert "Test message\n" in file_stream.getvalue()
-        finally:
-            sys.stderr = original_stderr
+        orig, redirected, restore = setup_stderr_redirect(None)
+        assert redirected is None
+        assert sys.stderr is orig
+        assert not stderr_redirected()
+        restore()
 
 
 class TestErrorWriting:
@@ -111,14 +119,14 @@ class TestErrorWriting:
         Then: Outputs formatted error with all components and separator
         """
         mock_stderr.write = MagicMock()
-        mock_stderr._streams = [mock_stderr]  # Mock the Tee behavior
         
-        write_stderr_error(
-            path=Path("/test/file.adb"),
-            error_type="SYNTAX_ERROR",
-            error_msg="Missing semicolon",
-            details={"line": 42, "column": 15}
-        )
+        with patch('adafmt.error_writer.stderr_redirected', return_value=True):
+            write_stderr_error(
+                path=Path("/test/file.adb"),
+                error_type="SYNTAX_ERROR",
+                error_msg="Missing semicolon",
+                details={"line": 42, "column": 15}
+            )
         
         # Verify write was called
         assert mock_stderr.write.called
@@ -135,6 +143,49 @@ class TestErrorWriting:
         assert "=====" in written_content  # Separator
 
 
+    @patch('sys.stderr')
+    def test_error_prefix_formatted_once_per_second(self, mock_stderr):
+        """Test error records in the same second reuse one timestamp prefix.
+        
+        Given: Two errors written within the same wall-clock second
+        When: write_stderr_error is called for each
+        Then: The timestamp is formatted once and both records share it
+        """
+        mock_stderr.write = MagicMock()
+        
+        with patch('adafmt.error_writer.stderr_redirected', return_value=True), \
+             patch('adafmt.error_writer._prefix_cache', (-1, "")), \
+             patch('adafmt.error_writer.time.time', return_value=1758406991.25), \
+             patch('adafmt.error_writer.to_iso8601_basic', wraps=to_iso8601_basic) as fmt:
+            write_stderr_error(Path("/a.adb"), "TIMEOUT", "first")
+            write_stderr_error(Path("/b.adb"), "TIMEOUT", "second")
+        
+        assert fmt.call_count == 1
+        first, second = (c.args[0] for c in mock_stderr.write.call_args_list)
+        assert first.startswith("20250920T222311Z | ERROR | ")
+        assert second.startswith("20250920T222311Z | ERROR | ")
+
+
+    async def test_error_records_share_delayed_flush(self):
+        """Test errors written inside an event loop are flushed together.
+        
+        Given: A redirected stderr and a running event loop
+        When: Two errors are written back to back
+        Then: Both are written immediately but flushed once, after the interval
+        """
+        stream = MagicMock()
+        with patch('adafmt.error_writer.stderr_redirected', return_value=True), \
+             patch('adafmt.error_writer.STDERR_FLUSH_INTERVAL', 0.01), \
+             patch('sys.stderr', stream):
+            write_stderr_error(Path("/a.adb"), "CIRCUIT_OPEN", "first")
+            write_stderr_error(Path("/b.adb"), "CIRCUIT_OPEN", "second")
+            assert stream.write.call_count == 2
+            stream.flush.assert_not_called()
+            await asyncio.sleep(0.05)
+        
+        stream.flush.assert_called_once()
+
+
 class TestPathValidation:
     """Test suite for path validation and normalization functions.
     
@@ -164,6 +215,133 @@ class TestPathValidation:
         assert result.startswith("/")
         assert "./" not in result
     
+    def test_ensure_absolute_paths_follows_cwd(self, tmp_path, monkeypatch):
+        """Test repeated-option paths become an absolute tuple per working directory.
+        
+        Given: The same relative path normalized from two working directories
+        When: ensure_absolute_paths is called in each
+        Then: Each call returns a tuple resolved against its own directory
+        """
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        
+        monkeypatch.chdir(tmp_path / "a")
+        first = ArgumentValidator.ensure_absolute_paths([Path("src"), tmp_path], "include path")
+        monkeypatch.chdir(tmp_path / "b")
+        second = ArgumentValidator.ensure_absolute_paths([Path("src")], "include path")
+        
+        assert first == ((tmp_path / "a" / "src").resolve(), tmp_path)
+        assert second == ((tmp_path / "b" / "src").resolve(),)
+    
+    def test_ensure_absolute_path_keeps_symlinks(self, tmp_path, monkeypatch):
+        """Test relative paths are made absolute without following symlinks.
+        
+        Given: A relative path through a symlinked directory
+        When: ensure_absolute_path is called
+        Then: The absolute path still goes through the link
+        """
+        (tmp_path / "real").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        monkeypatch.chdir(tmp_path)
+        
+        result = ArgumentValidator.ensure_absolute_path(Path("link/src"), "log path")
+        
+        assert result == Path(os.getcwd()) / "link" / "src"
+    
+    def test_ensure_absolute_paths_resolves_roots(self, tmp_path, monkeypatch):
+        """Test include and exclude roots are resolved through symlinks.
+        
+        Given: A relative root that steps out of a symlinked directory with '..'
+        When: ensure_absolute_paths is called
+        Then: '..' applies to the link's target, as Path.resolve() would
+        """
+        (tmp_path / "real" / "inner").mkdir(parents=True)
+        (tmp_path / "link").symlink_to(tmp_path / "real" / "inner")
+        monkeypatch.chdir(tmp_path)
+        
+        result = ArgumentValidator.ensure_absolute_paths([Path("link/../x")], "include path")
+        
+        assert result == ((tmp_path / "real" / "x").resolve(),)
+    
+    def test_validate_paths_file_checks(self, tmp_path):
+        """Test explicit files are classified without a stat per listed file.
+        
+        Given: A gpr file, an Ada file, a directory, a missing file and a text file
+        When: validate_paths is called with them as explicit files
+        Then: Each invalid entry gets its own error; the files sharing a
+              directory come from one listing, so only the project, the lone
+              directory and the missing file are stat'ed
+        """
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        good = tmp_path / "a.adb"
+        good.write_text("")
+        (tmp_path / "b.txt").write_text("")
+        files = [str(good), str(tmp_path), str(tmp_path / "missing.ads"), str(tmp_path / "b.txt")]
+        
+        with patch("adafmt.argument_validator.os.stat", wraps=os.stat) as stat_mock, \
+                patch("adafmt.argument_validator.os.scandir", wraps=os.scandir) as scandir_mock:
+            valid, errors = ArgumentValidator.validate_paths(
+                project_path=project, include_paths=[], exclude_paths=[],
+                patterns_path=None, files=files, log_path=None, stderr_path=None,
+                metrics_path=None, no_patterns=True)
+        
+        assert not valid
+        assert errors == [
+            f"Path is not a file: {tmp_path}",
+            f"File does not exist: {tmp_path / 'missing.ads'}",
+            f"Not an Ada file: {tmp_path / 'b.txt'}",
+        ]
+        assert stat_mock.call_count == 3
+        scandir_mock.assert_called_once_with(str(tmp_path))
+    
+    def test_validate_paths_duplicate_files_checked_once(self, tmp_path):
+        """Test a file repeated on the command line is validated once.
+        
+        Given: The same missing file passed three times
+        When: validate_paths is called
+        Then: One error is reported and the file is stat'ed once
+        """
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        missing = str(tmp_path / "missing.adb")
+        
+        with patch("adafmt.argument_validator.os.stat", wraps=os.stat) as stat_mock:
+            valid, errors = ArgumentValidator.validate_paths(
+                project_path=project, include_paths=[], exclude_paths=[],
+                patterns_path=None, files=[missing] * 3, log_path=None, stderr_path=None,
+                metrics_path=None, no_patterns=True)
+        
+        assert not valid
+        assert errors == [f"File does not exist: {missing}"]
+        assert stat_mock.call_count == 2
+    
+    def test_validate_paths_long_file_list_keeps_order(self, tmp_path):
+        """Test files in many directories checked in parallel report errors in order.
+        
+        Given: Files in more directories than PARALLEL_FILE_CHECK_MIN, every other one missing
+        When: validate_paths is called
+        Then: The missing files are reported in argument order
+        """
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        files = []
+        for i in range(argument_validator.PARALLEL_FILE_CHECK_MIN * 4):
+            directory = tmp_path / f"d{i % (argument_validator.PARALLEL_FILE_CHECK_MIN * 2)}"
+            directory.mkdir(exist_ok=True)
+            path = directory / f"f{i}.adb"
+            if i % 2 == 0:
+                path.write_text("")
+            files.append(str(path))
+        
+        valid, errors = ArgumentValidator.validate_paths(
+            project_path=project, include_paths=[], exclude_paths=[],
+            patterns_path=None, files=files, log_path=None, stderr_path=None,
+            metrics_path=None, no_patterns=True)
+        
+        assert not valid
+        assert errors == [f"File does not exist: {f}" for f in files[1::2]]
+    
     def test_is_ada_file(self):
         """Test is_ada_file correctly identifies Ada source files.
         
@@ -179,6 +357,53 @@ class TestPathValidation:
         assert not is_ada_file(Path("test.py"))
 
 
+class TestStatusLines:
+    """Test suite for per-file status line building and coloring."""
+    
+    def test_failed_tag_colored_on_tty(self):
+        """Test only the failed status bracket is colored on a terminal.
+        
+        Given: A failed status line and a terminal stdout
+        When: Two lines are printed
+        Then: The tag is wrapped in red and isatty() is asked only once
+        """
+        line = cli._build_status_line(3, 10, Path("/src/a.adb"), "failed", None, False, False)
+        stdout = MagicMock()
+        stdout.isatty.return_value = True
+        
+        with patch('sys.stdout', stdout), patch('adafmt.cli._stdout_tty', (None, False)):
+            cli._print_colored_line(line)
+            cli._print_colored_line(line)
+        
+        written = stdout.write.call_args_list[0].args[0]
+        assert written == "[   3/10] \033[91m[✗ failed    ]\033[0m /src/a.adb  (details in the stderr log)"
+        stdout.isatty.assert_called_once()
+    
+    def test_plain_output_when_not_tty(self, capsys):
+        """Test lines are printed unchanged when stdout is not a terminal.
+        
+        Given: A non-terminal stdout
+        When: A status line is printed
+        Then: No escape codes are added
+        """
+        line = cli._build_status_line(1, 2, Path("/src/b.adb"), "unchanged", None, False, False)
+        cli._print_colored_line(line)
+        assert capsys.readouterr().out == "[   1/2] [= unchanged ] /src/b.adb\n"
+
+    def test_queued_note_only_when_patterns_active(self):
+        """Test the pattern note follows the precomputed patterns flag.
+
+        Given: A queued file
+        When: Status lines are built with patterns active and inactive
+        Then: Only the active line notes queued pattern processing
+        """
+        path = Path("/src/c.adb")
+        active = cli._build_status_line(1, 1, path, "queued", None, False, True)
+        inactive = cli._build_status_line(1, 1, path, "queued", None, False, False)
+        assert active.endswith(" | Patterns: queued")
+        assert "Patterns" not in inactive
+
+
 class TestUIMode:
     """Test suite for UI mode selection and initialization.
     
@@ -257,4 +482,356 @@ class TestCleanupHandler:
         mock_restore.assert_called_once()
         
         # Cleanup
-        cleanup_handler.set_cleanup_restore_stderr(None)
\ No newline at end of file
+        cleanup_handler.set_cleanup_restore_stderr(None)
+    
+    def test_cleanup_handler_terminates_als_without_new_loop(self):
+        """Test cleanup after the loop has finished kills ALS directly.
+        
+        Given: A registered client whose ALS process is still running
+        When: cleanup_handler runs with no event loop running
+        Then: The process is terminated and no event loop is created
+        """
+        client = MagicMock()
+        client.process.returncode = None
+        cleanup_handler.set_cleanup_client(client)
+        
+        with patch('asyncio.run') as run, patch('asyncio.new_event_loop') as new_loop:
+            cleanup_handler.cleanup_handler()
+        
+        client.process.terminate.assert_called_once()
+        run.assert_not_called()
+        new_loop.assert_not_called()
+        cleanup_handler.set_cleanup_client(None)
+    
+    async def test_cleanup_handler_schedules_shutdown_on_owning_loop(self):
+        """Test cleanup while the client's loop runs uses that loop.
+        
+        Given: A client registered from inside a running event loop
+        When: cleanup_handler is called without a signal
+        Then: client.shutdown runs on that loop and the process is not killed
+        """
+        import asyncio
+        
+        client = MagicMock()
+        client.shutdown = AsyncMock()
+        cleanup_handler.set_cleanup_client(client)
+        
+        cleanup_handler.cleanup_handler()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        
+        client.shutdown.assert_awaited_once()
+        client.process.terminate.assert_not_called()
+        cleanup_handler.set_cleanup_client(None)
+
+class TestEarlyArgumentChecks:
+    """Test suite for argument checks performed before async startup.
+    
+    Tests that obviously invalid invocations are rejected with exit
+    code 2 before ALS startup or file discovery is attempted.
+    """
+    
+    @patch('adafmt.cli.run_formatter')
+    def test_missing_project_rejected(self, mock_run_formatter, tmp_path):
+        """Test a nonexistent project file is rejected early.
+        
+        Given: A --project-path that does not exist
+        When: The format command is invoked
+        Then: It exits with code 2 without running the formatter
+        """
+        from typer.testing import CliRunner
+        
+        result = CliRunner().invoke(cli.app, [
+            "format", "--project-path", str(tmp_path / "missing.gpr"),
+            "--include-path", str(tmp_path)])
+        
+        assert result.exit_code == 2
+        assert "Project path does not exist" in result.output
+        mock_run_formatter.assert_not_called()
+    
+    @patch('adafmt.cli.run_formatter')
+    def test_non_positive_timeout_rejected(self, mock_run_formatter, tmp_path):
+        """Test non-positive timeouts and negative limits are rejected early.
+        
+        Given: --format-timeout 0 and --max-attempts -1
+        When: The format command is invoked
+        Then: Both errors are reported and it exits with code 2
+        """
+        from typer.testing import CliRunner
+        
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        
+        result = CliRunner().invoke(cli.app, [
+            "format", "--project-path", str(project), "--include-path", str(tmp_path),
+            "--format-timeout", "0", "--max-attempts", "-1"])
+        
+        assert result.exit_code == 2
+        assert "--format-timeout must be positive" in result.output
+        assert "--max-attempts must be non-negative" in result.output
+        mock_run_formatter.assert_not_called()
+
+    
+    @patch('adafmt.cli.run_formatter')
+    def test_path_and_option_errors_reported_together(self, mock_run_formatter, tmp_path):
+        """Test debug-flag, path and option errors are reported in one run.
+        
+        Given: A debug path without its flag, a missing file and --write with --check
+        When: The format command is invoked
+        Then: All three errors are printed, it exits with code 2 and no
+              debug log directory is created
+        """
+        from typer.testing import CliRunner
+        
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        
+        result = CliRunner().invoke(cli.app, [
+            "format", "--project-path", str(project),
+            "--debug-als-path", str(tmp_path / "logs" / "als.jsonl"),
+            "--write", "--check", str(tmp_path / "missing.adb")])
+        
+        assert result.exit_code == 2
+        assert "--debug-als-path requires --debug-als" in result.output
+        assert "File does not exist" in result.output
+        assert "Cannot use both --write and --check" in result.output
+        assert not (tmp_path / "logs").exists()
+        mock_run_formatter.assert_not_called()
+
+
+class TestLazyCommands:
+    """Test suite for subcommands built only when they are used."""
+    
+    def _format_builds(self, args):
+        """Invoke the CLI and count how often the format command was built."""
+        from typer.testing import CliRunner
+        import typer.main
+        
+        real_get_command = typer.main.get_command
+        with patch("typer.main.get_command", side_effect=real_get_command) as get_command:
+            result = CliRunner().invoke(cli.app, args)
+        builds = [c for c in get_command.call_args_list if c.args[0] is cli._format_app]
+        return result, len(builds)
+    
+    def test_license_skips_format_command(self):
+        """Test the license command does not build the format options.
+        
+        Given: The adafmt CLI app
+        When: The license command is invoked
+        Then: It succeeds without converting the format command
+        """
+        result, builds = self._format_builds(["license"])
+        
+        assert result.exit_code == 0
+        assert builds == 0
+    
+    def test_format_help_builds_format_command(self):
+        """Test the format command is built when it is requested.
+        
+        Given: The adafmt CLI app
+        When: format --help is invoked
+        Then: The format options are shown and the command was built once
+        """
+        result, builds = self._format_builds(["format", "--help"])
+        
+        assert result.exit_code == 0
+        assert "--include-path" in result.output
+        assert builds == 1
+    
+    @pytest.mark.parametrize("args", [["--version"], ["-v"], ["license"]])
+    def test_fast_path_matches_full_cli(self, args, capsys):
+        """Test the entry point fast path prints what the full CLI prints.
+        
+        Given: An invocation the entry point answers without loading the CLI
+        When: _fast_path handles it
+        Then: It reports success and the output equals the Typer command's
+        """
+        from typer.testing import CliRunner
+        from adafmt.__main__ import _fast_path
+        
+        assert _fast_path(args) is True
+        fast_output = capsys.readouterr().out
+        result = CliRunner().invoke(cli.app, args)
+        
+        assert fast_output == result.output
+    
+    def test_fast_path_declines_other_arguments(self, capsys):
+        """Test the fast path leaves everything else to the full CLI.
+        
+        Given: Invocations with extra arguments or other commands
+        When: _fast_path is called
+        Then: It returns False and prints nothing
+        """
+        from adafmt.__main__ import _fast_path
+        
+        for args in ([], ["format"], ["--version", "format"], ["license", "--help"]):
+            assert _fast_path(args) is False
+        assert capsys.readouterr().out == ""
+
+
+class TestConcurrentProcessing:
+    """Test suite for bounded concurrent file processing."""
+    
+    async def test_results_reported_in_input_order(self, capsys):
+        """Test files overlap up to the limit but are reported in order.
+        
+        Given: Four files where earlier files take longer to process
+        When: _process_files runs with concurrency 2
+        Then: At most two files are in flight and lines follow input order
+        """
+        import asyncio
+        
+        paths = [Path(f"/src/f{i}.adb") for i in range(4)]
+        in_flight = 0
+        peak = 0
+        
+        async def process_file(path, idx, total, run_start_time, size=None, uri=None, output=None):
+            nonlocal in_flight, peak
+            assert uri == path.as_uri() and size is None  # from the run's FileTable
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (total - idx))
+            in_flight -= 1
+            return "ok", None
+        
+        processor = MagicMock()
+        processor.initialize_worker_pool = AsyncMock()
+        processor.process_file = process_file
+        
+        await cli._process_files(
+            paths, processor, 0.0, None, None, True, None, None,
+            Path("p.log"), False, False, False, None, concurrency=2)
+        
+        reported = [line for line in capsys.readouterr().out.splitlines() if "[ok" in line]
+        assert peak == 2
+        assert [line.split()[-1] for line in reported] == [str(p) for p in paths]
+    
+    async def test_footer_updates_are_debounced(self):
+        """Test the footer is redrawn at most once per interval plus the last file.
+        
+        Given: Ten files that finish instantly and a UI
+        When: _process_files runs
+        Then: Progress and footer are updated for the first and last file only
+        """
+        paths = [Path(f"/src/f{i}.adb") for i in range(10)]
+        processor = MagicMock()
+        processor.initialize_worker_pool = AsyncMock()
+        processor.process_file = AsyncMock(return_value=("ok", None))
+        processor.als_changed = processor.pattern_files_changed = processor.als_failed = 0
+        ui = MagicMock()
+        
+        await cli._process_files(
+            paths, processor, 0.0, ui, None, True, None, None,
+            Path("p.log"), False, False, False, None)
+        
+        assert ui.set_progress.call_count == 2
+        ui.set_progress.assert_called_with(10, 10)
+        assert ui.update_footer_stats.call_count == 2
+        final = ui.update_footer_stats.call_args.kwargs
+        assert final["unchanged"] == 10
+        assert final["als_log"] == "N/A (ALS disabled)"
+        assert final["pattern_log"] == "p.log"
+
+    async def test_file_output_follows_its_status_line_order(self, capsys):
+        """Test concurrent files emit their diffs and timeouts in input order.
+        
+        Given: Three files where later files finish first, each with a diff,
+               the first two timing out and a limit of two timeouts
+        When: _process_files runs with concurrency 3
+        Then: Each diff is printed before its own status line, and the run
+              aborts at the second file in input order, not completion order
+        """
+        from adafmt.file_processor import FileProcessor
+        
+        paths = [Path(f"/src/f{i}.adb") for i in range(3)]
+        
+        async def process_file(path, idx, total, run_start_time, size=None, uri=None, output=None):
+            await asyncio.sleep(0.01 * (total - idx))
+            output.messages.append((print, f"diff {path.name}"))
+            output.timed_out = idx < 3
+            return "failed", "timeout"
+        
+        processor = FileProcessor(max_consecutive_timeouts=2)
+        processor.process_file = process_file
+        
+        with pytest.raises(RuntimeError, match="Too many consecutive timeouts"):
+            await cli._process_files(
+                paths, processor, 0.0, None, None, True, None, None,
+                Path("p.log"), False, False, False, None, concurrency=3)
+        
+        lines = [line for line in capsys.readouterr().out.splitlines() if "found" not in line]
+        assert lines[0] == "diff f0.adb"
+        assert lines[1].endswith("/src/f0.adb  (details in the stderr log)")
+        assert lines[2] == "diff f1.adb"
+        assert len(lines) == 3
+
+
+class TestDiscoveryOverlap:
+    """Test suite for file discovery overlapping ALS startup."""
+    
+    @pytest.mark.parametrize("error", [RuntimeError("boom"), SystemExit(1)])
+    async def test_discovery_cancelled_when_setup_fails(self, tmp_path, error):
+        """Test a failed environment setup stops the streaming discovery task.
+        
+        Given: Streaming discovery and a setup that raises
+        When: run_formatter runs
+        Then: The discovery walk is stopped and its task awaited before returning
+        """
+        from adafmt.config import FormatConfig
+        
+        started = asyncio.Event()
+        cancelled = False
+        
+        async def stream_discovered_files(include_paths, exclude_paths, queue, stop=None):
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = stop.is_set()
+                raise
+        
+        async def setup(*args):
+            await started.wait()
+            raise error
+        
+        cfg = FormatConfig(
+            project_path=tmp_path / "p.gpr", include_paths=[tmp_path], exclude_paths=[],
+            files=[], write=False, diff=False, check=False, preflight_mode="off",
+            als_stale_minutes=30, pre_hook=None, post_hook=None, hook_timeout=5.0,
+            init_timeout=10, als_ready_timeout=10, format_timeout=10, max_attempts=1,
+            max_consecutive_timeouts=0, log_path=None, stderr_path=None,
+            patterns_path=None, no_patterns=True, patterns_timeout_ms=100,
+            patterns_max_bytes=1000)
+        
+        with patch("adafmt.file_discovery_new.stream_discovered_files", stream_discovered_files), \
+             patch("adafmt.cli._setup_formatter_environment", setup):
+            if isinstance(error, SystemExit):
+                assert await cli.run_formatter(cfg) == 1
+            else:
+                with pytest.raises(RuntimeError, match="boom"):
+                    await cli.run_formatter(cfg)
+        
+        assert cancelled
+    
+    @patch('adafmt.cli.run_formatter', new_callable=MagicMock)
+    def test_stream_discovery_switch_is_paired(self, mock_run_formatter, tmp_path):
+        """Test --stream-discovery and --no-stream-discovery select the mode.
+        
+        Given: No discovery switch, each form of it, and both with the last winning
+        When: The format command is invoked
+        Then: The run's config streams by default and follows the switch
+        """
+        from typer.testing import CliRunner
+        
+        project = tmp_path / "p.gpr"
+        project.write_text("project P is end P;")
+        base = ["format", "--project-path", str(project), "--include-path", str(tmp_path)]
+        
+        for flags, expected in [([], True), (["--stream-discovery"], True),
+                                (["--no-stream-discovery"], False),
+                                (["--no-stream-discovery", "--stream-discovery"], True)]:
+            with patch("adafmt.cli._run_event_loop", return_value=0):
+                result = CliRunner().invoke(cli.app, base + flags)
+            assert result.exit_code == 0, result.output
+            assert mock_run_formatter.call_args.args[0].stream_discovery is expected
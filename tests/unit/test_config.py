@@ -0,0 +1,58 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the run configuration module."""
+
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from adafmt.config import FormatConfig
+
+
+def _make_config(**overrides) -> FormatConfig:
+    """Build a FormatConfig with test defaults."""
+    values = dict(
+        project_path=Path("/p/p.gpr"), include_paths=[Path("/p/src")],
+        exclude_paths=[], files=None, write=False, diff=False, check=False,
+        preflight_mode="off", als_stale_minutes=30, pre_hook=None, post_hook=None,
+        hook_timeout=5, init_timeout=180, als_ready_timeout=10, format_timeout=60,
+        max_attempts=2, max_consecutive_timeouts=5, log_path=None, stderr_path=None,
+        patterns_path=None, no_patterns=True, patterns_timeout_ms=100,
+        patterns_max_bytes=1_000_000)
+    values.update(overrides)
+    return FormatConfig(**values)
+
+
+class TestFormatConfig:
+    """Test suite for the FormatConfig option bundle."""
+    
+    def test_collections_become_tuples(self):
+        """Test list and None path collections are stored as tuples.
+        
+        Given: include paths as a list and files as None
+        When: A FormatConfig is constructed
+        Then: Both are exposed as tuples
+        """
+        cfg = _make_config()
+        
+        assert cfg.include_paths == (Path("/p/src"),)
+        assert cfg.exclude_paths == ()
+        assert cfg.files == ()
+    
+    def test_config_is_frozen(self):
+        """Test FormatConfig cannot be modified after construction.
+        
+        Given: A constructed FormatConfig
+        When: An attribute is assigned
+        Then: FrozenInstanceError is raised
+        """
+        cfg = _make_config()
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cfg.write = True
@@ -0,0 +1,32 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the default path module."""
+
+from pathlib import Path
+
+from adafmt.default_paths import get_default_paths
+
+
+class TestEnvLogPath:
+    """Test suite for the ADAFMT_LOG_FILE_PATH override."""
+    
+    def test_env_log_path_read_per_call(self, monkeypatch, tmp_path: Path):
+        """Test the environment log path is honoured on every call.
+        
+        Given: ADAFMT_LOG_FILE_PATH set, then changed after the first call
+        When: Default paths are generated twice without a log path
+        Then: Each call uses the value current at the time, not a default name
+        """
+        monkeypatch.setenv("ADAFMT_LOG_FILE_PATH", str(tmp_path / "first.jsonl"))
+        first = get_default_paths(None, tmp_path / "err.log")
+        monkeypatch.setenv("ADAFMT_LOG_FILE_PATH", str(tmp_path / "second.jsonl"))
+        second = get_default_paths(None, tmp_path / "err.log")
+        
+        assert first[0] == tmp_path / "first.jsonl"
+        assert second[0] == tmp_path / "second.jsonl"
+        assert first[2] is False
@@ -19,8 +19,14 @@ functionality. Tests cover:
 The file discovery system is essential for batch formatting operations.
 """
 
+import asyncio
+import threading
+import time
 from pathlib import Path
-from adafmt.file_discovery import collect_files
+from unittest.mock import patch
+
+from adafmt.file_discovery import collapse_nested_paths, collect_files, scan_ada_files
+from adafmt.file_discovery_new import consume_discovered_files, stream_discovered_files
 
 
 def test_collect(tmp_path: Path):
@@ -37,3 +43,142 @@ def test_collect(tmp_path: Path):
     (tmp_path / "a" / "b" / "z.ada").write_text("")
     files = collect_files([tmp_path / "a"], [])
     assert len(files) == 3
+
+
+def test_scan_prunes_excluded_dirs(tmp_path: Path):
+    """Test scandir walk skips excluded directories and non-Ada files.
+    
+    Given: A tree with an excluded subdirectory and a sibling with a similar prefix
+    When: scan_ada_files walks the tree
+    Then: Only Ada files outside the excluded directory are yielded
+    """
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build_src").mkdir()
+    (tmp_path / "build" / "gen.adb").write_text("")
+    (tmp_path / "build_src" / "keep.adb").write_text("")
+    (tmp_path / "main.ADS").write_text("")
+    (tmp_path / "readme.txt").write_text("")
+    
+    found = sorted(Path(p).name for p in scan_ada_files([tmp_path], [tmp_path / "build"]))
+    
+    assert found == ["keep.adb", "main.ADS"]
+
+
+async def test_stream_discovery_matches_collect(tmp_path: Path):
+    """Test streamed discovery yields the same files as collect_files.
+    
+    Given: A directory tree with more Ada files than one discovery batch
+    When: Files are streamed through the discovery queue in small batches
+    Then: The consumer returns the same sorted list as collect_files
+    """
+    root = tmp_path / "src"
+    (root / "nested").mkdir(parents=True)
+    for i in range(5):
+        (root / f"unit_{i}.ads").write_text("")
+        (root / "nested" / f"unit_{i}.adb").write_text("")
+    (root / "notes.txt").write_text("")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.create_task(stream_discovered_files([root], [], queue, batch=3))
+    files = await consume_discovered_files(queue, producer)
+    
+    assert files == collect_files([root], [])
+    assert len(files) == 10
+
+
+def test_scan_stops_when_event_set(tmp_path: Path):
+    """Test a set stop event ends the scandir walk.
+    
+    Given: A tree with Ada files and a stop event that is already set
+    When: scan_ada_files walks the tree
+    Then: Nothing is yielded
+    """
+    (tmp_path / "a.adb").write_text("")
+    stop = threading.Event()
+    stop.set()
+    
+    assert list(scan_ada_files([tmp_path], [], stop=stop)) == []
+
+
+async def test_cancelled_stream_discovery_stops_walk(tmp_path: Path):
+    """Test cancelling streamed discovery also ends the walker thread.
+    
+    Given: A walk that would run far longer than the test
+    When: The discovery task is cancelled shortly after starting
+    Then: The task finishes promptly and only after the walk has returned
+    """
+    walking = threading.Event()
+    walk_ended = threading.Event()
+    
+    def endless_scan(include_paths, exclude_paths, stop=None):
+        walking.set()
+        try:
+            while not stop.is_set():
+                time.sleep(0.01)
+            yield from ()
+        finally:
+            walk_ended.set()
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    with patch("adafmt.file_discovery_new.scan_ada_files", endless_scan):
+        producer = asyncio.create_task(stream_discovered_files([tmp_path], [], queue))
+        await asyncio.to_thread(walking.wait)
+        start = time.monotonic()
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+    
+    assert producer.cancelled()
+    assert walk_ended.is_set()
+    assert time.monotonic() - start < 1.0
+    assert queue.get_nowait() is None
+
+
+def test_collapse_nested_paths(tmp_path: Path):
+    """Test overlapping include paths collapse to their top-most entries.
+    
+    Given: Duplicate, nested and sibling-with-shared-prefix paths
+    When: collapse_nested_paths is applied, with one nested path under an exclude
+    Then: Only top-most paths remain, except the one inside the excluded tree
+    """
+    src = tmp_path / "src"
+    paths = [src / "foo", src, tmp_path / "src_extra", src, src / "gen" / "keep"]
+    
+    assert collapse_nested_paths(paths) == [src, tmp_path / "src_extra"]
+    assert collapse_nested_paths(paths, keep_under=[src / "gen"]) == [
+        src, src / "gen" / "keep", tmp_path / "src_extra"]
+
+
+def test_collapse_nested_paths_after_kept_descendant(tmp_path: Path):
+    """Test a path kept under an exclude does not shield later siblings.
+    
+    Given: An ancestor, a descendant inside an excluded tree and a later sibling
+    When: collapse_nested_paths is applied with the excluded tree as keep_under
+    Then: The sibling is still dropped as covered by the ancestor
+    """
+    a = tmp_path / "a"
+    paths = [a, a / "x" / "y", a / "z"]
+    
+    assert collapse_nested_paths(paths, keep_under=[a / "x"]) == [a, a / "x" / "y"]
+
+
+def test_collapse_nested_paths_keeps_symlinked_include(tmp_path: Path):
+    """Test a symlink under an include path is kept when it leaves the tree.
+    
+    Given: An include path and a symlink inside it pointing at another tree,
+           plus a second symlink pointing back inside the first path
+    When: collapse_nested_paths is applied
+    Then: The outward link is kept and its files are discovered; the inward
+          link is dropped as covered
+    """
+    a = tmp_path / "a"
+    other = tmp_path / "other"
+    (a / "sub").mkdir(parents=True)
+    other.mkdir()
+    (other / "lib.ads").write_text("")
+    (a / "link").symlink_to(other)
+    (a / "back").symlink_to(a / "sub")
+    
+    kept = collapse_nested_paths([a, a / "link", a / "back"])
+    
+    assert kept == [a, a / "link"]
+    assert [Path(p).name for p in scan_ada_files(kept, [])] == ["lib.ads"]
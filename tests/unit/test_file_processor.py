@@ -0,0 +1,306 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the file processor module."""
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from adafmt.als_client import ALSProtocolError
+from adafmt.circuit_breaker import CircuitBreaker
+from adafmt.file_processor import FileOutput, FileProcessor, FileTable, _fits_pattern_limit, _read_source_text
+from adafmt.pattern_formatter import FileApplyResult
+
+
+def _mock_client(edits):
+    """Build an ALS client double returning the given edits."""
+    client = MagicMock()
+    client.debug_logger = None
+    client._notify = AsyncMock()
+    client.notify_did_open = AsyncMock()
+    client.request_formatting = AsyncMock(return_value=edits)
+    return client
+
+
+class TestAlsCircuitBreaker:
+    """Test suite for pacing ALS requests while the ALS circuit is open."""
+    
+    async def test_open_breaker_waits_then_probes(self, tmp_path: Path):
+        """Test an open circuit holds files until ALS may be probed again.
+        
+        Given: An ALS double whose connection resets twice and then recovers
+        When: More files are processed than the failure threshold
+        Then: Every file reaches ALS, the third only after the cooldown,
+              and only the two reset files fail
+        """
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"f{i}.adb"
+            path.write_text("procedure P is begin null; end P;\n")
+            paths.append(path)
+        client = _mock_client([])
+        client.request_formatting.side_effect = [ConnectionResetError("reset")] * 2 + [[]] * 3
+        breaker = CircuitBreaker(failure_threshold=2, open_seconds=0.05, half_open_probes=1)
+        processor = FileProcessor(client=client, als_breaker=breaker)
+        
+        results = []
+        for i, p in enumerate(paths, 1):
+            start = time.monotonic()
+            results.append(await processor.process_file(p, i, 5, time.time()))
+            if i == 3:
+                assert time.monotonic() - start >= 0.04
+        
+        assert client.request_formatting.await_count == 5
+        assert [status for status, _ in results] == ["failed"] * 2 + ["ok"] * 3
+        assert processor.als_failed == 2
+    
+    async def test_no_breaker_by_default(self, tmp_path: Path):
+        """Test transient ALS failures never hold back later files by default.
+        
+        Given: A processor without a breaker and an ALS double that times
+               out five times and then recovers, with no timeout limit
+        When: Ten files are processed
+        Then: Every file is sent to ALS and only the timed-out files fail
+        """
+        path = tmp_path / "a.adb"
+        path.write_text("procedure P is begin null; end P;\n")
+        client = _mock_client([])
+        client.request_formatting.side_effect = [asyncio.TimeoutError()] * 5 + [[]] * 5
+        processor = FileProcessor(client=client, max_consecutive_timeouts=0)
+        
+        results = [await processor.process_file(path, i, 10, time.time()) for i in range(1, 11)]
+        
+        assert processor.als_breaker is None
+        assert client.request_formatting.await_count == 10
+        assert [status for status, _ in results].count("failed") == 5
+    
+    async def test_protocol_errors_do_not_trip_breaker(self, tmp_path: Path):
+        """Test ALS error responses for bad files count as a live server.
+        
+        Given: An ALS double answering every request with a syntax error
+        When: More files are processed than the failure threshold
+        Then: Every file is still sent to ALS
+        """
+        path = tmp_path / "bad.adb"
+        path.write_text("procedure P is\n")
+        client = _mock_client([])
+        client.request_formatting.side_effect = ALSProtocolError({"code": -32803})
+        processor = FileProcessor(client=client, als_breaker=CircuitBreaker(failure_threshold=2))
+        
+        for i in range(4):
+            await processor.process_file(path, i, 4, time.time())
+        
+        assert client.request_formatting.await_count == 4
+
+
+class TestFileProcessorIO:
+    """Test suite for file reads and writes performed by FileProcessor."""
+    
+    async def test_als_path_sends_prefetched_text_and_writes(self, tmp_path: Path):
+        """Test a prefetched file is sent to ALS and its edits are written.
+        
+        Given: A prefetched Ada file and an ALS double returning one edit
+        When: The file is processed in write mode
+        Then: didOpen carries the file text and the edited text is written
+        """
+        path = tmp_path / "hello.adb"
+        path.write_text("procedure Hello is begin null; end Hello;\n")
+        edit = {"range": {"start": {"line": 0, "character": 0},
+                          "end": {"line": 0, "character": 9}},
+                "newText": "PROCEDURE"}
+        client = _mock_client([edit])
+        processor = FileProcessor(client=client, write=True)
+        
+        processor.prefetch(path)
+        status, note = await processor.process_file(path, 1, 1, time.time())
+        
+        assert (status, note) == ("edited", None)
+        uri, text = client.notify_did_open.await_args.args
+        assert uri == path.as_uri()
+        assert text.startswith("procedure Hello")
+        assert path.read_text().startswith("PROCEDURE Hello")
+        assert processor._prefetched == {}
+    
+    async def test_edits_patterns_and_diff_share_one_read(self, tmp_path: Path, capsys):
+        """Test a file is read from disk once on the edits+patterns path.
+        
+        Given: ALS edits, enabled patterns and diff output for one file
+        When: The file is processed
+        Then: The source is read once and that text feeds ALS, patterns and diff
+        """
+        path = tmp_path / "hello.adb"
+        path.write_text("procedure Hello is begin null; end Hello;\n")
+        edit = {"range": {"start": {"line": 0, "character": 0},
+                          "end": {"line": 0, "character": 9}},
+                "newText": "PROCEDURE"}
+        formatter = MagicMock()
+        formatter.enabled = True
+        formatter.apply.side_effect = lambda p, text: (text, FileApplyResult())
+        processor = FileProcessor(client=_mock_client([edit]), pattern_formatter=formatter,
+                                  diff=True)
+        
+        with patch("adafmt.file_processor._read_source_text", wraps=_read_source_text) as read:
+            status, _ = await processor.process_file(path, 1, 1, time.time())
+        
+        assert status == "edited"
+        assert read.call_count == 1
+        assert formatter.apply.call_args.args[1].startswith("PROCEDURE Hello")
+        assert "-procedure Hello" in capsys.readouterr().out
+    
+    async def test_prefetch_discarded_for_skipped_file(self, tmp_path: Path):
+        """Test a prefetched read is dropped when the file is skipped.
+        
+        Given: A prefetched file larger than the size limit
+        When: The file is processed
+        Then: It fails as too large and no prefetched read is left behind
+        """
+        path = tmp_path / "big.adb"
+        path.write_text("-- " + "X" * 200 + "\n")
+        processor = FileProcessor(no_als=True, max_file_size=100)
+        
+        processor.prefetch(path)
+        status, note = await processor.process_file(path, 1, 1, time.time())
+        
+        assert (status, note) == ("failed", "file too large")
+        assert processor._prefetched == {}
+
+
+class TestDeferredOutput:
+    """Test suite for output collected for in-order replay."""
+    
+    async def test_diff_collected_instead_of_printed(self, tmp_path: Path, capsys):
+        """Test a diff is kept in the FileOutput until it is replayed.
+        
+        Given: An ALS double returning one edit and diff output enabled
+        When: The file is processed with a FileOutput
+        Then: Nothing is printed until replay, and the ALS success is recorded
+        """
+        path = tmp_path / "hello.adb"
+        path.write_text("procedure Hello is begin null; end Hello;\n")
+        edit = {"range": {"start": {"line": 0, "character": 0},
+                          "end": {"line": 0, "character": 9}},
+                "newText": "PROCEDURE"}
+        processor = FileProcessor(client=_mock_client([edit]), diff=True)
+        output = FileOutput()
+        
+        status, _ = await processor.process_file(path, 1, 1, time.time(), output=output)
+        
+        assert status == "edited"
+        assert capsys.readouterr().out == ""
+        assert output.timed_out is False
+        output.replay()
+        assert "-procedure Hello" in capsys.readouterr().out
+    
+    async def test_timeouts_left_to_caller(self, tmp_path: Path):
+        """Test timeouts are reported through the FileOutput, not counted.
+        
+        Given: An ALS double that always times out and a limit of one timeout
+        When: A file is processed with a FileOutput
+        Then: No error is raised until the caller records the timeout
+        """
+        path = tmp_path / "slow.adb"
+        path.write_text("procedure P is begin null; end P;\n")
+        client = _mock_client([])
+        client.request_formatting.side_effect = asyncio.TimeoutError()
+        processor = FileProcessor(client=client, max_consecutive_timeouts=1)
+        output = FileOutput()
+        
+        status, _ = await processor.process_file(path, 1, 1, time.time(), output=output)
+        
+        assert status == "failed"
+        assert output.timed_out is True
+        assert processor.consecutive_timeouts == 0
+        with pytest.raises(RuntimeError, match="Too many consecutive timeouts"):
+            processor.record_timeout(output.timed_out)
+
+
+class TestFileTable:
+    """Test suite for the per-run file table."""
+    
+    def test_from_paths_collects_uris_and_sizes(self, tmp_path: Path):
+        """Test sizes and URIs are gathered in input order.
+        
+        Given: One existing file and one missing file
+        When: A FileTable is built from both paths
+        Then: URIs are set for both, the missing file has no size
+        """
+        present = tmp_path / "a.ads"
+        present.write_text("package A is end A;\n")
+        missing = tmp_path / "gone.adb"
+        
+        table = FileTable.from_paths([present, missing])
+        
+        assert table.paths == (present, missing)
+        assert table.uris == (present.as_uri(), missing.as_uri())
+        assert table.sizes == (present.stat().st_size, None)
+    
+    async def test_process_file_uses_table_facts(self, tmp_path: Path):
+        """Test known size and URI are used without touching pathlib again.
+        
+        Given: A file whose size and URI come from a FileTable
+        When: The file is processed with ALS
+        Then: The file is not stat'ed and ALS receives the table URI
+        """
+        path = tmp_path / "hello.adb"
+        path.write_text("procedure Hello is begin null; end Hello;\n")
+        table = FileTable.from_paths([path])
+        client = _mock_client([])
+        processor = FileProcessor(client=client)
+        
+        with patch.object(Path, "stat", side_effect=AssertionError("stat called")), \
+             patch.object(Path, "as_uri", side_effect=AssertionError("as_uri called")):
+            status, _ = await processor.process_file(
+                path, 1, 1, time.time(), size=table.sizes[0], uri=table.uris[0])
+        
+        assert status == "ok"
+        assert client.notify_did_open.await_args.args[0] == table.uris[0]
+
+
+class TestPatternSizeLimit:
+    """Test suite for the --patterns-max-bytes limit."""
+    
+    def test_fits_pattern_limit_avoids_encoding_when_bounds_decide(self):
+        """Test the byte limit check uses sizes and character counts.
+        
+        Given: Texts clearly under, clearly over, and near a byte limit
+        When: _fits_pattern_limit is evaluated
+        Then: Known sizes and character bounds decide, encoding settles the rest
+        """
+        assert _fits_pattern_limit("x" * 500, None)
+        assert _fits_pattern_limit("x" * 500, 100, encoded_size=90)
+        assert not _fits_pattern_limit("x", 100, encoded_size=101)
+        assert _fits_pattern_limit("x" * 25, 100)
+        assert not _fits_pattern_limit("x" * 101, 100)
+        assert _fits_pattern_limit("é" * 50, 100)
+        assert not _fits_pattern_limit("é" * 51, 100)
+    
+    async def test_patterns_skipped_for_large_file(self, tmp_path: Path):
+        """Test patterns are not run on files above the patterns limit.
+        
+        Given: A file larger than patterns_max_bytes
+        When: It is processed with patterns only
+        Then: The formatter is never called and a skip event is logged
+        """
+        path = tmp_path / "big.adb"
+        path.write_text("null;   \n" * 20)
+        formatter = MagicMock()
+        formatter.enabled = True
+        formatter.apply.return_value = ("", FileApplyResult())
+        logger = MagicMock()
+        processor = FileProcessor(no_als=True, pattern_formatter=formatter,
+                                  logger=logger, patterns_max_bytes=50)
+        
+        status, _ = await processor.process_file(path, 1, 1, time.time())
+        
+        assert status == "ok"
+        formatter.apply.assert_not_called()
+        events = [c.args[0].get('ev') for c in logger.write.call_args_list]
+        assert 'patterns_skipped_too_large' in events
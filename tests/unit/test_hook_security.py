@@ -10,7 +10,7 @@
 from unittest.mock import patch, MagicMock
 import subprocess
 
-from adafmt.utils import run_hook
+from adafmt.utils import parse_hook_command, run_hook, run_hook_async
 
 
 class TestHookSecurity:
@@ -127,4 +127,35 @@ class TestHookSecurity:
         
         mock_run.assert_called_once()
         call_args = mock_run.call_args
-        assert call_args[0][0] == ['/path with spaces/script.sh', '--arg', 'value']
\ No newline at end of file
+        assert call_args[0][0] == ['/path with spaces/script.sh', '--arg', 'value']
+
+
+class TestAsyncHook:
+    """Test hook execution on the event loop."""
+    
+    def test_parse_hook_command(self):
+        """Test hook commands are split like a shell would, without a shell."""
+        assert parse_hook_command('"/a b/run.sh" -x') == ['/a b/run.sh', '-x']
+        assert parse_hook_command("") is None
+        assert parse_hook_command(None) is None
+    
+    async def test_async_hook_success_logs_output(self):
+        """Test a successful hook returns True and forwards its output."""
+        logger_calls = []
+        
+        result = await run_hook_async(["echo", "hello"], "pre", logger=logger_calls.append)
+        
+        assert result is True
+        assert "[pre-hook] hello" in logger_calls
+    
+    async def test_async_hook_failure_and_timeout(self):
+        """Test non-zero exits and timeouts are reported as failures."""
+        logger_calls = []
+        
+        failed = await run_hook_async(["false"], "post", logger=logger_calls.append)
+        timed_out = await run_hook_async(["sleep", "5"], "post", logger=logger_calls.append, timeout=0.2)
+        
+        assert failed is False
+        assert timed_out is False
+        assert "[post-hook] exited with code 1" in logger_calls
+        assert "[post-hook] timeout after 0.2s" in logger_calls
@@ -20,10 +20,11 @@ functionality used to track formatting operations. Tests cover:
 
 JSONL logging provides structured, machine-readable logs of all formatting operations.
 """
+import asyncio
 import json
 from pathlib import Path
 
-from adafmt.logging_jsonl import JsonlLogger
+from adafmt.logging_jsonl import JsonlLogger, flush_all
 
 
 class TestJsonlLogger:
@@ -294,4 +295,65 @@ class TestJsonlLogger:
         logger.write({"more": "data"})
         assert logger._file is not None
         
-        logger.close()
\ No newline at end of file
+        logger.close()
+
+
+class TestCoalescedWrites:
+    """Test suite for loggers created with a flush interval."""
+
+    async def test_records_flushed_after_interval(self, tmp_path):
+        """Test buffered records reach the file once the interval elapses.
+        
+        Given: A logger with a flush interval inside a running event loop
+        When: Several records are written
+        Then: One flush is scheduled and all records appear after it runs
+        """
+        log_path = tmp_path / "coalesced.jsonl"
+        logger = JsonlLogger(str(log_path), flush_interval=0.01)
+        logger.start_fresh()
+
+        for i in range(3):
+            logger.write({"id": i})
+        assert log_path.read_text() == ""
+        assert logger._flush_handle is not None
+
+        await asyncio.sleep(0.05)
+        lines = log_path.read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [0, 1, 2]
+        assert logger._flush_handle is None
+        logger.close()
+
+    async def test_close_and_flush_all_write_pending_records(self, tmp_path):
+        """Test pending records are written by flush_all() and close().
+        
+        Given: Two coalescing loggers with pending records
+        When: flush_all() is called, then one logger is closed after another write
+        Then: Every record is on disk and no flush remains scheduled
+        """
+        first = JsonlLogger(str(tmp_path / "a.jsonl"), flush_interval=60)
+        second = JsonlLogger(str(tmp_path / "b.jsonl"), flush_interval=60)
+        first.write({"n": 1})
+        second.write({"n": 2})
+
+        flush_all()
+        assert json.loads((tmp_path / "a.jsonl").read_text()) == {"n": 1}
+        assert json.loads((tmp_path / "b.jsonl").read_text()) == {"n": 2}
+
+        first.write({"n": 3})
+        first.close()
+        assert len((tmp_path / "a.jsonl").read_text().splitlines()) == 2
+        assert first._flush_handle is None
+        second.close()
+
+    def test_without_event_loop_flushes_each_write(self, tmp_path):
+        """Test coalescing loggers fall back to flushing when no loop runs.
+        
+        Given: A logger with a flush interval and no running event loop
+        When: A record is written
+        Then: It is on disk immediately
+        """
+        log_path = tmp_path / "sync.jsonl"
+        logger = JsonlLogger(str(log_path), flush_interval=60)
+        logger.write({"sync": True})
+        assert json.loads(log_path.read_text()) == {"sync": True}
+        logger.close()
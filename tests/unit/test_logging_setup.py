@@ -0,0 +1,42 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the logging setup module."""
+
+from pathlib import Path
+
+from adafmt.logging_setup import _RUN_ID_RE, setup_loggers
+
+
+class TestPatternLogName:
+    """Test suite for naming the pattern log after the main log."""
+    
+    def test_default_log_name_shares_run_id(self, tmp_path: Path):
+        """Test a default main log name lends its run id to the pattern log.
+        
+        Given: A main log named with a timestamp, pid and sequence run id
+        When: Loggers are set up
+        Then: The pattern log uses the same run id
+        """
+        log_path = tmp_path / "adafmt_20250920T220311Z-4242-1a2b_log.jsonl"
+        
+        loggers = setup_loggers(log_path)
+        
+        assert loggers[2] == tmp_path / "adafmt_20250920T220311Z-4242-1a2b_patterns.log"
+        loggers[0].close()
+        loggers[1].close()
+    
+    def test_custom_log_name_gets_fresh_run_id(self):
+        """Test custom names with underscores are not misparsed as run ids.
+        
+        Given: Log names that are not adafmt default names
+        When: The run id pattern is matched
+        Then: No run id is extracted
+        """
+        for name in ("my_project_run.jsonl", "adafmt_latest_log.jsonl", "run.log"):
+            assert _RUN_ID_RE.match(name) is None
+        assert _RUN_ID_RE.match("adafmt_20250920T220311Z_log.jsonl").group(1) == "20250920T220311Z"
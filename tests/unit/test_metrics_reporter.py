@@ -0,0 +1,43 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the metrics_reporter module."""
+
+from adafmt.metrics_reporter import _print_table
+
+
+class TestPrintTable:
+    """Test suite for the fixed-layout summary table printer."""
+    
+    def test_plain_layout(self, capsys):
+        """Test columns are aligned and separated by two spaces.
+        
+        Given: Rows with left and right aligned columns
+        When: _print_table prints them
+        Then: Each line is indented, aligned and has no trailing spaces
+        """
+        _print_table([["Files", 3, "100%"], ["Unchanged", 10, "5%"]],
+                     ("left", "right", "right"))
+        
+        assert capsys.readouterr().out == (
+            "  Files       3  100%\n"
+            "  Unchanged  10    5%\n")
+    
+    def test_headers_are_padded_and_underlined(self, capsys):
+        """Test headed tables widen columns and underline the headers.
+        
+        Given: A pattern table with headers
+        When: _print_table prints it
+        Then: Columns are two wider than their headers and dashes follow the header row
+        """
+        _print_table([["p", 1, 22]], ("left", "right", "right"),
+                     headers=["Pattern", "Applied", "Replaced"])
+        
+        assert capsys.readouterr().out == (
+            "  Pattern      Applied    Replaced\n"
+            "  ---------  ---------  ----------\n"
+            "  p                  1          22\n")
@@ -550,6 +550,74 @@ end Test;"""
         # Should log the error
         mock_logger.write.assert_called()
 
+class TestCleanTextCache:
+    """Test the cache of texts left unchanged by all patterns."""
+    
+    @pytest.fixture
+    def formatter(self):
+        formatter = PatternFormatter()
+        formatter.rules = (CompiledRule(
+            name="test-rule-01", title="Trailing spaces", category="hygiene",
+            find=re.compile(r"[ \t]+$", re.MULTILINE), replace=""),)
+        formatter.enabled = True
+        return formatter
+    
+    def test_unchanged_text_skips_rules_next_time(self, formatter):
+        """Test a text the rules left unchanged is not scanned again."""
+        text = "procedure P is\nbegin\n   null;\nend P;\n"
+        assert formatter.apply(Path("a.adb"), text)[0] == text
+        result, stats = formatter.apply(Path("b.adb"), text)
+        
+        assert result == text
+        assert stats.applied_names == []
+        assert formatter.cache_hits == 1
+    
+    def test_changed_text_is_not_cached(self, formatter):
+        """Test texts the rules modified are processed and counted every time."""
+        text = "null;   \n"
+        for _ in range(2):
+            result, stats = formatter.apply(Path("a.adb"), text)
+            assert result == "null;\n"
+            assert stats.applied_names == ["test-rule-01"]
+        
+        assert formatter.cache_hits == 0
+        assert formatter.files_touched["test-rule-01"] == 2
+    
+    def test_rule_change_invalidates_cache(self, formatter):
+        """Test replacing the rules drops previously cached texts."""
+        text = "x := 1;\n"
+        formatter.apply(Path("a.adb"), text)
+        formatter.rules = (CompiledRule(
+            name="test-rule-02", title="Assignment", category="operator",
+            find=re.compile(r"\s*:=\s*"), replace=" := "),)
+        
+        formatter.apply(Path("a.adb"), text)
+        
+        assert formatter.cache_hits == 0
+    
+    def test_persisted_cache_round_trip(self, formatter, tmp_path):
+        """Test clean texts saved by one run are skipped by the next."""
+        cache = tmp_path / "cache" / "patterns.sqlite"
+        text = "end P;\n"
+        formatter.apply(Path("a.adb"), text)
+        formatter.save_clean_cache(cache)
+        
+        fresh = PatternFormatter()
+        fresh.rules = formatter.rules
+        fresh.enabled = True
+        assert fresh.load_clean_cache(cache) == 1
+        fresh.apply(Path("a.adb"), text)
+        
+        assert fresh.cache_hits == 1
+    
+    def test_load_ignores_unreadable_cache(self, formatter, tmp_path):
+        """Test a corrupt cache file is ignored."""
+        cache = tmp_path / "patterns.sqlite"
+        cache.write_text("not a database")
+        
+        assert formatter.load_clean_cache(cache) == 0
+
+
 class TestErrorHandling:
     """Test error handling and edge cases."""
     
@@ -0,0 +1,59 @@
+# =============================================================================
+# adafmt - Ada Language Formatter
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Michael Gardner, A Bit of Help, Inc.
+# See LICENSE file in the project root.
+# =============================================================================
+
+"""Unit tests for the pattern validator module."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from adafmt.pattern_validator import PatternValidator
+
+
+class TestValidationOutput:
+    """Test suite for where validation messages are written."""
+
+    async def test_progress_dropped_without_ui(self, tmp_path: Path, capsys):
+        """Test per-file progress and the summary are only shown in a UI.
+
+        Given: A validator without a UI and one file no pattern changes
+        When: Patterns are validated
+        Then: The header and result are printed but no progress or summary
+        """
+        source = tmp_path / "a.adb"
+        source.write_text("procedure A is begin null; end A;\n")
+        formatter = MagicMock(loaded_count=1)
+        formatter.apply.return_value = (source.read_text(), None)
+        validator = PatternValidator(MagicMock(), formatter, MagicMock(), None)
+
+        errors, _ = await validator.validate_patterns([source])
+
+        out = capsys.readouterr().out
+        assert errors == 0
+        assert "Validating 1 patterns against 1 files" in out
+        assert "All 1 files validated successfully" in out
+        assert "Checking" not in out
+        assert "Summary" not in out
+
+    async def test_progress_shown_with_ui(self, tmp_path: Path):
+        """Test a UI receives per-file progress and the summary.
+
+        Given: A validator with a UI and one file no pattern changes
+        When: Patterns are validated
+        Then: The progress and summary lines go to the UI
+        """
+        source = tmp_path / "a.adb"
+        source.write_text("procedure A is begin null; end A;\n")
+        formatter = MagicMock(loaded_count=1)
+        formatter.apply.return_value = (source.read_text(), None)
+        ui = MagicMock()
+        validator = PatternValidator(MagicMock(), formatter, MagicMock(), ui)
+
+        await validator.validate_patterns([source])
+
+        lines = [c.args[0] for c in ui.log_line.call_args_list]
+        assert any("Checking a.adb" in line for line in lines)
+        assert any("Summary" in line for line in lines)
@@ -10,6 +10,7 @@
 import asyncio
 import errno
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 import pytest
 
 from adafmt.retry_handler import RetryHandler
@@ -145,6 +146,21 @@ class TestRetryHandler:
         assert retry_log[0] == (1, "Temporarily unavailable")
         assert retry_log[1] == (2, "Temporarily unavailable")
     
+    @pytest.mark.asyncio
+    async def test_retry_async_full_jitter_backoff(self):
+        """Test each delay is drawn from zero up to the capped exponential delay."""
+        async def test_func():
+            raise asyncio.TimeoutError("Always timeout")
+        
+        with patch("adafmt.retry_handler.random.uniform", side_effect=lambda lo, hi: hi / 2) as uniform, \
+             patch("adafmt.retry_handler.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(asyncio.TimeoutError):
+                await RetryHandler.retry_async(
+                    test_func, max_attempts=5, backoff_base=0.5, backoff_max=2.0)
+        
+        assert [c.args for c in uniform.call_args_list] == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 2.0)]
+        assert [c.args[0] for c in sleep.await_args_list] == [0.25, 0.5, 1.0, 1.0]
+    
     def test_should_retry_file_operation_file_not_found(self):
         """Test file operations don't retry on FileNotFoundError."""
         path = Path("/test/file.txt")